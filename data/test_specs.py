@@ -69,3 +69,48 @@ Test Package
 %changelog
 
 """
+
+TEST_SPEC_DEPENDENCIES = """# RPM .spec file for testing dependency parsing
+Name:           testpackage
+Summary:        Test Package
+Version:        1.0
+Release:        1%{?dist}
+License:        Public Domain
+
+URL:            https://github.com/decathorpe/kentauros
+Source0:        %{name}-%{version}.tar.gz
+
+BuildRequires:  gcc, make
+BuildRequires:  libfoo-devel >= 1.2
+BuildRequires:  pkgconfig(glib-2.0)
+BuildRequires:  (python3-bar or python3-baz)
+
+Requires:       %{name}-libs%{?_isa} = %{version}-%{release}
+
+Provides:       testpackage-compat = %{version}-%{release}
+
+%description
+Test Package
+
+%package        libs
+Summary:        Test Package libraries
+
+%description    libs
+Test Package libraries
+
+%package -n     python3-testpackage
+Summary:        Test Package python bindings
+
+%description -n python3-testpackage
+Test Package python bindings
+
+%prep
+%autosetup
+
+%build
+
+%install
+
+%changelog
+
+"""
@@ -11,12 +11,10 @@ BuildArch:      noarch
 
 BuildRequires:  python3-GitPython
 BuildRequires:  python3-argcomplete
-BuildRequires:  python3-devel >= 3.5
-BuildRequires:  python3-tinydb
+BuildRequires:  python3-devel >= 3.7
 
 Requires:       python3-GitPython
 Requires:       python3-argcomplete
-Requires:       python3-tinydb
 
 Recommends:     python3-ujson
 
@@ -0,0 +1,211 @@
+import configparser as cp
+import datetime
+import fnmatch
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+
+# bump this when the format of catalog entries changes, older catalogs are rebuilt
+CATALOG_VERSION = 1
+
+# keys which can be used for selecting packages with "--where key=value"
+CATALOG_KEYS = ["name", "version", "dist",
+                "source", "constructor", "builder", "uploader", "exporter"]
+
+DURATION_UNITS = dict(s=1, m=60, h=3600, d=86400, w=604800)
+
+
+def parse_where(argument: str) -> (str, str):
+    key, separator, value = argument.partition("=")
+    key = key.strip()
+
+    if not separator or not value:
+        raise ValueError(f"Package filters must have the form key=value, not '{argument}'.")
+
+    if key not in CATALOG_KEYS:
+        raise ValueError("Unknown package filter '{}', must be one of: {}".format(
+            key, ", ".join(CATALOG_KEYS)))
+
+    return key, value.strip()
+
+
+def parse_time(argument: str) -> float:
+    # either a duration relative to now (like "90s", "30m", "12h", "7d", "2w"), or a date / time
+    match = re.fullmatch(r"(\d+)([smhdw])", argument.strip())
+
+    if match is not None:
+        return time.time() - int(match.group(1)) * DURATION_UNITS[match.group(2)]
+
+    try:
+        return datetime.datetime.fromisoformat(argument.strip()).timestamp()
+    except ValueError:
+        raise ValueError(f"Invalid time or duration: '{argument}'")
+
+
+# The catalog stores the metadata of all package configuration files (name, version, modules and
+# their implementations, and dists), keyed by the modification time and size of the file. Only new
+# or modified files are parsed again, so packages can be listed and selected without reading the
+# configuration files of all packages every time.
+class KtrCatalog:
+    def __init__(self, confdir: str, path: str):
+        self.confdir = confdir
+        self.path = path
+
+        self.logger = logging.getLogger("ktr/catalog")
+
+        self.entries = self._load()
+        self.modified = False
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path) as file:
+                catalog = json.load(file)
+        except (OSError, ValueError):
+            return dict()
+
+        if not isinstance(catalog, dict) or catalog.get("version") != CATALOG_VERSION:
+            return dict()
+
+        return catalog.get("packages", dict())
+
+    def _save(self):
+        contents = json.dumps(dict(version=CATALOG_VERSION, packages=self.entries),
+                              indent=4, sort_keys=True)
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".ktr-catalog-")
+        except OSError as error:
+            self.logger.debug(f"Package catalog could not be saved: {error}")
+            return
+
+        try:
+            with os.fdopen(fd, "w") as file:
+                file.write(contents + "\n")
+            os.replace(temp_path, self.path)
+        except OSError as error:
+            os.remove(temp_path)
+            self.logger.debug(f"Package catalog could not be saved: {error}")
+
+    def _parse(self, conf_name: str, conf_path: str) -> dict:
+        entry = dict(name=None, version=None, modules=dict(), dists=list())
+
+        conf = cp.ConfigParser(interpolation=None)
+
+        try:
+            conf.read(conf_path)
+        except cp.Error:
+            self.logger.warning(f"The configuration of package '{conf_name}' is invalid.")
+            return entry
+
+        entry["name"] = conf.get("package", "name", fallback=None)
+        entry["version"] = conf.get("package", "version", fallback=None)
+
+        modules = conf.get("package", "modules", fallback="")
+        dists = set()
+
+        for module_type in (module.strip() for module in modules.split(",") if module.strip()):
+            module_impl = conf.get("modules", module_type, fallback=None)
+
+            if module_impl is None:
+                continue
+
+            entry["modules"][module_type] = module_impl
+
+            for dist in conf.get(module_impl, "dists", fallback="").split(","):
+                if dist.strip():
+                    dists.add(dist.strip())
+
+        entry["dists"] = sorted(dists)
+        return entry
+
+    def update(self) -> dict:
+        found = set()
+
+        try:
+            dir_entries = list(os.scandir(self.confdir))
+        except OSError:
+            dir_entries = list()
+
+        for dir_entry in dir_entries:
+            if not dir_entry.name.endswith(".conf") or not dir_entry.is_file():
+                continue
+
+            conf_name = dir_entry.name[:-len(".conf")]
+            stat = dir_entry.stat()
+            found.add(conf_name)
+
+            entry = self.entries.get(conf_name)
+
+            if (entry is not None) and (entry["mtime"] == stat.st_mtime_ns) and \
+                    (entry["size"] == stat.st_size):
+                continue
+
+            entry = self._parse(conf_name, dir_entry.path)
+            entry["mtime"] = stat.st_mtime_ns
+            entry["size"] = stat.st_size
+
+            self.entries[conf_name] = entry
+            self.modified = True
+
+        for conf_name in set(self.entries.keys()) - found:
+            self.entries.pop(conf_name)
+            self.modified = True
+
+        if self.modified:
+            self._save()
+            self.modified = False
+
+        return self.entries
+
+    @staticmethod
+    def _matches(entry: dict, key: str, patterns: list) -> bool:
+        if key == "dist":
+            values = entry["dists"]
+        elif key in ("name", "version"):
+            values = [entry[key]]
+        else:
+            values = [entry["modules"].get(key)]
+
+        return any(fnmatch.fnmatchcase(value, pattern)
+                   for value in values if value is not None for pattern in patterns)
+
+    def select(self, conf_names: list = None, where: list = None,
+               changed_since: float = None) -> list:
+        # conf_names can contain shell-style wildcards, all packages are selected if it is None;
+        # filters with different keys must all match, filters with the same key are alternatives
+        entries = self.update()
+
+        if conf_names is None:
+            selected = sorted(entries.keys())
+        else:
+            selected = list()
+
+            for conf_name in conf_names:
+                if "*" in conf_name:
+                    selected.extend(sorted(fnmatch.filter(entries.keys(), conf_name)))
+                else:
+                    selected.append(conf_name)
+
+        filters = dict()
+        for key, value in (where or list()):
+            filters.setdefault(key, list()).append(value)
+
+        def is_selected(conf_name: str) -> bool:
+            entry = entries.get(conf_name)
+
+            # unknown packages are only filtered out if filters were specified
+            if entry is None:
+                return not filters and (changed_since is None)
+
+            if (changed_since is not None) and (entry["mtime"] / 1e9 < changed_since):
+                return False
+
+            return all(self._matches(entry, key, patterns) for key, patterns in filters.items())
+
+        return [conf_name for conf_name in selected if is_selected(conf_name)]
@@ -0,0 +1,120 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from .catalog import KtrCatalog, parse_time, parse_where
+
+GIT_CONF = """
+[package]
+name = foo
+version = 1.0
+release = post
+modules = source,constructor,builder
+
+[modules]
+source = git
+constructor = srpm
+builder = mock
+
+[git]
+orig = https://example.org/foo.git
+
+[mock]
+dists = fedora-rawhide-x86_64,fedora-28-x86_64
+"""
+
+URL_CONF = """
+[package]
+name = bar
+version = 2.0
+release = stable
+modules = source,constructor,uploader
+
+[modules]
+source = url
+constructor = srpm
+uploader = copr
+
+[url]
+orig = https://example.org/bar-%{version}.tar.gz
+
+[copr]
+dists = fedora-28-x86_64
+"""
+
+
+class KtrCatalogTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.confdir = os.path.join(self.tempdir.name, "configs")
+        self.path = os.path.join(self.tempdir.name, "cache", "catalog.json")
+
+        os.makedirs(self.confdir)
+
+        self._write("foo", GIT_CONF)
+        self._write("bar", URL_CONF)
+        self._write("broken", "not an ini file")
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def _write(self, conf_name: str, contents: str):
+        with open(os.path.join(self.confdir, conf_name + ".conf"), "w") as file:
+            file.write(contents)
+
+    def test_entries(self):
+        entries = KtrCatalog(self.confdir, self.path).update()
+
+        self.assertEqual(sorted(entries.keys()), ["bar", "broken", "foo"])
+        self.assertEqual(entries["foo"]["modules"],
+                         {"source": "git", "constructor": "srpm", "builder": "mock"})
+        self.assertEqual(entries["foo"]["dists"], ["fedora-28-x86_64", "fedora-rawhide-x86_64"])
+        self.assertEqual(entries["bar"]["version"], "2.0")
+        self.assertIsNone(entries["broken"]["name"])
+
+    def test_cached(self):
+        KtrCatalog(self.confdir, self.path).update()
+        self.assertTrue(os.path.exists(self.path))
+
+        # unmodified configuration files are not parsed again
+        with mock.patch.object(KtrCatalog, "_parse") as parse:
+            KtrCatalog(self.confdir, self.path).update()
+            parse.assert_not_called()
+
+        self._write("bar", URL_CONF.replace("2.0", "2.1"))
+        os.remove(os.path.join(self.confdir, "broken.conf"))
+
+        catalog = KtrCatalog(self.confdir, self.path)
+        entries = catalog.update()
+
+        self.assertEqual(entries["bar"]["version"], "2.1")
+        self.assertNotIn("broken", entries)
+
+    def test_select(self):
+        catalog = KtrCatalog(self.confdir, self.path)
+
+        self.assertEqual(catalog.select(), ["bar", "broken", "foo"])
+        self.assertEqual(catalog.select(["b*"]), ["bar", "broken"])
+        self.assertEqual(catalog.select(["missing"]), ["missing"])
+
+        self.assertEqual(catalog.select(where=[("source", "git")]), ["foo"])
+        self.assertEqual(catalog.select(where=[("source", "git"), ("source", "url")]),
+                         ["bar", "foo"])
+        self.assertEqual(catalog.select(where=[("dist", "fedora-28-*"), ("builder", "mock")]),
+                         ["foo"])
+        self.assertEqual(catalog.select(["bar", "missing"], where=[("uploader", "copr")]),
+                         ["bar"])
+
+        self.assertEqual(catalog.select(changed_since=time.time() + 60), [])
+        self.assertEqual(catalog.select(changed_since=time.time() - 60), ["bar", "broken", "foo"])
+
+    def test_parse(self):
+        self.assertEqual(parse_where("builder = mock"), ("builder", "mock"))
+        self.assertRaises(ValueError, parse_where, "builder")
+        self.assertRaises(ValueError, parse_where, "colour=blue")
+
+        self.assertAlmostEqual(parse_time("2h"), time.time() - 7200, delta=5)
+        self.assertEqual(parse_time("1970-01-02T00:00:00+00:00"), 86400)
+        self.assertRaises(ValueError, parse_time, "yesterday")
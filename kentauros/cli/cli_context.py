@@ -1,12 +1,10 @@
 import configparser as cp
-import glob
 import os
 
-import argcomplete as ac
-
+from kentauros.catalog import KtrCatalog
 from kentauros.config import KtrRealConfig
 from kentauros.context import KtrContext
-from kentauros.state import KtrJSONState
+from kentauros.state import KtrJSONState, KtrSQLiteState
 from .parser import get_cli_parser
 
 
@@ -16,7 +14,10 @@ class KtrCLIContext(KtrContext):
 
         cli_parser = get_cli_parser()
 
-        ac.autocomplete(cli_parser)
+        # argcomplete is only needed (and imported) when the shell requests completions
+        if "_ARGCOMPLETE" in os.environ:
+            import argcomplete as ac
+            ac.autocomplete(cli_parser)
 
         self.parsed_args = cli_parser.parse_args()
         self.args = vars(self.parsed_args)
@@ -61,17 +62,74 @@ class KtrCLIContext(KtrContext):
         self.basedir = basedir
         self.conf_path = conf_path
 
-        self.state = KtrJSONState(os.path.join(self.basedir, "state.json"))
         self.conf = KtrRealConfig(self.conf_path)
 
+        try:
+            state_backend = self.conf.get("main", "state_backend")
+        except (cp.NoSectionError, cp.NoOptionError, KeyError):
+            state_backend = "json"
+
+        json_path = os.path.join(self.basedir, "state.json")
+
+        # the SQLite backend imports an existing JSON state file when the database is created
+        if state_backend == "sqlite":
+            self.state = KtrSQLiteState(os.path.join(self.basedir, "state.sqlite"), json_path)
+        elif state_backend == "json":
+            self.state = KtrJSONState(json_path)
+        else:
+            raise ValueError(
+                "The specified state backend ({}) is not supported.".format(state_backend))
+
         self.debug_flag = self.args.get("debug")
 
+        self.catalog = None
+
+        if self.get_profile() or (self.get_profile_dir() is not None):
+            from kentauros.profiler import KtrProfiler
+            self.profiler = KtrProfiler(self.get_profile_dir())
+
     def get_force(self) -> bool:
         if "force" in self.args.keys():
             return self.args.get("force")
         else:
             return False
 
+    def get_jobs(self) -> int:
+        if "jobs" in self.args.keys():
+            return max(self.args.get("jobs"), 1)
+        else:
+            return 1
+
+    def get_interval(self) -> int:
+        if "interval" in self.args.keys():
+            return max(self.args.get("interval"), 1)
+        else:
+            return 3600
+
+    def get_metrics(self) -> str:
+        if self.args.get("metrics") is not None:
+            return os.path.abspath(self.args.get("metrics"))
+        else:
+            return None
+
+    def get_metrics_format(self) -> str:
+        if "metrics_format" in self.args.keys():
+            return self.args.get("metrics_format")
+        else:
+            return "prometheus"
+
+    def get_ordered(self) -> bool:
+        if "ordered" in self.args.keys():
+            return self.args.get("ordered")
+        else:
+            return False
+
+    def get_pipeline(self) -> bool:
+        if "pipeline" in self.args.keys():
+            return self.args.get("pipeline")
+        else:
+            return False
+
     def get_logfile(self) -> str:
         if "logfile" in self.args.keys():
             return self.args.get("logfile")
@@ -93,31 +151,61 @@ class KtrCLIContext(KtrContext):
     def get_module_action(self) -> str:
         return self.args.get("module_action")
 
-    def get_packages(self) -> list:
-        if self.args.get("packages_all"):
-            pkg_conf_paths = glob.glob(os.path.join(self.get_confdir(), "*.conf"))
+    def get_profile(self) -> bool:
+        if "profile" in self.args.keys():
+            return self.args.get("profile")
+        else:
+            return False
+
+    def get_profile_dir(self) -> str:
+        if self.args.get("profile_dir") is not None:
+            return os.path.abspath(self.args.get("profile_dir"))
+        else:
+            return None
+
+    def get_packages_all(self) -> bool:
+        if "packages_all" in self.args.keys():
+            return self.args.get("packages_all")
+        else:
+            return False
 
-            packages = list()
-            for pkg_conf_path in pkg_conf_paths:
-                packages.append(os.path.basename(pkg_conf_path).replace(".conf", ""))
-            packages.sort()
-            return packages
+    def get_where(self) -> list:
+        if self.args.get("where") is not None:
+            return self.args.get("where")
         else:
-            packages = list()
+            return list()
 
-            for package in self.args.get("package"):
-                if "*" not in package:
-                    packages.append(package)
-                else:
-                    packages.extend(
-                        (os.path.basename(path) for path in
-                         glob.glob(os.path.join(self.get_confdir(), package + ".conf"))))
+    def get_changed_since(self) -> float:
+        return self.args.get("changed_since")
 
-            return packages
+    def get_catalog(self) -> KtrCatalog:
+        if self.catalog is None:
+            self.catalog = KtrCatalog(self.get_confdir(),
+                                      os.path.join(self.get_cachedir(), "catalog.json"))
+
+        return self.catalog
+
+    def get_packages(self) -> list:
+        where = self.get_where()
+        changed_since = self.get_changed_since()
+
+        if self.args.get("packages_all"):
+            return self.get_catalog().select(None, where, changed_since)
+
+        packages = self.args.get("package") or list()
+
+        # the catalog is only needed for wildcards and filters
+        if any("*" in package for package in packages) or where or (changed_since is not None):
+            return self.get_catalog().select(packages, where, changed_since)
+        else:
+            return list(packages)
 
     def get_basedir(self) -> str:
         return self.basedir
 
+    def get_cachedir(self) -> str:
+        return os.path.join(self.get_basedir(), "cache")
+
     def get_confdir(self) -> str:
         return os.path.join(self.get_basedir(), "configs")
 
@@ -127,6 +215,9 @@ class KtrCLIContext(KtrContext):
     def get_expodir(self) -> str:
         return os.path.join(self.get_basedir(), "exports")
 
+    def get_logdir(self) -> str:
+        return os.path.join(self.get_basedir(), "logs")
+
     def get_packdir(self) -> str:
         return os.path.join(self.get_basedir(), "packages")
 
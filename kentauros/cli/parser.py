@@ -2,7 +2,23 @@ import configparser
 import glob
 import os
 
-from argparse import ArgumentParser, _SubParsersAction
+from argparse import ArgumentParser, ArgumentTypeError, _SubParsersAction
+
+from kentauros.catalog import parse_time, parse_where
+
+
+def where_type(argument: str) -> (str, str):
+    try:
+        return parse_where(argument)
+    except ValueError as error:
+        raise ArgumentTypeError(str(error))
+
+
+def time_type(argument: str) -> float:
+    try:
+        return parse_time(argument)
+    except ValueError as error:
+        raise ArgumentTypeError(str(error))
 
 
 # pylint: disable=unused-argument
@@ -41,6 +57,16 @@ def add_source_parser(parsers: _SubParsersAction,
 
     source_parsers: _SubParsersAction = source_parser.add_subparsers()
 
+    # "source check" command
+    check_parser: ArgumentParser = source_parsers.add_parser(
+        "check",
+        aliases=["ch", "che", "chec"],
+        description="print packages with upstream changes, without downloading sources "
+                    "(use --jobs to check more packages at the same time)",
+        help="check for upstream changes",
+        parents=[package_parser])
+    check_parser.set_defaults(module_action="check")
+
     # "source clean" command
     clean_parser: ArgumentParser = source_parsers.add_parser(
         "clean",
@@ -379,6 +405,31 @@ def add_pkg_parser(parsers: _SubParsersAction,
         parents=[package_parser])
     add_parser.set_defaults(module_action="add")
 
+    # "package chain" command
+    chain_parser: ArgumentParser = pkg_parsers.add_parser(
+        "chain",
+        aliases=["ch", "cha", "chai"],
+        description="run all modules of packages in succession",
+        help="run all modules of packages",
+        parents=[package_parser])
+    chain_parser.set_defaults(module_action="chain")
+
+    chain_parser.add_argument(
+        "-p",
+        "--pipeline",
+        action="store_const",
+        const=True,
+        default=False,
+        help="run modules of different packages concurrently, one worker pool per module type")
+
+    chain_parser.add_argument(
+        "-o",
+        "--ordered",
+        action="store_const",
+        const=True,
+        default=False,
+        help="process packages in the order given by the BuildRequires of their .spec files")
+
     # "package clean" command
     clean_parser: ArgumentParser = pkg_parsers.add_parser(
         "clean",
@@ -418,6 +469,28 @@ def add_pkg_parser(parsers: _SubParsersAction,
     return pkg_parser
 
 
+def add_daemon_parser(parsers: _SubParsersAction,
+                      package_parser: ArgumentParser) -> ArgumentParser:
+    # "daemon" command
+    daemon_parser: ArgumentParser = parsers.add_parser(
+        "daemon",
+        aliases=["d", "da", "dae", "daem", "daemo"],
+        description="periodically run all modules of packages, until stopped",
+        help="run as a daemon",
+        parents=[package_parser])
+    daemon_parser.set_defaults(module="daemon")
+
+    daemon_parser.add_argument(
+        "-i",
+        "--interval",
+        action="store",
+        type=int,
+        default=3600,
+        help="seconds between checks of packages without a check_interval setting")
+
+    return daemon_parser
+
+
 def add_init_parser(parsers: _SubParsersAction) -> ArgumentParser:
     # "init" command
     init_parser: ArgumentParser = parsers.add_parser(
@@ -454,6 +527,31 @@ def get_cli_parser() -> ArgumentParser:
         nargs="?",
         default="",
         help="set kentauros project directory")
+    cli_parser.add_argument(
+        "--profile",
+        action="store_const",
+        const=True,
+        default=False,
+        help="print how much time was spent in every module action")
+    cli_parser.add_argument(
+        "--profile-dir",
+        action="store",
+        dest="profile_dir",
+        default=None,
+        help="also save cProfile statistics of every module action to this directory")
+    cli_parser.add_argument(
+        "--metrics",
+        action="store",
+        dest="metrics",
+        default=None,
+        help="write metrics of this run to a file (prometheus textfile collector format)")
+    cli_parser.add_argument(
+        "--metrics-format",
+        action="store",
+        dest="metrics_format",
+        choices=["prometheus", "json"],
+        default="prometheus",
+        help="format of the metrics file")
 
     parsers = cli_parser.add_subparsers(
         title="modules",
@@ -472,14 +570,38 @@ def get_cli_parser() -> ArgumentParser:
         const=True,
         default=False,
         help="apply action to every package with valid configuration")
+    package_parser.add_argument(
+        "-w", "--where",
+        action="append",
+        type=where_type,
+        default=None,
+        metavar="KEY=VALUE",
+        help="only select packages matching a filter, like source=git, builder=mock, "
+             "dist=fedora-* or name=foo (can be given multiple times)")
+    package_parser.add_argument(
+        "--changed-since",
+        action="store",
+        dest="changed_since",
+        type=time_type,
+        default=None,
+        metavar="TIME",
+        help="only select packages with configuration files modified since a date or time "
+             "(ISO 8601), or a duration like 30m, 12h or 7d")
     package_parser.add_argument(
         "-f", "--force",
         action="store_const",
         const=True,
         default=False,
         help="force actions, even if no updates were available")
+    package_parser.add_argument(
+        "-j", "--jobs",
+        action="store",
+        type=int,
+        default=1,
+        help="number of packages to process in parallel")
 
     add_init_parser(parsers)
+    add_daemon_parser(parsers, package_parser)
     add_pkg_parser(parsers, package_parser)
     add_source_parser(parsers, package_parser)
     add_constructor_parser(parsers, package_parser)
@@ -1,9 +1,13 @@
 import logging
+import signal
+import time
 
 from kentauros.modules import get_module
 from kentauros.package import KtrRealPackage
 from kentauros.tasks import KtrMetaTask, KtrTask, KtrInitTask, KtrNoTask
-from kentauros.tasks import KtrTaskList, KtrPackageTask, KtrPackageAddTask
+from kentauros.tasks import KtrTaskList, KtrPackageTask, KtrPackageAddTask, KtrPipelineTask
+from kentauros.tasks import KtrDaemonTask, KtrDependencyGraph, KtrDependencyTaskList
+from kentauros.tasks import KtrSourceCheckTask
 from .cli_context import KtrCLIContext
 
 
@@ -20,24 +24,49 @@ class KtrCLIRunner:
         elif module_type == "init":
             self.task = KtrInitTask(self.context)
 
+        elif module_type == "daemon":
+            self.task = KtrDaemonTask(self.context, conf_names, self.context.get_jobs(),
+                                      self.context.get_interval(), self.context.get_packages_all(),
+                                      self.context.get_where())
+
+        elif (module_type == "source") and (self.context.get_module_action() == "check"):
+            self.task = KtrSourceCheckTask(self.context, conf_names, self.context.get_jobs())
+
         elif module_type == "package":
             action = self.context.get_module_action()
-
-            self.task: KtrTaskList = KtrTaskList()
+            jobs = self.context.get_jobs()
 
             if action == "add":
+                self.task: KtrTaskList = KtrTaskList(jobs)
+
                 for conf_name in conf_names:
                     task = KtrPackageAddTask(conf_name, self.context)
                     self.task.add(task)
 
             else:
+                tasks = list()
+
                 for conf_name in conf_names:
                     package = KtrRealPackage(self.context, conf_name)
-                    task = KtrPackageTask(package, action, self.context)
+                    tasks.append(KtrPackageTask(package, action, self.context))
+
+                if (action == "chain") and self.context.get_ordered():
+                    graph = KtrDependencyGraph([task.package for task in tasks])
+                else:
+                    graph = None
+
+                if (action == "chain") and self.context.get_pipeline():
+                    self.task: KtrTaskList = KtrPipelineTask(jobs, graph)
+                elif graph is not None:
+                    self.task: KtrTaskList = KtrDependencyTaskList(graph, jobs)
+                else:
+                    self.task: KtrTaskList = KtrTaskList(jobs)
+
+                for task in tasks:
                     self.task.add(task)
         else:
             action = self.context.get_module_action()
-            self.task: KtrTaskList = KtrTaskList()
+            self.task: KtrTaskList = KtrTaskList(self.context.get_jobs())
 
             for conf_name in conf_names:
                 package = KtrRealPackage(self.context, conf_name)
@@ -51,8 +80,18 @@ class KtrCLIRunner:
         assert isinstance(self.task, KtrMetaTask)
         assert not isinstance(self.task, KtrTaskList)
 
+        # the daemon finishes running checks and exits cleanly when it is stopped
+        if isinstance(self.task, KtrDaemonTask):
+            signal.signal(signal.SIGINT, lambda signum, frame: self.task.stop())
+            signal.signal(signal.SIGTERM, lambda signum, frame: self.task.stop())
+
         result = self.task.execute()
 
+        # packages with upstream changes are printed, so they can be passed to other commands
+        if isinstance(self.task, KtrSourceCheckTask):
+            for conf_name in result.value or list():
+                print(conf_name)
+
         if result.success:
             return 0
         else:
@@ -62,22 +101,40 @@ class KtrCLIRunner:
         assert isinstance(self.task, KtrTaskList)
 
         code = 0
-        for task in self.task.tasks:
-            assert isinstance(task, KtrMetaTask)
-            result = task.execute()
-
+        for result in self.task.results():
             if not result.success:
                 code += 1
 
+            self.context.metrics.inc("ktr_packages_processed_total",
+                                     result=("success" if result.success else "failure"))
+
         return code
 
+    def _write_metrics(self, start: float):
+        metrics = self.context.metrics
+
+        metrics.set("ktr_run_duration_seconds", time.monotonic() - start)
+        metrics.set("ktr_run_timestamp_seconds", time.time())
+
+        try:
+            metrics.write(self.context.get_metrics(), self.context.get_metrics_format())
+        except OSError as error:
+            logging.getLogger("ktr/metrics").error(f"Metrics could not be written: {error}")
+
     def run(self) -> int:
+        start = time.monotonic()
         debugging = self.context.debug()
 
+        # prefix log messages with the worker thread name if packages are processed in parallel
+        if self.context.get_jobs() > 1:
+            log_format = "%(levelname)s:%(threadName)s:%(name)s:%(message)s"
+        else:
+            log_format = logging.BASIC_FORMAT
+
         if debugging:
-            logging.basicConfig(level=logging.DEBUG)
+            logging.basicConfig(level=logging.DEBUG, format=log_format)
         else:
-            logging.basicConfig(level=logging.INFO)
+            logging.basicConfig(level=logging.INFO, format=log_format)
 
         logfile = self.context.get_logfile()
 
@@ -85,6 +142,16 @@ class KtrCLIRunner:
             logging.basicConfig(filename=logfile)
 
         if isinstance(self.task, KtrTaskList):
-            return self._run_task_list()
+            code = self._run_task_list()
         else:
-            return self._run_task()
+            code = self._run_task()
+
+        self.context.state.flush()
+
+        if self.context.profiler is not None:
+            self.context.profiler.report()
+
+        if self.context.get_metrics() is not None:
+            self._write_metrics(start)
+
+        return code
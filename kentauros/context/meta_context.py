@@ -1,6 +1,7 @@
 import abc
 
 from kentauros.config import KtrConfig
+from kentauros.metrics import KtrMetrics
 from kentauros.state import KtrState
 
 
@@ -9,10 +10,19 @@ class KtrContext(metaclass=abc.ABCMeta):
         self.conf: KtrConfig = None
         self.state: KtrState = None
 
+        # KtrProfiler instance, if profiling is enabled
+        self.profiler = None
+
+        self.metrics = KtrMetrics()
+
     @abc.abstractmethod
     def get_force(self) -> bool:
         pass
 
+    @abc.abstractmethod
+    def get_jobs(self) -> int:
+        pass
+
     @abc.abstractmethod
     def get_logfile(self) -> str:
         pass
@@ -29,6 +39,10 @@ class KtrContext(metaclass=abc.ABCMeta):
     def get_basedir(self) -> str:
         pass
 
+    @abc.abstractmethod
+    def get_cachedir(self) -> str:
+        pass
+
     @abc.abstractmethod
     def get_confdir(self) -> str:
         pass
@@ -41,6 +55,10 @@ class KtrContext(metaclass=abc.ABCMeta):
     def get_expodir(self) -> str:
         pass
 
+    @abc.abstractmethod
+    def get_logdir(self) -> str:
+        pass
+
     @abc.abstractmethod
     def get_packdir(self) -> str:
         pass
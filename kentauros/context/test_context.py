@@ -19,7 +19,7 @@ version_separator_post = +
 
 class KtrTestContext(KtrContext):
     def __init__(self, force: bool = False, logfile: str = "", message: str = "",
-                 debug: bool = False, warnings: bool = False, state: dict = None):
+                 debug: bool = False, warnings: bool = False, state: dict = None, jobs: int = 1):
         super().__init__()
 
         self.basedir = tempfile.mkdtemp()
@@ -35,6 +35,7 @@ class KtrTestContext(KtrContext):
         self.message = message
 
         self.force = force
+        self.jobs = jobs
         self.debug_flag = debug
         self.warnings_flag = warnings
 
@@ -45,6 +46,9 @@ class KtrTestContext(KtrContext):
     def get_force(self) -> bool:
         return self.force
 
+    def get_jobs(self) -> int:
+        return self.jobs
+
     def get_logfile(self) -> str:
         return self.logfile
 
@@ -57,6 +61,9 @@ class KtrTestContext(KtrContext):
     def get_basedir(self) -> str:
         return self.basedir
 
+    def get_cachedir(self) -> str:
+        return os.path.join(self.get_basedir(), "cache")
+
     def get_confdir(self) -> str:
         return os.path.join(self.get_basedir(), "configs")
 
@@ -66,6 +73,9 @@ class KtrTestContext(KtrContext):
     def get_expodir(self) -> str:
         return os.path.join(self.get_basedir(), "exports")
 
+    def get_logdir(self) -> str:
+        return os.path.join(self.get_basedir(), "logs")
+
     def get_packdir(self) -> str:
         return os.path.join(self.get_basedir(), "packages")
 
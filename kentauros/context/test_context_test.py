@@ -20,6 +20,14 @@ class KtrTestContextTest(unittest.TestCase):
         context = KtrTestContext()
         self.assertFalse(context.get_force())
 
+    def test_init_jobs_default(self):
+        context = KtrTestContext()
+        self.assertEqual(context.get_jobs(), 1)
+
+    def test_init_jobs_nondefault(self):
+        context = KtrTestContext(jobs=4)
+        self.assertEqual(context.get_jobs(), 4)
+
     def test_init_logfile_empty(self):
         context = KtrTestContext()
         self.assertEqual(context.get_logfile(), "")
@@ -0,0 +1,45 @@
+import configparser as cp
+import hashlib
+import os
+
+# files are hashed in chunks, so big source tarballs don't need to be read into memory at once
+CHUNK_SIZE = 2 ** 20
+
+
+# A fingerprint is a hash of all inputs of a pipeline stage (configuration sections, file contents,
+# state values, ...). If it didn't change since the last successful run, the stage is up to date.
+class KtrFingerprint:
+    def __init__(self):
+        self.hash = hashlib.sha256()
+
+    def _add(self, kind: str, name: str, data: bytes):
+        # every entry is prefixed with its type, name and length, so entries can't run together
+        self.hash.update(f"{kind}:{name}:{len(data)}\n".encode())
+        self.hash.update(data)
+
+    def add_value(self, name: str, value):
+        self._add("value", name, repr(value).encode())
+
+    def add_file(self, path: str):
+        if not os.path.isfile(path):
+            self._add("missing", path, b"")
+            return
+
+        file_hash = hashlib.sha256()
+
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+                file_hash.update(chunk)
+
+        self._add("file", path, file_hash.digest())
+
+    def add_section(self, conf: cp.ConfigParser, section: str):
+        if not conf.has_section(section):
+            self._add("missing", section, b"")
+            return
+
+        for key, value in sorted(conf.items(section, raw=True)):
+            self._add("option", f"{section}.{key}", value.encode())
+
+    def hexdigest(self) -> str:
+        return self.hash.hexdigest()
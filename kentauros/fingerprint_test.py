@@ -0,0 +1,59 @@
+import configparser as cp
+import os
+import tempfile
+import unittest
+
+from .fingerprint import KtrFingerprint
+
+
+def _fingerprint(*values, path: str = None, conf: cp.ConfigParser = None) -> str:
+    fingerprint = KtrFingerprint()
+
+    for value in values:
+        fingerprint.add_value("value", value)
+
+    if path is not None:
+        fingerprint.add_file(path)
+
+    if conf is not None:
+        fingerprint.add_section(conf, "main")
+
+    return fingerprint.hexdigest()
+
+
+class KtrFingerprintTest(unittest.TestCase):
+    def test_values(self):
+        self.assertEqual(_fingerprint("a", "b"), _fingerprint("a", "b"))
+        self.assertNotEqual(_fingerprint("a", "b"), _fingerprint("ab"))
+        self.assertNotEqual(_fingerprint("a", "b"), _fingerprint("b", "a"))
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            path = os.path.join(tempdir, "file")
+            missing = _fingerprint(path=path)
+
+            with open(path, "w") as file:
+                file.write("content")
+            content = _fingerprint(path=path)
+
+            with open(path, "w") as file:
+                file.write("changed")
+            changed = _fingerprint(path=path)
+
+            self.assertEqual(len({missing, content, changed}), 3)
+
+    def test_section(self):
+        conf = cp.ConfigParser(interpolation=None)
+        missing = _fingerprint(conf=conf)
+
+        conf.read_dict({"main": {"b": "2", "a": "%{version}"}})
+        first = _fingerprint(conf=conf)
+
+        # the order of options doesn't matter
+        reordered = cp.ConfigParser(interpolation=None)
+        reordered.read_dict({"main": {"a": "%{version}", "b": "2"}})
+
+        conf.set("main", "b", "3")
+
+        self.assertEqual(first, _fingerprint(conf=reordered))
+        self.assertEqual(len({missing, first, _fingerprint(conf=conf)}), 3)
@@ -0,0 +1,130 @@
+import json
+import os
+import tempfile
+import threading
+
+# type and description of all metrics, used for the "# HELP" and "# TYPE" lines
+METRICS = {
+    "ktr_run_duration_seconds": ("gauge", "Duration of the last kentauros run."),
+    "ktr_run_timestamp_seconds": ("gauge", "Time when the last kentauros run finished."),
+    "ktr_packages_processed_total": ("counter", "Number of processed package tasks."),
+    "ktr_stage_duration_seconds": ("summary", "Duration of module actions."),
+    "ktr_builds_total": ("counter", "Number of binary package builds."),
+    "ktr_uploads_total": ("counter", "Number of source package uploads."),
+    "ktr_upload_duration_seconds": ("summary", "Duration of source package uploads."),
+    "ktr_downloaded_bytes_total": ("counter", "Number of downloaded bytes."),
+    "ktr_cache_requests_total": ("counter", "Number of cache lookups, by cache and result."),
+}
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels) + "}"
+
+
+# Lightweight in-process registry for metrics of a kentauros run. Updating a metric only takes a
+# lock and a dictionary lookup, so it can be done on hot paths and from multiple threads.
+class KtrMetrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+
+        # name -> {labels: value}, where labels is a sorted tuple of (key, value) pairs
+        self.values = dict()
+
+    @staticmethod
+    def _labels(labels: dict) -> tuple:
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def inc(self, metric: str, value: float = 1, **labels):
+        labels = self._labels(labels)
+
+        with self.lock:
+            values = self.values.setdefault(metric, dict())
+            values[labels] = values.get(labels, 0) + value
+
+    def set(self, metric: str, value: float, **labels):
+        labels = self._labels(labels)
+
+        with self.lock:
+            self.values.setdefault(metric, dict())[labels] = value
+
+    def observe(self, metric: str, value: float, **labels):
+        # observed values are exported as a summary, with a "_sum" and a "_count" series
+        labels = self._labels(labels)
+
+        with self.lock:
+            values = self.values.setdefault(metric, dict())
+            total, count = values.get(labels, (0.0, 0))
+            values[labels] = (total + value, count + 1)
+
+    def get(self, metric: str, **labels):
+        with self.lock:
+            return self.values.get(metric, dict()).get(self._labels(labels))
+
+    def to_prometheus(self) -> str:
+        lines = list()
+
+        with self.lock:
+            for name in sorted(self.values.keys()):
+                mtype, description = METRICS.get(name, ("untyped", ""))
+
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} {mtype}")
+
+                for labels, value in sorted(self.values[name].items()):
+                    if mtype == "summary":
+                        total, count = value
+                        lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+                        lines.append(f"{name}_count{_format_labels(labels)} {count}")
+                    else:
+                        lines.append(f"{name}{_format_labels(labels)} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def to_json(self) -> str:
+        metrics = dict()
+
+        with self.lock:
+            for name in sorted(self.values.keys()):
+                mtype, _ = METRICS.get(name, ("untyped", ""))
+                samples = list()
+
+                for labels, value in sorted(self.values[name].items()):
+                    sample = dict(labels=dict(labels))
+
+                    if mtype == "summary":
+                        sample["sum"], sample["count"] = value
+                    else:
+                        sample["value"] = value
+
+                    samples.append(sample)
+
+                metrics[name] = dict(type=mtype, samples=samples)
+
+        return json.dumps(metrics, indent=4, sort_keys=True) + "\n"
+
+    def write(self, path: str, output_format: str = "prometheus"):
+        if output_format == "json":
+            contents = self.to_json()
+        else:
+            contents = self.to_prometheus()
+
+        # the file is replaced atomically, so collectors never read a partially written file
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".ktr-metrics-")
+
+        try:
+            with os.fdopen(fd, "w") as file:
+                file.write(contents)
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except OSError:
+            os.remove(temp_path)
+            raise
@@ -0,0 +1,63 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from .metrics import KtrMetrics
+
+
+class KtrMetricsTest(unittest.TestCase):
+    def test_inc(self):
+        metrics = KtrMetrics()
+
+        def worker():
+            for _ in range(1000):
+                metrics.inc("ktr_builds_total", dist="fedora-rawhide", result="success")
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(metrics.get("ktr_builds_total", result="success", dist="fedora-rawhide"),
+                         4000)
+        self.assertIsNone(metrics.get("ktr_builds_total", result="failure", dist="fedora-rawhide"))
+
+    def test_prometheus(self):
+        metrics = KtrMetrics()
+        metrics.inc("ktr_downloaded_bytes_total", 1024, source="url")
+        metrics.observe("ktr_upload_duration_seconds", 1.5, uploader="copr")
+        metrics.observe("ktr_upload_duration_seconds", 2.5, uploader="copr")
+        metrics.set("ktr_run_duration_seconds", 10)
+        metrics.inc("ktr_custom", package='a "quoted" name')
+
+        lines = metrics.to_prometheus().splitlines()
+
+        self.assertIn("# TYPE ktr_downloaded_bytes_total counter", lines)
+        self.assertIn('ktr_downloaded_bytes_total{source="url"} 1024', lines)
+        self.assertIn('ktr_upload_duration_seconds_sum{uploader="copr"} 4.0', lines)
+        self.assertIn('ktr_upload_duration_seconds_count{uploader="copr"} 2', lines)
+        self.assertIn("ktr_run_duration_seconds 10", lines)
+        self.assertIn("# TYPE ktr_custom untyped", lines)
+        self.assertIn('ktr_custom{package="a \\"quoted\\" name"} 1', lines)
+
+    def test_write(self):
+        metrics = KtrMetrics()
+        metrics.inc("ktr_packages_processed_total", result="success")
+        metrics.observe("ktr_stage_duration_seconds", 0.5, package="test", module="source")
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            path = os.path.join(tempdir, "metrics", "ktr.json")
+            metrics.write(path, "json")
+
+            with open(path) as file:
+                data = json.load(file)
+
+            self.assertEqual(os.listdir(os.path.dirname(path)), ["ktr.json"])
+
+        self.assertEqual(data["ktr_packages_processed_total"]["samples"],
+                         [{"labels": {"result": "success"}, "value": 1}])
+        self.assertEqual(data["ktr_stage_duration_seconds"]["samples"][0]["count"], 1)
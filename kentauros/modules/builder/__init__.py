@@ -1,15 +1,20 @@
+import importlib
+
 from kentauros.context import KtrContext
 from kentauros.package import KtrPackage
 from .abstract import Builder
-from .mock import MockBuilder
 
 
 def get_builder(btype: str, package: KtrPackage, context: KtrContext) -> Builder:
     builder_dict = dict()
 
-    builder_dict["mock"] = MockBuilder
+    builder_dict["mock"] = (".mock", "MockBuilder")
+
+    # implementations (and their dependencies) are only imported when a package uses them
+    module_name, class_name = builder_dict[btype]
+    module = importlib.import_module(module_name, __name__)
 
-    return builder_dict[btype](package, context)
+    return getattr(module, class_name)(package, context)
 
 
 __all__ = ["get_builder"]
@@ -4,27 +4,35 @@ import os
 import shutil
 
 from kentauros.context import KtrContext
+from kentauros.fingerprint import KtrFingerprint
 from kentauros.modules.module import KtrModule
 from kentauros.package import KtrPackage
 from kentauros.result import KtrResult
+from kentauros.shell_env import execute_all
 
 
 class Build(metaclass=abc.ABCMeta):
-    def __init__(self, path: str, dist: str, context: KtrContext):
+    def __init__(self, path: str, dist: str, context: KtrContext, logfile: str = None):
         self.path = path
         self.dist = dist
         self.context = context
+        self.logfile = logfile
 
     @abc.abstractmethod
     def name(self) -> str:
         pass
 
     @abc.abstractmethod
-    def build(self) -> KtrResult:
+    async def build_async(self) -> KtrResult:
         pass
 
+    def build(self) -> KtrResult:
+        return execute_all(self.build_async())[0]
+
 
 class Builder(KtrModule, metaclass=abc.ABCMeta):
+    MODULE_TYPE = "builder"
+
     def __init__(self, package: KtrPackage, context: KtrContext):
         super().__init__(package, context)
 
@@ -34,6 +42,21 @@ class Builder(KtrModule, metaclass=abc.ABCMeta):
         self.actions["build"] = self.execute
         self.actions["lint"] = self.lint
 
+    def fingerprint(self) -> str:
+        state = self.context.state.read(self.package.conf_name)
+
+        # builders can only be skipped if the source package is known not to have changed
+        if not state.get("constructor_fingerprint"):
+            return ""
+
+        section = self.package.conf.get("modules", "builder")
+
+        fingerprint = KtrFingerprint()
+        fingerprint.add_value("constructor_fingerprint", state.get("constructor_fingerprint"))
+        fingerprint.add_section(self.package.conf.conf, section)
+
+        return fingerprint.hexdigest()
+
     @abc.abstractmethod
     def status(self) -> KtrResult:
         pass
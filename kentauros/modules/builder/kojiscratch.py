@@ -5,7 +5,7 @@ import os
 from kentauros.context import KtrContext
 from kentauros.package import KtrPackage
 from kentauros.result import KtrResult
-from kentauros.shell_env import ShellEnv
+from kentauros.shell_env import ShellEnv, execute_all
 from kentauros.validator import KtrValidator
 from .abstract import Builder, Build
 
@@ -35,7 +35,7 @@ class KojiBuild(Build):
 
         return cmd
 
-    def build(self) -> KtrResult:
+    async def build_async(self) -> KtrResult:
         ret = KtrResult()
         logger = logging.getLogger("ktr/builder/koji-scratch")
 
@@ -43,7 +43,7 @@ class KojiBuild(Build):
         logger.debug(" ".join(cmd))
 
         with ShellEnv() as env:
-            res = env.execute("koji", *cmd)
+            res = await env.execute_async("koji", *cmd)
         ret.collect(res)
 
         if not res.success:
@@ -151,15 +151,19 @@ class KojiScratchBuilder(Builder):
         for dist in self.get_dists():
             build_queue.append(KojiBuild(srpm_path, self.context, dist))
 
-        # run builds in queue
+        # run builds in queue concurrently
+        results = execute_all(*(build.build_async() for build in build_queue))
+
         builds_success = list()
         builds_failure = list()
 
-        for build in build_queue:
-            res = build.build()
+        for build, res in zip(build_queue, results):
+            self.context.metrics.inc("ktr_builds_total", builder="koji", dist=build.dist,
+                                     result=("success" if res.success else "failure"))
+
             if res.success:
                 builds_success.append((build.path, build.dist))
-                self.task_ids.append(res.value())
+                self.task_ids.append(res.value)
             else:
                 builds_failure.append((build.path, build.dist))
 
@@ -183,13 +187,18 @@ class KojiScratchBuilder(Builder):
     def export(self) -> KtrResult:
         ret = KtrResult()
 
-        for task_id in self.task_ids:
-            with ShellEnv(self.edir) as env:
-                res = env.execute("koji", "download-task", "--noprogress", task_id,
-                                  ignore_retcode=True)
+        os.makedirs(self.edir, exist_ok=True)
+
+        # download the results of all tasks concurrently
+        with ShellEnv(self.edir) as env:
+            results = execute_all(*(env.execute_async("koji", "download-task", "--noprogress",
+                                                      task_id, ignore_retcode=True)
+                                    for task_id in self.task_ids))
+
+        for res in results:
             ret.collect(res)
 
-        return ret
+        return ret.submit(True)
 
     def execute(self) -> KtrResult:
         ret = KtrResult()
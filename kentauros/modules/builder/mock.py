@@ -1,15 +1,15 @@
+import asyncio
 import fcntl
 import glob
 import grp
 import logging
 import os
 import shutil
-import time
 
 from kentauros.context import KtrContext
 from kentauros.package import KtrPackage
 from kentauros.result import KtrResult
-from kentauros.shell_env import ShellEnv
+from kentauros.shell_env import ShellEnv, execute_all
 from kentauros.validator import KtrValidator
 from .abstract import Builder, Build
 
@@ -51,8 +51,8 @@ def get_dist_result_path(dist: str) -> str:
 class MockBuild(Build):
     NAME = "ktr/builder/mock"
 
-    def __init__(self, context: KtrContext, path: str, dist: str = None):
-        super().__init__(path, dist, context)
+    def __init__(self, context: KtrContext, path: str, dist: str = None, logfile: str = None):
+        super().__init__(path, dist, context, logfile)
 
         mock_path = shutil.which("mock")
 
@@ -89,7 +89,7 @@ class MockBuild(Build):
 
         return cmd
 
-    def build(self) -> KtrResult:
+    async def build_async(self) -> KtrResult:
         ret = KtrResult()
 
         dist_path = os.path.join("/var/lib/mock/", self.dist)
@@ -106,7 +106,7 @@ class MockBuild(Build):
                     fcntl.lockf(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
                 except IOError:
                     self.logger.info("The specified build chroot is busy, waiting.")
-                    time.sleep(120)
+                    await asyncio.sleep(120)
                 else:
                     build_wait = False
                 finally:
@@ -116,7 +116,7 @@ class MockBuild(Build):
         self.logger.debug(" ".join(cmd))
 
         with ShellEnv() as env:
-            res = env.execute(self.mock, *cmd)
+            res = await env.execute_async(self.mock, *cmd, stream=True, logfile=self.logfile)
         ret.collect(res)
 
         if not res.success:
@@ -230,14 +230,19 @@ class MockBuilder(Builder):
         build_queue = list()
 
         for dist in self.get_dists():
-            build_queue.append(MockBuild(self.context, srpm_path, dist))
+            build_queue.append(MockBuild(self.context, srpm_path, dist,
+                                         self.get_command_log("mock-" + dist)))
+
+        # run builds in queue concurrently
+        results = execute_all(*(build.build_async() for build in build_queue))
 
-        # run builds in queue
         builds_success = list()
         builds_failure = list()
 
-        for build in build_queue:
-            res = build.build()
+        for build, res in zip(build_queue, results):
+            self.context.metrics.inc("ktr_builds_total", builder="mock", dist=build.dist,
+                                     result=("success" if res.success else "failure"))
+
             if res.success:
                 builds_success.append((build.path, build.dist))
             else:
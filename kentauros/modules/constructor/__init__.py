@@ -1,15 +1,20 @@
+import importlib
+
 from kentauros.context import KtrContext
 from kentauros.package import KtrPackage
 from .abstract import Constructor
-from .srpm import SrpmConstructor
 
 
 def get_constructor(ctype: str, package: KtrPackage, context: KtrContext) -> Constructor:
     constructor_dict = dict()
 
-    constructor_dict["srpm"] = SrpmConstructor
+    constructor_dict["srpm"] = (".srpm", "SrpmConstructor")
+
+    # implementations (and their dependencies) are only imported when a package uses them
+    module_name, class_name = constructor_dict[ctype]
+    module = importlib.import_module(module_name, __name__)
 
-    return constructor_dict[ctype](package, context)
+    return getattr(module, class_name)(package, context)
 
 
 __all__ = ["get_constructor"]
@@ -8,6 +8,8 @@ from kentauros.result import KtrResult
 
 
 class Constructor(KtrModule, metaclass=abc.ABCMeta):
+    MODULE_TYPE = "constructor"
+
     def __init__(self, package: KtrPackage, context: KtrContext):
         super().__init__(package, context)
         self.pdir = os.path.join(self.context.get_packdir(), self.package.conf_name)
@@ -1,4 +1,4 @@
-from .spec import RPMSpec, RPMSpecError, parse_release
+from .spec import RPMSpec, RPMSpecError, parse_dependencies, parse_release
 
 
-__all__ = ["RPMSpec", "RPMSpecError", "parse_release"]
+__all__ = ["RPMSpec", "RPMSpecError", "parse_dependencies", "parse_release"]
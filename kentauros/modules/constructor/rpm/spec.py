@@ -34,6 +34,36 @@ def parse_release(release: str) -> (str, str):
     return num_string, abc_string + part2
 
 
+DEPENDENCY_OPERATORS = ["<", "<=", "=", "==", ">=", ">"]
+DEPENDENCY_KEYWORDS = ["and", "or", "if", "else", "with", "without", "unless"]
+
+
+def parse_dependencies(value: str) -> set:
+    # the version constraints are dropped, only the names of the dependencies are kept;
+    # dependencies in boolean expressions are all treated as if they were required
+    dependencies = set()
+    skip_next = False
+
+    for token in value.replace(",", " ").split():
+        if skip_next:
+            skip_next = False
+            continue
+
+        if token in DEPENDENCY_OPERATORS:
+            skip_next = True
+            continue
+
+        token = token.lstrip("(")
+
+        while token.count(")") > token.count("("):
+            token = token[:-1]
+
+        if token and (token not in DEPENDENCY_KEYWORDS):
+            dependencies.add(token)
+
+    return dependencies
+
+
 class RPMSpec:
     def __init__(self, path: str, package: KtrPackage):
         assert isinstance(path, str)
@@ -173,6 +203,39 @@ class RPMSpec:
 
         self.contents = new_contents
 
+    def _expand_dependencies(self, value: str) -> set:
+        value = value.replace("%{name}", self.package.name)
+        value = value.replace("%{?_isa}", "").replace("%{_isa}", "")
+
+        return parse_dependencies(value)
+
+    def get_build_requires(self) -> set:
+        requires = set()
+
+        for line in self.get_lines():
+            if line[0:14] == "BuildRequires:":
+                requires.update(self._expand_dependencies(line[14:]))
+
+        return requires
+
+    def get_provides(self) -> set:
+        provides = {self.package.name}
+
+        for line in self.get_lines():
+            if line[0:9] == "Provides:":
+                provides.update(self._expand_dependencies(line[9:]))
+
+            # sub-packages are named either "%{name}-foo" or explicitly with "-n foo"
+            elif line[0:9] == "%package ":
+                args = line.replace("%{name}", self.package.name).split()[1:]
+
+                if "-n" in args[:-1]:
+                    provides.add(args[args.index("-n") + 1])
+                elif args:
+                    provides.add(self.package.name + "-" + args[0])
+
+        return provides
+
     def build_version_string(self) -> str:
         return get_spec_version(self.stype, self.package)
 
@@ -1,5 +1,6 @@
 import os
 
+from kentauros.modules.sources.compression import get_compression, get_extension
 from kentauros.package import KtrPackage
 from .spec_common import format_tag_line
 
@@ -10,7 +11,9 @@ from .spec_common import format_tag_line
 def _spec_source_git(package: KtrPackage) -> str:
     assert isinstance(package, KtrPackage)
 
-    src_str = format_tag_line("Source0", "%{name}-%{version}.tar.gz")
+    # the extension must match the compression of the exported tarball
+    extension = get_extension(get_compression(package.conf, "git"))
+    src_str = format_tag_line("Source0", "%{name}-%{version}" + extension)
 
     return src_str
 
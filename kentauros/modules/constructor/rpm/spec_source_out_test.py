@@ -13,6 +13,16 @@ class SpecSourceOutTest(unittest.TestCase):
 
         self.assertEqual(source, format_tag_line("Source0", "%{name}-%{version}.tar.gz"))
 
+    def test_get_git_spec_source_compression(self):
+        TEST_PACKAGE_GIT_SOURCE.conf.values["git"]["compression"] = "xz"
+
+        try:
+            source = get_spec_source("git", TEST_PACKAGE_GIT_SOURCE)
+        finally:
+            TEST_PACKAGE_GIT_SOURCE.conf.values["git"].pop("compression")
+
+        self.assertEqual(source, format_tag_line("Source0", "%{name}-%{version}.tar.xz"))
+
     def test_get_url_spec_source(self):
         source = get_spec_source("url", TEST_PACKAGE_URL_SOURCE)
 
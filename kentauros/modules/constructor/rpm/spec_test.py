@@ -5,10 +5,11 @@ import unittest
 from data.test_packages import TEST_PACKAGE_GIT_SOURCE
 from data.test_packages import TEST_PACKAGE_LOCAL_SOURCE
 from data.test_packages import TEST_PACKAGE_URL_SOURCE
+from data.test_specs import TEST_SPEC_DEPENDENCIES
 from data.test_specs import TEST_SPEC_GIT_SOURCE
 from data.test_specs import TEST_SPEC_URL_SOURCE
 from data.test_specs import TEST_SPEC_LOCAL_SOURCE
-from .spec import RPMSpec, parse_release
+from .spec import RPMSpec, parse_dependencies, parse_release
 from .spec_common import format_tag_line
 
 
@@ -47,6 +48,46 @@ class TestParseRelease(unittest.TestCase):
         self.assertEqual(text, ".%{commitdate}.git%{shortcommit}.1")
 
 
+class TestParseDependencies(unittest.TestCase):
+    def test_parse_dependencies_simple(self):
+        self.assertEqual(parse_dependencies(" gcc make"), {"gcc", "make"})
+
+    def test_parse_dependencies_versions(self):
+        self.assertEqual(parse_dependencies("foo >= 1.0, bar = 2"), {"foo", "bar"})
+
+    def test_parse_dependencies_parentheses(self):
+        self.assertEqual(parse_dependencies("pkgconfig(foo) (bar or baz)"),
+                         {"pkgconfig(foo)", "bar", "baz"})
+
+
+class TestSpecDependencies(unittest.TestCase):
+    def setUp(self):
+        self.file, self.path = tempfile.mkstemp()
+        os.close(self.file)
+
+        with open(self.path, "w") as file:
+            file.write(TEST_SPEC_DEPENDENCIES)
+
+    def tearDown(self):
+        os.remove(self.path)
+        self.file = None
+        self.path = None
+
+    def test_get_build_requires(self):
+        spec = RPMSpec(self.path, TEST_PACKAGE_URL_SOURCE)
+
+        self.assertEqual(spec.get_build_requires(),
+                         {"gcc", "make", "libfoo-devel", "pkgconfig(glib-2.0)",
+                          "python3-bar", "python3-baz"})
+
+    def test_get_provides(self):
+        spec = RPMSpec(self.path, TEST_PACKAGE_URL_SOURCE)
+
+        self.assertEqual(spec.get_provides(),
+                         {"testpackage", "testpackage-compat", "testpackage-libs",
+                          "python3-testpackage"})
+
+
 class TestSpecGit(unittest.TestCase):
     def setUp(self):
         self.file, self.path = tempfile.mkstemp()
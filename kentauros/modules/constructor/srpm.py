@@ -6,6 +6,7 @@ import shutil
 import tempfile
 
 from kentauros.context import KtrContext
+from kentauros.fingerprint import KtrFingerprint
 from kentauros.package import KtrPackage
 from kentauros.result import KtrResult
 from kentauros.shell_env import ShellEnv
@@ -15,9 +16,10 @@ from .rpm import RPMSpec, RPMSpecError, parse_release
 
 
 class RPMBuild:
-    def __init__(self, package_name: str, context: KtrContext):
+    def __init__(self, package_name: str, context: KtrContext, logfile: str = None):
         self.context = context
         self.package_name = package_name
+        self.logfile = logfile
 
         self.basepath = tempfile.mkdtemp()
         self.logger = logging.getLogger("ktr/rpmbuild")
@@ -90,12 +92,11 @@ class RPMBuild:
         self.logger.debug(" ".join(cmd))
 
         with ShellEnv() as env:
-            res = env.execute(*cmd)
+            res = env.execute(*cmd, stream=True, logfile=self.logfile)
         ret.collect(res)
 
         if not res.success:
             self.logger.error("rpmbuild command to build the source package was not successful.")
-            self.logger.error(res.value)
             return ret.submit(False)
 
         return ret
@@ -154,7 +155,7 @@ class SrpmConstructor(Constructor):
     def __init__(self, package: KtrPackage, context: KtrContext):
         super().__init__(package, context)
 
-        self.rpmbuild = RPMBuild(self.package.name, self.context)
+        self.rpmbuild = RPMBuild(self.package.name, self.context, self.get_command_log("rpmbuild"))
 
         spec_name = self.package.name + ".spec"
         self.spec_path = os.path.join(self.context.get_specdir(), self.package.conf_name, spec_name)
@@ -195,6 +196,35 @@ class SrpmConstructor(Constructor):
 
         return validator.validate()
 
+    def fingerprint(self) -> str:
+        fingerprint = KtrFingerprint()
+
+        # package configuration, .spec file, and version templates
+        for section in self.package.conf.conf.sections():
+            fingerprint.add_section(self.package.conf.conf, section)
+
+        fingerprint.add_section(self.context.conf.conf, "main")
+        fingerprint.add_file(self.spec_path)
+
+        # source files and the state of the source module
+        state = self.context.state.read(self.package.conf_name)
+
+        for key in ["source_fingerprint", "source_files", "version_format", "git_last_commit"]:
+            fingerprint.add_value(key, state.get(key))
+
+        if os.path.isdir(self.sdir):
+            for entry in sorted(os.listdir(self.sdir)):
+                path = os.path.join(self.sdir, entry)
+
+                if os.path.isfile(path):
+                    fingerprint.add_file(path)
+
+        # the source package itself, which can be deleted by later stages
+        for path in sorted(glob.glob(os.path.join(self.pdir, self.package.name + "*.src.rpm"))):
+            fingerprint.add_value("srpm", os.path.basename(path))
+
+        return fingerprint.hexdigest()
+
     def _get_last_version(self) -> KtrResult:
         ret = KtrResult()
 
@@ -1,15 +1,20 @@
+import importlib
+
 from kentauros.context import KtrContext
 from kentauros.package import KtrPackage
 from .abstract import Exporter
-from .createrepo import CreateRepoExporter
 
 
 def get_exporter(ctype: str, package: KtrPackage, context: KtrContext) -> Exporter:
     exporter_dict = dict()
 
-    exporter_dict["createrepo"] = CreateRepoExporter
+    exporter_dict["createrepo"] = (".createrepo", "CreateRepoExporter")
+
+    # implementations (and their dependencies) are only imported when a package uses them
+    module_name, class_name = exporter_dict[ctype]
+    module = importlib.import_module(module_name, __name__)
 
-    return exporter_dict[ctype](package, context)
+    return getattr(module, class_name)(package, context)
 
 
 __all__ = ["get_exporter"]
@@ -7,6 +7,8 @@ from kentauros.result import KtrResult
 
 
 class Exporter(KtrModule, metaclass=abc.ABCMeta):
+    MODULE_TYPE = "exporter"
+
     def __init__(self, package: KtrPackage, context: KtrContext):
         super().__init__(package, context)
         self.actions["export"] = self.execute
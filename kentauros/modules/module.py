@@ -1,4 +1,5 @@
 import abc
+import os
 
 from kentauros.context import KtrContext
 from kentauros.package import KtrPackage
@@ -6,6 +7,8 @@ from kentauros.result import KtrResult
 
 
 class KtrModule(metaclass=abc.ABCMeta):
+    MODULE_TYPE: str = None
+
     def __init__(self, package: KtrPackage, context: KtrContext):
         assert isinstance(package, KtrPackage)
         assert isinstance(context, KtrContext)
@@ -13,7 +16,8 @@ class KtrModule(metaclass=abc.ABCMeta):
         self.package = package
         self.context = context
 
-        self.actions = {"clean": self.clean,
+        self.actions = {"chain": self.execute,
+                        "clean": self.clean,
                         "import": self.imports,
                         "status": self.status_string,
                         "verify": self.verify}
@@ -21,6 +25,15 @@ class KtrModule(metaclass=abc.ABCMeta):
     def act(self, action: str) -> KtrResult:
         return self.actions[action]()
 
+    def fingerprint(self) -> str:
+        # hash of all inputs of the "execute" action, which is skipped if the hash didn't change
+        # since its last successful run; modules which can't tell return "" and are always run
+        return ""
+
+    def get_command_log(self, name: str) -> str:
+        # the output of long-running commands is written to $KTR_BASE_DIR/logs/$PACKAGE/$NAME.log
+        return os.path.join(self.context.get_logdir(), self.package.conf_name, name + ".log")
+
     @abc.abstractmethod
     def name(self) -> str:
         pass
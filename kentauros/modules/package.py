@@ -1,16 +1,10 @@
-from kentauros.context import KtrContext
-from kentauros.package import KtrPackage
 from kentauros.result import KtrResult
 from .module import KtrModule
 
 
 class PackageModule(KtrModule):
     NAME = "Package"
-
-    def __init__(self, package: KtrPackage, context: KtrContext):
-        super().__init__(package, context)
-
-        self.actions["chain"] = self.execute
+    MODULE_TYPE = "package"
 
     def name(self):
         return "{} {}".format(self.NAME, self.package.name)
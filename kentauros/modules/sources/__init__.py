@@ -1,19 +1,22 @@
+import importlib
+
 from kentauros.context import KtrContext
 from kentauros.package import KtrPackage
 from .abstract import Source
-from .git import GitSource
-from .local import LocalSource
-from .url import UrlSource
 
 
 def get_source(stype: str, package: KtrPackage, context: KtrContext) -> Source:
     source_dict = dict()
 
-    source_dict["git"] = GitSource
-    source_dict["local"] = LocalSource
-    source_dict["url"] = UrlSource
+    source_dict["git"] = (".git", "GitSource")
+    source_dict["local"] = (".local", "LocalSource")
+    source_dict["url"] = (".url", "UrlSource")
+
+    # implementations (and their dependencies) are only imported when a package uses them
+    module_name, class_name = source_dict[stype]
+    module = importlib.import_module(module_name, __name__)
 
-    return source_dict[stype](package, context)
+    return getattr(module, class_name)(package, context)
 
 
 __all__ = ["get_source"]
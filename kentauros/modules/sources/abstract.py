@@ -4,12 +4,15 @@ import os
 import shutil
 
 from kentauros.context import KtrContext
+from kentauros.fingerprint import KtrFingerprint
 from kentauros.modules.module import KtrModule
 from kentauros.package import KtrPackage
 from kentauros.result import KtrResult
 
 
 class Source(KtrModule, metaclass=abc.ABCMeta):
+    MODULE_TYPE = "source"
+
     def __init__(self, package: KtrPackage, context: KtrContext):
         super().__init__(package, context)
         self.updated = False
@@ -54,6 +57,17 @@ class Source(KtrModule, metaclass=abc.ABCMeta):
     def status(self) -> KtrResult:
         pass
 
+    def _fingerprint_files(self, *paths) -> str:
+        fingerprint = KtrFingerprint()
+
+        for section in ["package", "source", self.stype]:
+            fingerprint.add_section(self.package.conf.conf, section)
+
+        for path in paths:
+            fingerprint.add_file(path)
+
+        return fingerprint.hexdigest()
+
     def clean(self) -> KtrResult:
         ret = KtrResult()
 
@@ -128,21 +142,23 @@ class Source(KtrModule, metaclass=abc.ABCMeta):
         force = self.context.get_force()
         old_status = self.status()
 
-        res = self.get()
-        ret.collect(res)
-
-        if res.success:
-            new_status = self.status()
+        # sources which are already present are updated instead
+        if not os.path.exists(self.dest):
+            res = self.get()
+            ret.collect(res)
 
-            if new_status == old_status:
-                self.logger.info(
-                    "The downloaded Source is not newer than the last known source state.")
-                return ret.submit(False)
-            else:
-                self.updated = True
-                res = self.export()
-                ret.collect(res)
-                return res.submit(res.success)
+            if res.success:
+                new_status = self.status()
+
+                if new_status == old_status:
+                    self.logger.info(
+                        "The downloaded Source is not newer than the last known source state.")
+                    return ret.submit(False)
+                else:
+                    self.updated = True
+                    res = self.export()
+                    ret.collect(res)
+                    return res.submit(res.success)
 
         res = self.update()
         ret.collect(res)
@@ -0,0 +1,53 @@
+import configparser as cp
+import shutil
+
+from kentauros.config import KtrConfig
+
+# file extensions of tarballs for all supported compression methods
+COMPRESSION_EXTENSIONS = {
+    "gzip": ".tar.gz",
+    "xz": ".tar.xz",
+    "zstd": ".tar.zst",
+    "none": ".tar",
+}
+
+DEFAULT_COMPRESSION = "gzip"
+
+
+def get_compression(conf: KtrConfig, section: str) -> str:
+    try:
+        compression = conf.get(section, "compression")
+    except (cp.NoSectionError, cp.NoOptionError, KeyError):
+        compression = ""
+
+    if not compression:
+        return DEFAULT_COMPRESSION
+    else:
+        return compression
+
+
+def get_extension(compression: str) -> str:
+    return COMPRESSION_EXTENSIONS[compression]
+
+
+def get_compressor(compression: str) -> list:
+    # returns the command which compresses its standard input (using all CPU cores, if supported)
+    # to its standard output, or None if the tarball is not compressed
+    if compression == "gzip":
+        # pigz is a parallel implementation of gzip, and produces compatible output
+        if shutil.which("pigz") is not None:
+            return ["pigz", "-n", "-c"]
+        else:
+            return ["gzip", "-n", "-c"]
+
+    elif compression == "xz":
+        return ["xz", "-T0", "-c"]
+
+    elif compression == "zstd":
+        return ["zstd", "-T0", "-q", "-c"]
+
+    elif compression == "none":
+        return None
+
+    else:
+        raise ValueError(f"Unsupported compression: {compression}")
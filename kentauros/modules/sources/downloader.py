@@ -0,0 +1,377 @@
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+import urllib.parse
+
+from kentauros.result import KtrResult
+
+# size of the blocks which are read from the network, hashed, and written to disk
+CHUNK_SIZE = 2 ** 20
+
+# seconds to wait for a connection or for data, before a download is aborted
+TIMEOUT = 30
+
+MAX_REDIRECTS = 10
+REDIRECT_STATUSES = [301, 302, 303, 307, 308]
+
+# connections to the same host (at most this many at the same time) are kept open and reused,
+# which also limits the number of concurrent downloads from one host
+MAX_CONNECTIONS = 4
+
+USER_AGENT = "kentauros"
+
+
+class DownloadError(Exception):
+    pass
+
+
+# raised if a partial download can't be continued, so it has to be started over
+class _ResumeError(DownloadError):
+    pass
+
+
+class _ConnectionPool:
+    def __init__(self, scheme: str, host: str, port: int, proxy: tuple = None):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.proxy = proxy
+
+        self.idle = list()
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(MAX_CONNECTIONS)
+
+    def _connect(self):
+        import http.client
+
+        if self.proxy is None:
+            host, port = self.host, self.port
+        else:
+            host, port = self.proxy
+
+        if self.scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, timeout=TIMEOUT)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=TIMEOUT)
+
+        # https requests are tunneled through the proxy, http requests are sent to it directly
+        if (self.proxy is not None) and (self.scheme == "https"):
+            conn.set_tunnel(self.host, self.port)
+
+        return conn
+
+    def acquire(self) -> tuple:
+        # returns a connection, and whether it has already been used for another request
+        self.slots.acquire()
+
+        with self.lock:
+            if self.idle:
+                return self.idle.pop(), True
+
+        return self._connect(), False
+
+    def release(self, conn, reusable: bool):
+        if reusable:
+            with self.lock:
+                self.idle.append(conn)
+        else:
+            conn.close()
+
+        self.slots.release()
+
+
+_pools = dict()
+_pools_lock = threading.Lock()
+
+
+def _get_pool(scheme: str, host: str, port: int) -> _ConnectionPool:
+    import urllib.request
+
+    proxy = None
+
+    # proxies are configured like for other tools ("http_proxy", "https_proxy", "no_proxy")
+    proxy_url = urllib.request.getproxies_environment().get(scheme)
+
+    if (proxy_url is not None) and not urllib.request.proxy_bypass_environment(host):
+        proxy_parts = urllib.parse.urlsplit(proxy_url)
+        proxy = (proxy_parts.hostname, proxy_parts.port or 80)
+
+    key = (scheme, host, port, proxy)
+
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = _ConnectionPool(scheme, host, port, proxy)
+
+        return _pools[key]
+
+
+def _open(url: str, headers: dict, method: str = "GET") -> tuple:
+    # sends a request (following redirects), and returns the pool, the connection and the
+    # response; the connection has to be handed back to the pool when the response has been read
+    import http.client
+
+    for _ in range(MAX_REDIRECTS + 1):
+        parts = urllib.parse.urlsplit(url)
+
+        if parts.scheme not in ["http", "https"]:
+            raise DownloadError(f"Unsupported URL scheme: {parts.scheme}")
+
+        if parts.scheme == "https":
+            default_port = 443
+        else:
+            default_port = 80
+
+        pool = _get_pool(parts.scheme, parts.hostname, parts.port or default_port)
+
+        if pool.proxy is not None and parts.scheme == "http":
+            target = url
+        else:
+            target = urllib.parse.urlunsplit(("", "", parts.path or "/", parts.query, ""))
+
+        while True:
+            conn, reused = pool.acquire()
+
+            try:
+                conn.request(method, target, headers=headers)
+                response = conn.getresponse()
+                break
+            except (ConnectionError, http.client.BadStatusLine):
+                pool.release(conn, False)
+
+                # the server closed an idle connection, so try again with a new one
+                if not reused:
+                    raise
+            except BaseException:
+                pool.release(conn, False)
+                raise
+
+        if response.status not in REDIRECT_STATUSES:
+            return pool, conn, response
+
+        location = response.getheader("Location")
+        response.read()
+        pool.release(conn, not response.will_close)
+
+        if location is None:
+            raise DownloadError(f"Redirect without location: {url}")
+
+        url = urllib.parse.urljoin(url, location)
+
+    raise DownloadError(f"Too many redirects: {url}")
+
+
+def _hash_file(path: str, hasher):
+    with open(path, "rb") as file:
+        while True:
+            chunk = file.read(CHUNK_SIZE)
+
+            if not chunk:
+                break
+
+            hasher.update(chunk)
+
+
+def _get_total(content_range: str) -> int:
+    # returns the total size from a "Content-Range: bytes <start>-<end>/<total>" header
+    match = re.fullmatch(r"bytes (\*|\d+)-?(\d*)/(\d+|\*)", (content_range or "").strip())
+
+    if (match is None) or (match.group(3) == "*"):
+        return None
+
+    return int(match.group(3))
+
+
+def _get_headers(response) -> dict:
+    return {name.lower(): value for name, value in response.getheaders()}
+
+
+def _fetch(url: str, part_path: str, logger: logging.Logger, if_range: str = None) -> dict:
+    # downloads the URL to the partial file, resuming from its current size if it exists (and if
+    # the remote file still matches the "If-Range" validator, if there is one)
+    hasher = hashlib.sha256()
+
+    if os.path.exists(part_path):
+        offset = os.path.getsize(part_path)
+    else:
+        offset = 0
+
+    headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "identity"}
+
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+
+        if if_range is not None:
+            headers["If-Range"] = if_range
+
+    start = time.perf_counter()
+    pool, conn, response = _open(url, headers)
+    latency = time.perf_counter() - start
+    reusable = False
+
+    try:
+        if (response.status == 416) and offset:
+            # the partial file is complete, or it doesn't match the remote file any more
+            total = _get_total(response.getheader("Content-Range"))
+            response.read()
+            reusable = not response.will_close
+
+            if total == offset:
+                logger.info("Download had already been completed.")
+                _hash_file(part_path, hasher)
+                return dict(sha256=hasher.hexdigest(), size=offset, transferred=0,
+                            headers=_get_headers(response), latency=latency, duration=0.0)
+
+            raise _ResumeError("Partial download doesn't match the remote file.")
+
+        if (response.status == 206) and offset:
+            content_range = response.getheader("Content-Range", "")
+
+            if not content_range.startswith(f"bytes {offset}-"):
+                raise _ResumeError(f"Unexpected range in response: {content_range}")
+
+            logger.info(f"Resuming download at {offset} bytes.")
+            _hash_file(part_path, hasher)
+            mode = "ab"
+
+        elif response.status == 200:
+            # the server doesn't support ranges, or there was nothing to resume
+            offset = 0
+            mode = "wb"
+
+        else:
+            raise DownloadError(f"HTTP error {response.status} ({response.reason})")
+
+        transferred = 0
+        start = time.perf_counter()
+
+        with open(part_path, mode) as file:
+            while True:
+                chunk = response.read(CHUNK_SIZE)
+
+                if not chunk:
+                    break
+
+                hasher.update(chunk)
+                file.write(chunk)
+                transferred += len(chunk)
+
+        # reading with a size returns no data (instead of raising an error) if the connection is
+        # closed early, but then the response is still missing some of its announced length
+        if response.length:
+            raise DownloadError(f"Connection was closed after {offset + transferred} bytes.")
+
+        reusable = not response.will_close
+
+        return dict(sha256=hasher.hexdigest(), size=offset + transferred,
+                    transferred=transferred, headers=_get_headers(response), latency=latency,
+                    duration=time.perf_counter() - start)
+
+    finally:
+        pool.release(conn, reusable)
+
+
+# Downloads the URL to the path, reusing keep-alive connections to the same host. The file is
+# written to "<path>.part" while it's being downloaded, so an interrupted download is resumed with
+# an HTTP range request the next time, and it's only moved to the path if it is complete (and
+# matches the expected sha256 hash, if there is one). Downloads are thread-safe. The result value
+# is a dict with the sha256 hash, the size of the file, the number of bytes which were actually
+# transferred, the response headers, the time until the response arrived ("latency"), and the
+# time it took to transfer the data ("duration").
+def download(url: str, path: str, sha256: str = None, if_range: str = None) -> KtrResult:
+    import http.client
+
+    logger = logging.getLogger("ktr/download")
+    part_path = path + ".part"
+
+    logger.info(f"Downloading {url}")
+
+    try:
+        try:
+            value = _fetch(url, part_path, logger, if_range)
+        except _ResumeError:
+            # the partial file can't be resumed, so start over
+            logger.warning("Partial download can't be resumed, starting over.")
+            os.remove(part_path)
+            value = _fetch(url, part_path, logger)
+
+    except (DownloadError, OSError, http.client.HTTPException) as error:
+        logger.error(f"{url} could not be downloaded: {error}")
+        return KtrResult(False)
+
+    if (sha256 is not None) and (value["sha256"] != sha256.lower()):
+        logger.error(f"sha256 of {url} doesn't match: {value['sha256']}")
+        os.remove(part_path)
+        return KtrResult(False)
+
+    os.replace(part_path, path)
+
+    return KtrResult(True, value)
+
+
+def _is_changed(headers: dict, etag: str, last_modified: str, content_length: int) -> bool:
+    # servers which ignore conditional requests are detected by comparing the headers directly
+    if (content_length is not None) and ("content-length" in headers):
+        if int(headers["content-length"]) != content_length:
+            return True
+
+    if (etag is not None) and ("etag" in headers):
+        return headers["etag"] != etag
+
+    if (last_modified is not None) and ("last-modified" in headers):
+        return headers["last-modified"] != last_modified
+
+    # without anything to compare, the file has to be assumed to have changed
+    return True
+
+
+# Checks whether the file at the URL has changed since it was downloaded, with a conditional HEAD
+# request ("If-None-Match" / "If-Modified-Since"), given the "ETag", "Last-Modified" and
+# "Content-Length" headers of the previous download. The result value is a dict with the result
+# of the check, the response headers, and the time until the response arrived.
+def check(url: str, etag: str = None, last_modified: str = None,
+          content_length: int = None) -> KtrResult:
+    import http.client
+
+    logger = logging.getLogger("ktr/download")
+
+    headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "identity"}
+
+    if etag is not None:
+        headers["If-None-Match"] = etag
+
+    if last_modified is not None:
+        headers["If-Modified-Since"] = last_modified
+
+    start = time.perf_counter()
+
+    try:
+        pool, conn, response = _open(url, headers, "HEAD")
+    except (DownloadError, OSError, http.client.HTTPException) as error:
+        logger.error(f"{url} could not be checked: {error}")
+        return KtrResult(False)
+
+    try:
+        response.read()
+    finally:
+        pool.release(conn, not response.will_close)
+
+    latency = time.perf_counter() - start
+
+    headers = _get_headers(response)
+
+    if response.status == 304:
+        changed = False
+    elif response.status == 200:
+        changed = _is_changed(headers, etag, last_modified, content_length)
+    elif response.status in [405, 501]:
+        # HEAD requests are not supported, so the file has to be downloaded again
+        changed = True
+    else:
+        logger.error(f"{url} could not be checked: HTTP error {response.status} "
+                     f"({response.reason})")
+        return KtrResult(False)
+
+    return KtrResult(True, dict(changed=changed, headers=headers, latency=latency))
@@ -0,0 +1,271 @@
+import hashlib
+import http.server
+import os
+import tempfile
+import threading
+import unittest
+
+from .downloader import check, download
+
+CONTENTS = bytes(range(256)) * 4096
+LAST_MODIFIED = "Thu, 01 Oct 2026 00:00:00 GMT"
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_HEAD(self):
+        self.server.requests.append((self.command, self.path))
+
+        if self.path != "/file.tar.gz":
+            self.send_error(404)
+            return
+
+        if self.headers.get("If-None-Match") == self.server.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("ETag", self.server.etag)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.send_header("Content-Length", str(len(CONTENTS)))
+        self.end_headers()
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get("Range")))
+
+        if self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/file.tar.gz")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if self.path != "/file.tar.gz":
+            self.send_error(404)
+            return
+
+        start = 0
+        range_header = self.headers.get("Range")
+
+        if_range = self.headers.get("If-Range")
+
+        if (range_header is not None) and self.server.ranges:
+            if (if_range is None) or (if_range == self.server.etag):
+                start = int(range_header[len("bytes="):].rstrip("-"))
+
+        if start >= len(CONTENTS):
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{len(CONTENTS)}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if start:
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(CONTENTS) - 1}/{len(CONTENTS)}")
+        else:
+            self.send_response(200)
+
+        self.send_header("ETag", self.server.etag)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.send_header("Content-Length", str(len(CONTENTS) - start))
+        self.end_headers()
+
+        # simulate a connection which breaks during the download
+        if self.server.limit is not None:
+            self.wfile.write(CONTENTS[start:self.server.limit])
+            self.close_connection = True
+        else:
+            self.wfile.write(CONTENTS[start:])
+
+
+def serve(testcase: unittest.TestCase) -> http.server.HTTPServer:
+    # starts a local HTTP server for the test, which is stopped when the test is finished
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.requests = list()
+    server.ranges = True
+    server.etag = '"1"'
+    server.limit = None
+    server.url = f"http://127.0.0.1:{server.server_port}"
+
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+
+    def stop():
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+    testcase.addCleanup(stop)
+    return server
+
+
+class DownloaderTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+
+        self.server = serve(self)
+
+        self.url = self.server.url
+        self.path = os.path.join(self.tempdir.name, "file.tar.gz")
+        self.sha256 = hashlib.sha256(CONTENTS).hexdigest()
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def _check_file(self):
+        with open(self.path, "rb") as file:
+            self.assertEqual(file.read(), CONTENTS)
+
+        self.assertFalse(os.path.exists(self.path + ".part"))
+
+    def test_download(self):
+        res = download(self.url + "/file.tar.gz", self.path, self.sha256.upper())
+
+        self.assertTrue(res.success)
+        self.assertEqual(res.value["sha256"], self.sha256)
+        self.assertEqual(res.value["transferred"], len(CONTENTS))
+        self.assertEqual(res.value["headers"]["content-length"], str(len(CONTENTS)))
+        self._check_file()
+
+    def test_keep_alive(self):
+        for _ in range(3):
+            self.assertTrue(download(self.url + "/redirect", self.path).success)
+
+        self.assertEqual(len(self.server.requests), 6)
+        self.assertEqual(self.server.connections, 1)
+        self._check_file()
+
+    def test_resume(self):
+        with open(self.path + ".part", "wb") as file:
+            file.write(CONTENTS[0:1000])
+
+        res = download(self.url + "/file.tar.gz", self.path, self.sha256)
+
+        self.assertTrue(res.success)
+        self.assertEqual(res.value["transferred"], len(CONTENTS) - 1000)
+        self.assertEqual(self.server.requests, [("/file.tar.gz", "bytes=1000-")])
+        self._check_file()
+
+        # complete partial files are not downloaded again
+        with open(self.path + ".part", "wb") as file:
+            file.write(CONTENTS)
+
+        res = download(self.url + "/file.tar.gz", self.path, self.sha256)
+
+        self.assertTrue(res.success)
+        self.assertEqual(res.value["transferred"], 0)
+        self._check_file()
+
+    def test_interrupted(self):
+        self.server.limit = 100000
+
+        self.assertFalse(download(self.url + "/file.tar.gz", self.path, self.sha256).success)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(os.path.getsize(self.path + ".part"), 100000)
+
+        self.server.limit = None
+
+        res = download(self.url + "/file.tar.gz", self.path, self.sha256)
+        self.assertTrue(res.success)
+        self.assertEqual(res.value["transferred"], len(CONTENTS) - 100000)
+        self._check_file()
+
+    def test_resume_changed(self):
+        with open(self.path + ".part", "wb") as file:
+            file.write(CONTENTS[0:1000])
+
+        self.server.etag = '"2"'
+
+        res = download(self.url + "/file.tar.gz", self.path, self.sha256, if_range='"2"')
+        self.assertTrue(res.success)
+        self.assertEqual(res.value["transferred"], len(CONTENTS) - 1000)
+
+        # the partial file belongs to an older version of the file
+        with open(self.path + ".part", "wb") as file:
+            file.write(b"x" * 1000)
+
+        res = download(self.url + "/file.tar.gz", self.path, self.sha256, if_range='"1"')
+        self.assertTrue(res.success)
+        self.assertEqual(res.value["transferred"], len(CONTENTS))
+        self._check_file()
+
+    def test_check(self):
+        url = self.url + "/file.tar.gz"
+
+        res = download(url, self.path)
+        headers = res.value["headers"]
+
+        self.assertEqual(headers["etag"], '"1"')
+        self.assertEqual(headers["last-modified"], LAST_MODIFIED)
+
+        # the server answers with "304 Not Modified"
+        res = check(url, headers["etag"], headers["last-modified"], len(CONTENTS))
+        self.assertTrue(res.success)
+        self.assertFalse(res.value["changed"])
+
+        # the server ignores "If-None-Match", so the headers are compared
+        res = check(url, None, LAST_MODIFIED, len(CONTENTS))
+        self.assertTrue(res.success)
+        self.assertFalse(res.value["changed"])
+
+        self.assertTrue(check(url, None, LAST_MODIFIED, len(CONTENTS) + 1).value["changed"])
+        self.assertTrue(check(url).value["changed"])
+
+        self.server.etag = '"2"'
+        self.assertTrue(check(url, headers["etag"], LAST_MODIFIED).value["changed"])
+
+        # no file contents are transferred for checks
+        self.assertEqual([request[0] for request in self.server.requests[1:]], ["HEAD"] * 5)
+
+        self.assertFalse(check(self.url + "/missing.tar.gz").success)
+
+    def test_resume_unsupported(self):
+        self.server.ranges = False
+
+        with open(self.path + ".part", "wb") as file:
+            file.write(b"x" * 1000)
+
+        res = download(self.url + "/file.tar.gz", self.path, self.sha256)
+
+        self.assertTrue(res.success)
+        self.assertEqual(res.value["transferred"], len(CONTENTS))
+        self._check_file()
+
+    def test_errors(self):
+        self.assertFalse(download(self.url + "/missing.tar.gz", self.path).success)
+        self.assertFalse(os.path.exists(self.path))
+
+        self.assertFalse(download(self.url + "/file.tar.gz", self.path, "0" * 64).success)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(os.path.exists(self.path + ".part"))
+
+        self.assertFalse(download("ftp://127.0.0.1/file.tar.gz", self.path).success)
+
+    def test_concurrent(self):
+        paths = [os.path.join(self.tempdir.name, f"file-{i}.tar.gz") for i in range(8)]
+        results = [None] * len(paths)
+
+        def run(index: int):
+            results[index] = download(self.url + "/file.tar.gz", paths[index], self.sha256)
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(len(paths))]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(all(res.success for res in results))
+        self.assertLessEqual(self.server.connections, 4)
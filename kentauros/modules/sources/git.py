@@ -1,11 +1,18 @@
 import configparser as cp
+import contextlib
 import datetime
+import fcntl
+import hashlib
 import logging
 import os
+import re
 import shutil
-
-from git import Repo
-from git.exc import BadName
+import subprocess as sp
+import tarfile
+import tempfile
+import threading
+import time
+import zlib
 
 from kentauros.conntest import is_connected
 from kentauros.context import KtrContext
@@ -14,6 +21,8 @@ from kentauros.result import KtrResult
 from kentauros.shell_env import ShellEnv
 from kentauros.validator import KtrValidator
 from .abstract import Source
+from .compression import DEFAULT_COMPRESSION, get_compression, get_compressor, get_extension
+from .git_reader import GitReader, GitReaderError
 
 GIT_STATUS_TEMPLATE = """
 git source module:
@@ -23,12 +32,70 @@ git source module:
 """.lstrip("\n")
 
 
+# full clones download the whole history, shallow clones only the commit of the ref, and blobless
+# (partial) clones download the whole history without file contents
+CLONE_MODES = ["full", "shallow", "blobless"]
+
+# submodules are fetched in parallel; this is mostly waiting for the network, not the CPU
+SUBMODULE_JOBS = 8
+
+# mode of gitlinks (commits of submodules) in tree objects
+GITLINK_MODE = "160000"
+
+# cached tarballs which are not linked from any sources directory anymore are removed after they
+# haven't been used for this long
+EXPORT_CACHE_MAX_AGE = 30 * 86400
+
+# the export cache is checked for unused tarballs at most this often
+EXPORT_CACHE_PRUNE_INTERVAL = 86400
+
+
+def is_commit(ref: str) -> bool:
+    return re.fullmatch("[0-9a-f]{40}", ref) is not None
+
+
+# commit metadata is cached for the duration of a run:
+# (repository path, ref, HEAD) -> (commit hash, commit datetime)
+_metadata = dict()
+_metadata_lock = threading.Lock()
+
+
+def prune_exports(path: str, max_age: float = EXPORT_CACHE_MAX_AGE) -> int:
+    # removes unused tarballs from the export cache, and returns the number of removed files
+    removed = 0
+    deadline = time.time() - max_age
+
+    for directory, _, files in os.walk(path):
+        for file in files:
+            file_path = os.path.join(directory, file)
+
+            try:
+                stat = os.stat(file_path)
+
+                # files with other links are still the exported tarball of some package
+                if (stat.st_nlink == 1) and (stat.st_mtime < deadline):
+                    os.remove(file_path)
+                    removed += 1
+            except FileNotFoundError:
+                # removed by a concurrent run
+                pass
+
+    return removed
+
+
+def _invalidate(path: str):
+    with _metadata_lock:
+        for key in [key for key in _metadata.keys() if key[0] == path]:
+            _metadata.pop(key)
+
+
 class GitRepo:
     def __init__(self, path: str, ref: str = None):
         assert isinstance(path, str)
 
         self.path = path
-        self.repo = Repo(self.path)
+        self._repo = None
+        self._reader = None
 
         if ref is None:
             self.ref = "HEAD"
@@ -37,44 +104,123 @@ class GitRepo:
 
         self.logger = logging.getLogger("ktr/git")
 
-    def get_commit(self, ref: str = None) -> KtrResult:
+    @property
+    def repo(self):
+        # GitPython is slow to import and starts helper processes, so it is only used if the
+        # metadata of a ref can't be read directly
+        if self._repo is None:
+            from git import Repo
+            self._repo = Repo(self.path)
+
+        return self._repo
+
+    def _get_head(self) -> str:
+        # the checked out commit is part of the metadata cache key, so the cache doesn't return
+        # results for a different checkout
+        try:
+            if self._reader is None:
+                self._reader = GitReader(self.path)
+
+            return self._reader.head()
+        except (GitReaderError, OSError):
+            return None
+
+    def _read_metadata(self, ref: str) -> tuple:
+        if self._reader is None:
+            return None
+
+        try:
+            commit = self._reader.resolve(ref)
+
+            if commit is None:
+                return None
+
+            return commit, self._reader.commit_datetime(commit)
+        except (GitReaderError, OSError, ValueError, zlib.error) as error:
+            self.logger.debug(f"Falling back to GitPython for ref '{ref}': {error!r}")
+            return None
+
+    def _read_metadata_gitpython(self, ref: str) -> tuple:
+        from git.exc import BadName
+
+        # annotated tags are resolved to the commit they point to
+        try:
+            commit_obj = self.repo.commit(self.repo.rev_parse(ref + "^{commit}").hexsha)
+        except (BadName, ValueError) as error:
+            self.logger.error(repr(error))
+            return None
+
+        return (commit_obj.hexsha,
+                commit_obj.committed_datetime.astimezone(datetime.timezone.utc))
+
+    def get_metadata(self, ref: str = None) -> KtrResult:
         if ref is None:
             ref = self.ref
         assert isinstance(ref, str)
 
         ret = KtrResult()
 
-        try:
-            rev = self.repo.rev_parse(ref)
-        except BadName as error:
-            self.logger.error(repr(error))
+        head = self._get_head()
+        key = (os.path.abspath(self.path), ref, head)
+
+        if head is not None:
+            with _metadata_lock:
+                metadata = _metadata.get(key)
+
+            if metadata is not None:
+                ret.value = metadata
+                return ret.submit(True)
+
+        metadata = self._read_metadata(ref)
+
+        if metadata is None:
+            metadata = self._read_metadata_gitpython(ref)
+
+        if metadata is None:
             return ret.submit(False)
 
-        ret.value = rev.hexsha
+        if head is not None:
+            with _metadata_lock:
+                _metadata[key] = metadata
+
+        ret.value = metadata
         return ret.submit(True)
 
-    def get_datetime(self, ref: str = None) -> KtrResult:
+    def get_tree(self, ref: str = None) -> KtrResult:
+        # the hash of the file tree of the commit the ref points to
         if ref is None:
             ref = self.ref
         assert isinstance(ref, str)
 
-        ret = KtrResult()
-
         res = self.get_commit(ref)
-        ret.collect(res)
 
         if not res.success:
-            return ret.submit(False)
-        commit = res.value
+            return res
 
         try:
-            commit_obj = self.repo.commit(commit)
-        except BadName as error:
-            self.logger.error(repr(error))
-            return ret.submit(False)
+            if self._reader is not None:
+                return KtrResult(True, self._reader.commit_tree(res.value))
+        except (GitReaderError, OSError, ValueError, zlib.error) as error:
+            self.logger.debug(f"Falling back to git rev-parse for ref '{ref}': {error!r}")
 
-        ret.value = commit_obj.committed_datetime.astimezone(datetime.timezone.utc)
-        return ret.submit(True)
+        with ShellEnv(self.path) as env:
+            return env.execute("git", "rev-parse", "--verify", res.value + "^{tree}")
+
+    def get_commit(self, ref: str = None) -> KtrResult:
+        res = self.get_metadata(ref)
+
+        if res.success:
+            res.value = res.value[0]
+
+        return res
+
+    def get_datetime(self, ref: str = None) -> KtrResult:
+        res = self.get_metadata(ref)
+
+        if res.success:
+            res.value = res.value[1]
+
+        return res
 
     def get_datetime_str(self, ref: str = None) -> KtrResult:
         if ref is None:
@@ -137,64 +283,403 @@ class GitRepo:
 
         with ShellEnv(self.path) as env:
             ret = env.execute("git", "checkout", ref)
+
+        _invalidate(os.path.abspath(self.path))
         return ret
 
-    def pull(self, rebase: bool = True, all_branches: bool = True, ref: str = None) -> KtrResult:
+    def _get_refspec(self, ref: str) -> KtrResult:
+        # tags are fetched into the tag itself, replacing it if it was moved upstream, and branches
+        # into their remote-tracking branch; the value is the refspec and the ref to check out
+        if is_commit(ref):
+            return KtrResult(True, (ref, None))
+
+        with ShellEnv(self.path) as env:
+            res = env.execute("git", "ls-remote", "origin", "refs/tags/" + ref, "refs/heads/" + ref)
+
+        if not res.success:
+            return KtrResult(False)
+
+        names = [line.split("\t", 1)[1].strip() for line in res.value.splitlines() if "\t" in line]
+
+        if "refs/tags/" + ref in names:
+            return KtrResult(True, ("+refs/tags/{0}:refs/tags/{0}".format(ref), "refs/tags/" + ref))
+        elif "refs/heads/" + ref in names:
+            return KtrResult(True, ("+refs/heads/{0}:refs/remotes/origin/{0}".format(ref), None))
+        else:
+            return KtrResult(True, (ref, None))
+
+    def fetch(self, ref: str = None, shallow: bool = False, logfile: str = None) -> KtrResult:
+        # fetches only the given branch, tag or commit, and checks it out (branches as a local
+        # branch with the same name, so they can be resolved like in a full clone, and tags and
+        # commits detached, so no branches shadow the names of tags)
         if ref is None:
             ref = self.ref
         assert isinstance(ref, str)
 
         ret = KtrResult()
 
-        cmd = ["git", "pull"]
+        res = self._get_refspec(ref)
+        ret.collect(res)
+
+        if not res.success:
+            return ret.submit(False)
+        refspec, tag = res.value
 
-        if rebase:
-            cmd.append("--rebase")
+        cmd = ["git", "fetch"]
 
-        if all_branches:
-            cmd.append("--all")
+        if shallow:
+            cmd.append("--depth=1")
+
+        cmd.extend(["origin", refspec])
 
-        # execute "git pull" command
-        # ignore return codes different than 0, which indicates "Everything up-to-date" or errors
         with ShellEnv(self.path) as env:
-            res = env.execute(*cmd, ignore_retcode=True)
+            res = env.execute(*cmd, stream=True, logfile=logfile)
         ret.collect(res)
 
+        _invalidate(os.path.abspath(self.path))
+
         if not res.success:
             return ret.submit(False)
 
-        res = self.checkout(ref)
+        if tag is not None:
+            cmd = ["git", "checkout", "--detach", tag]
+        elif is_commit(ref):
+            cmd = ["git", "checkout", "--detach", "FETCH_HEAD"]
+        else:
+            cmd = ["git", "checkout", "-B", ref, "FETCH_HEAD"]
+
+        with ShellEnv(self.path) as env:
+            res = env.execute(*cmd)
+        ret.collect(res)
+
+        _invalidate(os.path.abspath(self.path))
+        return ret
+
+    def update(self, ref: str = None, shallow: bool = False, logfile: str = None) -> KtrResult:
+        # only the tracked ref is fetched, and the local branch is moved to the fetched commit
+        # (without merging or rebasing); the result value is the (old, new) pair of commits
+        if ref is None:
+            ref = self.ref
+        assert isinstance(ref, str)
+
+        ret = KtrResult()
+
+        res = self.get_commit("HEAD")
         ret.collect(res)
 
         if not res.success:
             return ret.submit(False)
+        old = res.value
 
+        res = self.fetch(ref, shallow, logfile)
+        ret.collect(res)
+
+        if not res.success:
+            self.logger.error(f"Ref '{ref}' could not be fetched.")
+            return ret.submit(False)
+
+        res = self.get_commit("HEAD")
+        ret.collect(res)
+
+        if not res.success:
+            return ret.submit(False)
+
+        ret.value = (old, res.value)
         return ret.submit(True)
 
-    def export(self, prefix: str, path: str, ref: str = None) -> KtrResult:
+    def update_submodules(self, mode: str = "full", jobs: int = SUBMODULE_JOBS,
+                          logfile: str = None) -> KtrResult:
+        # checks out the submodules (recursively) at the commits recorded in the checked out
+        # commit, fetching up to "jobs" submodules at the same time with the same clone mode
+        assert mode in CLONE_MODES
+
+        cmd = ["git", "submodule", "update", "--init", "--recursive", f"--jobs={max(jobs, 1)}"]
+
+        if mode == "shallow":
+            cmd.append("--depth=1")
+        elif mode == "blobless":
+            cmd.append("--filter=blob:none")
+
+        with ShellEnv(self.path) as env:
+            return env.execute(*cmd, stream=True, logfile=logfile)
+
+    def get_submodules(self, ref: str = None, prefix: str = "") -> KtrResult:
+        # the value is a list of (repository path, archive prefix, commit) tuples for all
+        # submodules of the ref, including nested submodules of submodules
         if ref is None:
             ref = self.ref
         assert isinstance(ref, str)
 
         with ShellEnv(self.path) as env:
-            ret = env.execute("git", "archive", ref, "--prefix=" + prefix, "--output", path)
+            res = env.execute("git", "ls-tree", "-r", "-z", ref)
+
+        if not res.success:
+            return KtrResult(False)
+
+        submodules = list()
+
+        for entry in res.value.split("\0"):
+            if not entry:
+                continue
+
+            info, path = entry.split("\t", 1)
+            mode, _, commit = info.split()
+
+            if mode != GITLINK_MODE:
+                continue
+
+            sub_path = os.path.join(self.path, path)
+
+            if not os.path.exists(os.path.join(sub_path, ".git")):
+                self.logger.error(f"Submodule '{path}' has not been checked out.")
+                return KtrResult(False)
+
+            sub_prefix = prefix + path + "/"
+            submodules.append((sub_path, sub_prefix, commit))
+
+            res = GitRepo(sub_path, commit).get_submodules(commit, sub_prefix)
+
+            if not res.success:
+                return res
+
+            submodules.extend(res.value)
+
+        return KtrResult(True, submodules)
+
+    def _export_submodules(self, prefix: str, path: str, ref: str,
+                           compression: str) -> KtrResult:
+        # "git archive" ignores submodules, so the archives of the superproject and of all
+        # submodules are merged into one tar stream, which is streamed to the compressor
+        res = self.get_submodules(ref, prefix)
+
+        if not res.success:
+            return res
+
+        archives = [(self.path, prefix, ref)] + res.value
+
+        res = self.get_commit(ref)
+
+        if not res.success:
+            return res
+
+        # the commit of the superproject is recorded like "git archive" does it, so
+        # "git get-tar-commit-id" works for the merged tarball, too
+        pax_headers = {"comment": res.value}
+
+        compressor = get_compressor(compression)
+        written = set()
+
+        with contextlib.ExitStack() as stack:
+            output = stack.enter_context(open(path, "wb"))
+
+            if compressor is not None:
+                self.logger.debug(" ".join(compressor))
+                process = stack.enter_context(sp.Popen(compressor, stdin=sp.PIPE, stdout=output))
+                stream = process.stdin
+            else:
+                process = None
+                stream = output
+
+            try:
+                with tarfile.open(fileobj=stream, mode="w|", format=tarfile.PAX_FORMAT,
+                                  pax_headers=pax_headers) as merged:
+                    for repo_path, repo_prefix, repo_ref in archives:
+                        res = self._merge_archive(merged, written, repo_path, repo_prefix,
+                                                  repo_ref)
+
+                        if not res.success:
+                            return res
+
+            except (OSError, tarfile.TarError) as error:
+                self.logger.error(f"Tarball could not be written: {error}")
+                return KtrResult(False)
+
+            finally:
+                if process is not None:
+                    process.stdin.close()
+                    process.wait()
+
+            if (process is not None) and (process.returncode != 0):
+                self.logger.error(f"The compressor failed ({process.returncode}).")
+                return KtrResult(False)
+
+        return KtrResult(True)
+
+    def _merge_archive(self, merged: tarfile.TarFile, written: set, path: str, prefix: str,
+                       ref: str) -> KtrResult:
+        cmd = ["git", "archive", "--format=tar", "--prefix=" + prefix, ref]
+        self.logger.debug(" ".join(cmd))
+
+        with tempfile.TemporaryFile() as errors, \
+                sp.Popen(cmd, cwd=path, stdout=sp.PIPE, stderr=errors) as process:
+            with tarfile.open(fileobj=process.stdout, mode="r|") as archive:
+                for member in archive:
+                    # submodules are empty directories in the archive of their superproject
+                    if member.isdir() and (member.name in written):
+                        continue
+
+                    written.add(member.name)
+
+                    if member.isfile():
+                        merged.addfile(member, archive.extractfile(member))
+                    else:
+                        merged.addfile(member)
+
+            # the archive may be padded after the end-of-archive marker
+            process.stdout.read()
+            process.wait()
+
+            if process.returncode != 0:
+                errors.seek(0)
+                self.logger.error(f"Submodule at '{path}' could not be archived:")
+                self.logger.error(errors.read().decode(errors="replace").strip())
+                return KtrResult(False)
+
+        return KtrResult(True)
+
+    def export(self, prefix: str, path: str, ref: str = None,
+               compression: str = DEFAULT_COMPRESSION, submodules: bool = False) -> KtrResult:
+        if ref is None:
+            ref = self.ref
+        assert isinstance(ref, str)
+
+        commands = [["git", "archive", "--format=tar", "--prefix=" + prefix, ref]]
+        compressor = get_compressor(compression)
+
+        # the archive is streamed to the (multi-threaded) compressor
+        if compressor is not None:
+            commands.append(compressor)
+
+        # the tarball is written to a temporary file first, so an interrupted export never
+        # leaves an incomplete file that looks like it was exported successfully
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)),
+                                         prefix=".ktr-export-")
+        os.close(fd)
+
+        if submodules:
+            ret = self._export_submodules(prefix, temp_path, ref, compression)
+        else:
+            with ShellEnv(self.path) as env:
+                ret = env.execute_pipeline(*commands, output=temp_path)
+
+        if ret.success:
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        elif os.path.exists(temp_path):
+            os.remove(temp_path)
+
         return ret
 
     @staticmethod
-    def clone(path: str, orig: str, ref: str = None, shallow: bool = False) -> KtrResult:
+    def resolve_remote(output: str, ref: str) -> str:
+        # ls-remote patterns also match at path boundaries ("master" matches "refs/heads/x/master"),
+        # so look for the ref like "git rev-parse" would; annotated tags are resolved to commits
+        refs = dict()
+
+        for line in output.splitlines():
+            if "\t" in line:
+                commit, name = line.split("\t", 1)
+                refs[name.strip()] = commit.strip()
+
+        for name in [ref + "^{}", ref,
+                     "refs/tags/" + ref + "^{}", "refs/tags/" + ref, "refs/heads/" + ref]:
+            if name in refs:
+                return refs[name]
+
+        return None
+
+    @staticmethod
+    async def ls_remote_async(orig: str, ref: str) -> KtrResult:
+        assert isinstance(orig, str)
+        assert isinstance(ref, str)
+
+        # full commit hashes can't (and don't need to) be resolved on the remote
+        if is_commit(ref):
+            return KtrResult(True, ref)
+
+        with ShellEnv() as env:
+            res = await env.execute_async("git", "ls-remote", orig, ref, ref + "^{}")
+
+        if not res.success:
+            return KtrResult(False)
+
+        commit = GitRepo.resolve_remote(res.value, ref)
+
+        if commit is None:
+            logging.getLogger("ktr/git").error(f"Ref '{ref}' could not be found on {orig}.")
+            return KtrResult(False)
+
+        return KtrResult(True, commit)
+
+    @staticmethod
+    def _clone_shallow(path: str, orig: str, ref: str, logfile: str = None,
+                       reference: str = None) -> KtrResult:
+        # "git clone --depth" can only fetch branches and tags, so the repository is initialized
+        # first, and then the history of the ref is fetched up to a depth of one commit
+        ret = KtrResult()
+
+        _invalidate(os.path.abspath(path))
+
+        with ShellEnv() as env:
+            res = env.execute("git", "init", "--quiet", path)
+        ret.collect(res)
+
+        if not res.success:
+            return ret.submit(False)
+
+        if reference is not None:
+            with open(os.path.join(path, ".git", "objects", "info", "alternates"), "w") as file:
+                file.write(os.path.join(os.path.abspath(reference), "objects") + "\n")
+
+        with ShellEnv(path) as env:
+            res = env.execute("git", "remote", "add", "origin", orig)
+        ret.collect(res)
+
+        if not res.success:
+            return ret.submit(False)
+
+        repo = GitRepo(path, ref)
+
+        res = repo.fetch(ref, True, logfile)
+        ret.collect(res)
+
+        if not res.success:
+            return ret.submit(False)
+
+        ret.value = repo
+        return ret.submit(True)
+
+    @staticmethod
+    def clone(path: str, orig: str, ref: str = None, mode: str = "full",
+              logfile: str = None, reference: str = None) -> KtrResult:
         assert isinstance(path, str)
         assert isinstance(orig, str)
         assert isinstance(ref, str)
+        assert mode in CLONE_MODES
+
+        if mode == "shallow":
+            return GitRepo._clone_shallow(path, orig, ref, logfile, reference)
 
         ret = KtrResult()
 
+        # there might be cached metadata for a repository which was deleted from the same path
+        _invalidate(os.path.abspath(path))
+
+        cmd = ["git", "clone"]
+
+        # only commits and trees are downloaded, file contents are fetched when they are needed
+        if mode == "blobless":
+            cmd.append("--filter=blob:none")
+
+        # objects which are present in the reference repository are not downloaded again
+        if reference is not None:
+            cmd.extend(["--reference", reference])
+
+        cmd.extend([orig, path])
+
         # clone the repository
-        if not shallow:
-            with ShellEnv() as env:
-                res = env.execute("git", "clone", orig, path)
-        else:
-            with ShellEnv() as env:
-                res = env.execute("git", "clone", "--depth=1", orig, path)
+        with ShellEnv() as env:
+            res = env.execute(*cmd, stream=True, logfile=logfile)
 
         ret.collect(res)
 
@@ -214,6 +699,59 @@ class GitRepo:
         return ret.submit(True)
 
 
+# A bare mirror of an upstream repository, which is shared by all packages with the same "orig"
+# URL. Mirrors are stored in the cache directory and updated incrementally, and clones of packages
+# borrow objects from them (with "git clone --reference"), so every object is only downloaded once.
+class GitMirror:
+    def __init__(self, cachedir: str, orig: str):
+        assert isinstance(cachedir, str)
+        assert isinstance(orig, str)
+
+        self.orig = orig
+
+        key = hashlib.sha1(orig.encode("utf-8")).hexdigest()
+        self.path = os.path.join(cachedir, "git", key + ".git")
+
+        self.logger = logging.getLogger("ktr/git/mirror")
+
+    @contextlib.contextmanager
+    def _locked(self):
+        # only one thread or ktr process updates a mirror at the same time
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        with open(self.path + ".lock", "w") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def update(self, logfile: str = None) -> KtrResult:
+        with self._locked():
+            if os.path.exists(self.path):
+                self.logger.info(f"Updating mirror of {self.orig}.")
+
+                with ShellEnv(self.path) as env:
+                    ret = env.execute("git", "fetch", "--prune", "origin",
+                                      stream=True, logfile=logfile)
+            else:
+                self.logger.info(f"Creating mirror of {self.orig}.")
+
+                with ShellEnv() as env:
+                    ret = env.execute("git", "clone", "--mirror", self.orig, self.path,
+                                      stream=True, logfile=logfile)
+
+                if not ret.success:
+                    return ret
+
+                # clones borrow objects from the mirror, so they must never be pruned
+                with ShellEnv(self.path) as env:
+                    ret.collect(env.execute("git", "config", "gc.pruneExpire", "never"))
+
+        return ret
+
+
 FALLBACK_TEMPLATE = "%{version}%{version_sep}%{date}.%{time}.git%{shortcommit}"
 
 
@@ -229,6 +767,8 @@ class GitSource(Source):
         self.saved_date: datetime.datetime = None
         self.saved_commit: str = None
 
+        self._repo: GitRepo = None
+
         self._logger = logging.getLogger("ktr/source/git")
 
     def __str__(self) -> str:
@@ -242,18 +782,25 @@ class GitSource(Source):
         return self._logger
 
     def verify(self) -> KtrResult:
-        expected_keys = ["keep", "keep_repo", "orig", "ref", "shallow"]
+        expected_keys = ["keep", "keep_repo", "orig", "ref"]
         expected_binaries = ["git"]
 
         validator = KtrValidator(self.package.conf.conf, "git", expected_keys, expected_binaries)
 
         ret = validator.validate()
 
-        # shallow clones and checking out a specific commit is not supported
-        if (self.get_ref() != "master") and self.get_shallow():
-            self.logger.error(
-                "Shallow clones are not compatible with specifying a specific ref.")
+        if self.get_clone_mode() not in CLONE_MODES:
+            self.logger.error("Invalid clone_mode, must be one of: " + ", ".join(CLONE_MODES))
+            return ret.submit(False)
 
+        try:
+            compressor = get_compressor(self.get_compression())
+        except ValueError as error:
+            self.logger.error(str(error))
+            return ret.submit(False)
+
+        if (compressor is not None) and (shutil.which(compressor[0]) is None):
+            self.logger.error(f"The compressor '{compressor[0]}' could not be found.")
             return ret.submit(False)
 
         return ret
@@ -275,12 +822,82 @@ class GitSource(Source):
         else:
             return ref
 
+    def _get_repo(self) -> GitRepo:
+        # the same instance is used for all operations on the repository of this package
+        if self._repo is None:
+            self._repo = GitRepo(self.dest, self.get_ref())
+
+        return self._repo
+
     def _get_commit(self) -> KtrResult:
-        repo = GitRepo(self.dest)
-        return repo.get_commit(self.get_ref())
+        return self._get_repo().get_commit(self.get_ref())
 
     def get_shallow(self) -> bool:
-        return self.package.conf.getboolean("git", "shallow")
+        try:
+            return self.package.conf.getboolean("git", "shallow")
+        except (cp.NoSectionError, cp.NoOptionError, KeyError):
+            return False
+
+    def get_compression(self) -> str:
+        return get_compression(self.package.conf, "git")
+
+    def get_clone_mode(self) -> str:
+        # "shallow = true" is equivalent to "clone_mode = shallow", for older configurations
+        try:
+            mode = self.package.conf.get("git", "clone_mode")
+        except (cp.NoSectionError, cp.NoOptionError, KeyError):
+            mode = ""
+
+        if mode:
+            return mode
+        elif self.get_shallow():
+            return "shallow"
+        else:
+            return "full"
+
+    def get_submodules(self) -> bool:
+        try:
+            return self.package.conf.getboolean("git", "submodules")
+        except (cp.NoSectionError, cp.NoOptionError, KeyError):
+            return False
+
+    def get_submodule_jobs(self) -> int:
+        try:
+            return int(self.package.conf.get("git", "submodule_jobs"))
+        except (cp.NoSectionError, cp.NoOptionError, KeyError, ValueError):
+            return SUBMODULE_JOBS
+
+    def _update_submodules(self) -> KtrResult:
+        if not self.get_submodules():
+            return KtrResult(True)
+
+        res = self._get_repo().update_submodules(self.get_clone_mode(), self.get_submodule_jobs(),
+                                                 self.get_command_log("git-submodule"))
+
+        if not res.success:
+            self.logger.error("Submodules could not be checked out.")
+
+        return res
+
+    def get_mirror(self) -> bool:
+        try:
+            return self.package.conf.getboolean("git", "mirror")
+        except (cp.NoSectionError, cp.NoOptionError, KeyError):
+            return False
+
+    def _update_mirror(self) -> GitMirror:
+        # returns None if mirrors are disabled or the mirror couldn't be updated
+        if not self.get_mirror():
+            return None
+
+        mirror = GitMirror(self.context.get_cachedir(), self.get_orig())
+        res = mirror.update(self.get_command_log("git-mirror"))
+
+        if not res.success:
+            self.logger.warning("The shared mirror could not be updated, it will not be used.")
+            return None
+
+        return mirror
 
     def datetime(self) -> KtrResult:
         ret = KtrResult()
@@ -308,8 +925,7 @@ class GitSource(Source):
                 self.logger.error("Falling back to 'now'.")
                 dt = datetime.datetime.now().astimezone(datetime.timezone.utc)
         else:
-            repo = GitRepo(self.dest)
-            res = repo.get_datetime(self.get_ref())
+            res = self._get_repo().get_datetime(self.get_ref())
 
             if not res.success:
                 return ret.submit(False)
@@ -462,19 +1078,17 @@ class GitSource(Source):
         if "%{version_sep}" in template:
             template = template.replace("%{version_sep}", self.package.get_version_separator())
 
-        if "%{date}" in template:
-            res = self.date()
+        # the commit date is only looked up once, for both %{date} and %{time}
+        if ("%{date}" in template) or ("%{time}" in template):
+            res = self.datetime()
             ret.collect(res)
 
             if res.success:
-                template = template.replace("%{date}", res.value)
-
-        if "%{time}" in template:
-            res = self.time()
-            ret.collect(res)
-
-            if res.success:
-                template = template.replace("%{time}", res.value)
+                dt = res.value
+                template = template.replace(
+                    "%{date}", "{:04d}{:02d}{:02d}".format(dt.year, dt.month, dt.day))
+                template = template.replace(
+                    "%{time}", "{:02d}{:02d}{:02d}".format(dt.hour, dt.minute, dt.second))
 
         # determine commit hash and shortcommit
         res = self.commit()
@@ -500,12 +1114,34 @@ class GitSource(Source):
         ret.state["version_format"] = template
         return ret
 
+    async def check_async(self) -> KtrResult:
+        # compares the upstream commit of the ref with the last one that was processed, without
+        # downloading anything; the result value is True if the package needs to be updated
+        ret = KtrResult()
+
+        res = await GitRepo.ls_remote_async(self.get_orig(), self.get_ref())
+        ret.collect(res)
+
+        if not res.success:
+            self.logger.error("Upstream of package '{}' couldn't be checked.".format(
+                self.package.conf_name))
+            return ret.submit(False)
+
+        state = self.context.state.read(self.package.conf_name)
+        last_commit = state.get("git_last_commit", "")
+
+        if res.value != last_commit:
+            self.logger.info("Package '{}' has upstream changes: {} -> {}".format(
+                self.package.conf_name, last_commit[0:7] or "none", res.value[0:7]))
+
+        ret.value = res.value != last_commit
+        return ret.submit(True)
+
     def _checkout(self, ref: str = None) -> KtrResult():
         if ref is None:
             ref = self.get_ref()
 
-        repo = GitRepo(self.dest)
-        return repo.checkout(ref)
+        return self._get_repo().checkout(ref)
 
     def get(self) -> KtrResult:
         # check if $KTR_BASE_DIR/sources/$PACKAGE exists and create if not
@@ -529,8 +1165,23 @@ class GitSource(Source):
             self.logger.error("No connection to remote host detected. Cancelling source checkout.")
             return ret.submit(False)
 
+        mirror = self._update_mirror()
+
+        if mirror is not None:
+            reference = mirror.path
+        else:
+            reference = None
+
         # clone the repository and check out the specified ref
-        res = GitRepo.clone(self.dest, self.get_orig(), self.get_ref(), self.get_shallow())
+        res = GitRepo.clone(self.dest, self.get_orig(), self.get_ref(), self.get_clone_mode(),
+                            self.get_command_log("git-clone"), reference)
+        ret.collect(res)
+
+        if not res.success:
+            return ret.submit(False)
+        self._repo = res.value
+
+        res = self._update_submodules()
         ret.collect(res)
 
         if not res.success:
@@ -564,31 +1215,32 @@ class GitSource(Source):
             self.logger.error("No connection to remote host detected. Cancelling source update.")
             return ret.submit(False)
 
-        # get old commit ID
-        res = self.commit()
+        # new objects are downloaded into the shared mirror, if it is used
+        self._update_mirror()
+
+        # fetch the ref and move the local branch to it
+        res = self._get_repo().update(self.get_ref(), self.get_clone_mode() == "shallow",
+                                      self.get_command_log("git-fetch"))
         ret.collect(res)
 
         if not res.success:
-            self.logger.error("Commit hash could not be determined successfully.")
+            self.logger.error("The repository could not be updated.")
             return ret.submit(False)
-        rev_old = res.value
+        rev_old, rev_new = res.value
 
-        # pull updates
-        repo = GitRepo(self.dest)
-        res = repo.pull(True, True, self.get_ref())
+        res = self._update_submodules()
         ret.collect(res)
 
         if not res.success:
             return ret.submit(False)
 
-        # get new commit ID
+        # record the new commit ID
         res = self.commit()
         ret.collect(res)
 
         if not res.success:
             self.logger.error("Commit hash could not be determined successfully.")
             return ret.submit(False)
-        rev_new = res.value
 
         # get new commit date/time
         res = self.date()
@@ -603,7 +1255,7 @@ class GitSource(Source):
 
         if updated:
             self.logger.info("Repository updated. Old commit: {}; New commit: {}".format(
-                rev_new[0:7], rev_old[0:7]))
+                rev_old[0:7], rev_new[0:7]))
         else:
             self.logger.info("Repository already up-to-date. Current commit: {}".format(
                 rev_new[0:7]))
@@ -617,8 +1269,81 @@ class GitSource(Source):
             assert os.path.isabs(self.dest)
             assert self.context.get_datadir() in self.dest
             shutil.rmtree(self.dest)
+            self._repo = None
             self.logger.info("git repository has been deleted after exporting to tarball.")
 
+    def _export_cached(self, prefix: str, file_path: str) -> KtrResult:
+        # Tarballs are stored in a content-addressed cache, keyed by the file tree of the commit and
+        # the archive settings, and the exported file is a hard link into the cache. Re-exporting
+        # an unchanged tree with the same version string (for example, after "clean") is instant.
+        # The prefix (and with it the package name and version string) is stored in the tarball
+        # itself, so it is part of the key: a new version string always needs a new export.
+        repo = self._get_repo()
+        compression = self.get_compression()
+        submodules = self.get_submodules()
+
+        res = repo.get_tree(self.get_ref())
+
+        if not res.success:
+            return res
+
+        # the tree contains the commits of all submodules, so they don't need to be hashed
+        key_parts = [res.value, prefix, compression]
+
+        if submodules:
+            key_parts.append("submodules")
+
+        key = hashlib.sha256("\0".join(key_parts).encode()).hexdigest()
+        cache_dir = os.path.join(self.context.get_cachedir(), "exports")
+        cache_path = os.path.join(cache_dir, key[0:2], key + get_extension(compression))
+
+        if os.path.exists(cache_path):
+            self.logger.info("Tarball of this tree has already been exported, reusing it.")
+            self.context.metrics.inc("ktr_cache_requests_total", cache="export", result="hit")
+
+            # the modification time of cached tarballs is the time they were last used
+            os.utime(cache_path)
+        else:
+            self.context.metrics.inc("ktr_cache_requests_total", cache="export", result="miss")
+
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            res = repo.export(prefix, cache_path, self.get_ref(), compression, submodules)
+
+            if not res.success:
+                return res
+
+        if os.path.lexists(file_path):
+            os.remove(file_path)
+
+        try:
+            os.link(cache_path, file_path)
+        except OSError:
+            # the cache is on a different file system, or it doesn't support hard links
+            shutil.copy2(cache_path, file_path)
+
+        self._prune_exports(cache_dir)
+
+        return KtrResult(True)
+
+    def _prune_exports(self, cache_dir: str):
+        # the whole cache is only checked for unused tarballs once in a while, not on every export
+        stamp = os.path.join(cache_dir, ".pruned")
+
+        try:
+            if time.time() - os.stat(stamp).st_mtime < EXPORT_CACHE_PRUNE_INTERVAL:
+                return
+        except FileNotFoundError:
+            pass
+
+        # the time stamp is updated first, so concurrent exports don't prune at the same time
+        with open(stamp, "a"):
+            os.utime(stamp)
+
+        removed = prune_exports(cache_dir)
+
+        if removed:
+            self.logger.info("Removed {} unused tarballs from the export cache.".format(removed))
+
     def export(self) -> KtrResult:
         ret = KtrResult()
 
@@ -639,7 +1364,7 @@ class GitSource(Source):
         # construct prefix, file name, and full absolute file path
         name_version = self.package.name + "-" + version
         prefix = name_version + "/"
-        file_name = name_version + ".tar.gz"
+        file_name = name_version + get_extension(self.get_compression())
         file_path = os.path.join(self.sdir, file_name)
 
         # check if file has already been exported to the determined file path
@@ -651,8 +1376,7 @@ class GitSource(Source):
             return ret.submit(True)
 
         # export specified ref of the git repository to the file path
-        repo = GitRepo(self.dest)
-        res = repo.export(prefix, file_path, self.get_ref())
+        res = self._export_cached(prefix, file_path)
         ret.collect(res)
 
         if not res.success:
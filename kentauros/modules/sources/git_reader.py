@@ -0,0 +1,444 @@
+import datetime
+import mmap
+import os
+import re
+import struct
+import zlib
+
+# object types, as stored in the headers of packed objects
+PACK_TYPES = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+PACK_OFS_DELTA = 6
+PACK_REF_DELTA = 7
+
+# refs are resolved in the same order as "git rev-parse" does
+REF_TEMPLATES = ["{}", "refs/{}", "refs/tags/{}", "refs/heads/{}", "refs/remotes/{}",
+                 "refs/remotes/{}/HEAD"]
+
+# limit for chains of symbolic refs, tags pointing to tags and alternates
+MAX_DEPTH = 16
+
+INFLATE_CHUNK = 16384
+
+
+class GitReaderError(Exception):
+    pass
+
+
+def _is_sha(value: str) -> bool:
+    return re.fullmatch("[0-9a-f]{40}", value) is not None
+
+
+def _apply_delta(base: bytes, delta: bytes) -> bytes:
+    def read_size(pos: int) -> (int, int):
+        size = shift = 0
+
+        while True:
+            byte = delta[pos]
+            pos += 1
+
+            size |= (byte & 0x7f) << shift
+            shift += 7
+
+            if not byte & 0x80:
+                return size, pos
+
+    base_size, pos = read_size(0)
+    result_size, pos = read_size(pos)
+
+    if base_size != len(base):
+        raise GitReaderError("Delta doesn't match the size of its base object.")
+
+    result = bytearray()
+
+    while pos < len(delta):
+        opcode = delta[pos]
+        pos += 1
+
+        if opcode & 0x80:
+            # copy a range of the base object; offset and size are stored in the following bytes
+            offset = size = 0
+
+            for i in range(4):
+                if opcode & (1 << i):
+                    offset |= delta[pos] << (8 * i)
+                    pos += 1
+
+            for i in range(3):
+                if opcode & (0x10 << i):
+                    size |= delta[pos] << (8 * i)
+                    pos += 1
+
+            if size == 0:
+                size = 0x10000
+
+            result += base[offset:offset + size]
+
+        elif opcode:
+            # insert the following bytes
+            result += delta[pos:pos + opcode]
+            pos += opcode
+
+        else:
+            raise GitReaderError("Invalid delta instruction.")
+
+    if len(result) != result_size:
+        raise GitReaderError("Delta result doesn't have the expected size.")
+
+    return bytes(result)
+
+
+class _GitPack:
+    def __init__(self, idx_path: str):
+        self.idx_path = idx_path
+        self.pack_path = idx_path[:-len(".idx")] + ".pack"
+
+        with open(self.idx_path, "rb") as file:
+            self.idx = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.pack = None
+
+        # only version 2 index files are written by git since 1.5.2
+        if (self.idx[0:4] != b"\377tOc") or (struct.unpack(">I", self.idx[4:8])[0] != 2):
+            raise GitReaderError(f"Unsupported pack index: {self.idx_path}")
+
+        self.fanout = struct.unpack(">256I", self.idx[8:8 + 1024])
+        self.count = self.fanout[255]
+
+        self.shas_start = 8 + 1024
+        self.offsets_start = self.shas_start + self.count * (20 + 4)
+        self.large_offsets_start = self.offsets_start + self.count * 4
+
+    def find(self, sha: bytes) -> int:
+        # returns the offset of the object in the pack file, or None if it isn't in this pack
+        if sha[0] == 0:
+            low = 0
+        else:
+            low = self.fanout[sha[0] - 1]
+
+        high = self.fanout[sha[0]]
+
+        while low < high:
+            middle = (low + high) // 2
+            start = self.shas_start + middle * 20
+            current = self.idx[start:start + 20]
+
+            if current < sha:
+                low = middle + 1
+            elif current > sha:
+                high = middle
+            else:
+                return self._offset(middle)
+
+        return None
+
+    def _offset(self, index: int) -> int:
+        start = self.offsets_start + index * 4
+        offset = struct.unpack(">I", self.idx[start:start + 4])[0]
+
+        # offsets which don't fit into 31 bits are stored in a separate table
+        if offset & 0x80000000:
+            start = self.large_offsets_start + (offset & 0x7fffffff) * 8
+            offset = struct.unpack(">Q", self.idx[start:start + 8])[0]
+
+        return offset
+
+    def _inflate(self, pos: int) -> bytes:
+        decompressor = zlib.decompressobj()
+        data = bytearray()
+
+        while not decompressor.eof:
+            chunk = self.pack[pos:pos + INFLATE_CHUNK]
+
+            if not chunk:
+                raise GitReaderError(f"Truncated object in pack: {self.pack_path}")
+
+            data += decompressor.decompress(chunk)
+            pos += INFLATE_CHUNK
+
+        return bytes(data)
+
+    def read(self, offset: int, reader: "GitReader") -> (str, bytes):
+        if self.pack is None:
+            with open(self.pack_path, "rb") as file:
+                self.pack = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # object header: type and (unused) size, as a variable-length integer
+        pos = offset
+        byte = self.pack[pos]
+        pos += 1
+
+        object_type = (byte >> 4) & 0x07
+
+        while byte & 0x80:
+            byte = self.pack[pos]
+            pos += 1
+
+        if object_type in PACK_TYPES:
+            return PACK_TYPES[object_type], self._inflate(pos)
+
+        if object_type == PACK_OFS_DELTA:
+            # the base object is stored at a (negative) offset in the same pack
+            byte = self.pack[pos]
+            pos += 1
+            base_offset = byte & 0x7f
+
+            while byte & 0x80:
+                byte = self.pack[pos]
+                pos += 1
+                base_offset = ((base_offset + 1) << 7) | (byte & 0x7f)
+
+            base_type, base = self.read(offset - base_offset, reader)
+
+        elif object_type == PACK_REF_DELTA:
+            base_type, base = reader.read_object(self.pack[pos:pos + 20].hex())
+            pos += 20
+
+        else:
+            raise GitReaderError(f"Invalid object type {object_type} in {self.pack_path}")
+
+        return base_type, _apply_delta(base, self._inflate(pos))
+
+
+# Minimal, read-only access to refs and objects of a git repository, without spawning processes:
+# refs are read from loose ref files and packed-refs, objects from loose object files and pack
+# files (including deltas and alternate object directories). Anything that is not supported raises
+# a GitReaderError (or returns None for refs which can't be resolved), so callers can fall back to
+# a complete git implementation.
+class GitReader:
+    def __init__(self, path: str):
+        git_dir = os.path.join(path, ".git")
+
+        if os.path.isfile(git_dir):
+            # linked worktrees and submodules have a .git file pointing to the real directory
+            with open(git_dir) as file:
+                contents = file.read().strip()
+
+            if not contents.startswith("gitdir: "):
+                raise GitReaderError(f"Invalid .git file: {git_dir}")
+
+            git_dir = os.path.join(path, contents[len("gitdir: "):])
+
+        elif not os.path.isdir(git_dir):
+            # bare repository
+            git_dir = path
+
+        if not os.path.exists(os.path.join(git_dir, "HEAD")):
+            raise GitReaderError(f"Not a git repository: {path}")
+
+        self.git_dir = git_dir
+        self.common_dir = git_dir
+
+        commondir = os.path.join(git_dir, "commondir")
+
+        if os.path.exists(commondir):
+            with open(commondir) as file:
+                self.common_dir = os.path.join(git_dir, file.read().strip())
+
+        self.object_dirs = list()
+        self._add_object_dir(os.path.join(self.common_dir, "objects"), 0)
+
+        self.packs = dict()
+
+    def _add_object_dir(self, object_dir: str, depth: int):
+        object_dir = os.path.realpath(object_dir)
+
+        if (depth > MAX_DEPTH) or (object_dir in self.object_dirs):
+            return
+
+        self.object_dirs.append(object_dir)
+
+        try:
+            with open(os.path.join(object_dir, "info", "alternates")) as file:
+                alternates = [line.strip() for line in file]
+        except FileNotFoundError:
+            return
+
+        for alternate in alternates:
+            if alternate and not alternate.startswith("#"):
+                self._add_object_dir(os.path.join(object_dir, alternate), depth + 1)
+
+    def _scan_packs(self):
+        for object_dir in self.object_dirs:
+            pack_dir = os.path.join(object_dir, "pack")
+
+            try:
+                file_names = os.listdir(pack_dir)
+            except FileNotFoundError:
+                continue
+
+            for file_name in file_names:
+                path = os.path.join(pack_dir, file_name)
+
+                if file_name.endswith(".idx") and (path not in self.packs):
+                    self.packs[path] = _GitPack(path)
+
+    def _read_packed_refs(self) -> dict:
+        # name -> (sha, peeled sha of annotated tags or None)
+        refs = dict()
+        last = None
+
+        try:
+            with open(os.path.join(self.common_dir, "packed-refs")) as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            return refs
+
+        for line in lines:
+            line = line.strip()
+
+            if not line or line.startswith("#"):
+                continue
+
+            if line.startswith("^") and (last is not None):
+                refs[last] = (refs[last][0], line[1:])
+                continue
+
+            sha, _, name = line.partition(" ")
+            refs[name] = (sha, None)
+            last = name
+
+        return refs
+
+    def read_ref(self, name: str, depth: int = 0) -> str:
+        # returns the object the ref points to, following symbolic refs, or None
+        if depth > MAX_DEPTH:
+            return None
+
+        for directory in [self.git_dir, self.common_dir]:
+            path = os.path.join(directory, name)
+
+            if os.path.isfile(path):
+                with open(path) as file:
+                    contents = file.read().strip()
+
+                if contents.startswith("ref: "):
+                    return self.read_ref(contents[len("ref: "):], depth + 1)
+
+                if _is_sha(contents):
+                    return contents
+
+                raise GitReaderError(f"Invalid ref file: {path}")
+
+        packed = self._read_packed_refs().get(name)
+
+        if packed is None:
+            return None
+
+        return packed[0]
+
+    def head(self) -> str:
+        # the name of the checked out branch (if any) and the checked out commit
+        with open(os.path.join(self.git_dir, "HEAD")) as file:
+            contents = file.read().strip()
+
+        if contents.startswith("ref: "):
+            name = contents[len("ref: "):]
+            return f"{name}:{self.read_ref(name)}"
+
+        return contents
+
+    def _read_loose(self, sha: str) -> (str, bytes):
+        for object_dir in self.object_dirs:
+            path = os.path.join(object_dir, sha[0:2], sha[2:])
+
+            try:
+                with open(path, "rb") as file:
+                    data = zlib.decompress(file.read())
+            except FileNotFoundError:
+                continue
+
+            header, _, contents = data.partition(b"\0")
+            object_type = header.split(b" ")[0].decode()
+
+            return object_type, contents
+
+        return None
+
+    def _read_packed(self, sha: str) -> (str, bytes):
+        binary = bytes.fromhex(sha)
+
+        for pack in self.packs.values():
+            offset = pack.find(binary)
+
+            if offset is not None:
+                return pack.read(offset, self)
+
+        return None
+
+    def read_object(self, sha: str) -> (str, bytes):
+        assert _is_sha(sha)
+
+        obj = self._read_loose(sha)
+
+        if obj is not None:
+            return obj
+
+        obj = self._read_packed(sha)
+
+        # objects might be in packs which were added since the last scan
+        if obj is None:
+            self._scan_packs()
+            obj = self._read_packed(sha)
+
+        if obj is None:
+            raise GitReaderError(f"Object not found: {sha}")
+
+        return obj
+
+    def resolve(self, ref: str) -> str:
+        # returns the commit a ref points to (annotated tags are followed), or None if the ref
+        # doesn't exist or uses syntax which isn't supported here (like "HEAD~1" or short hashes)
+        if _is_sha(ref):
+            sha = ref
+        else:
+            sha = None
+
+            for template in REF_TEMPLATES:
+                sha = self.read_ref(template.format(ref))
+
+                if sha is not None:
+                    break
+
+        if sha is None:
+            return None
+
+        for _ in range(MAX_DEPTH):
+            object_type, contents = self.read_object(sha)
+
+            if object_type == "commit":
+                return sha
+
+            if object_type != "tag":
+                raise GitReaderError(f"Ref '{ref}' doesn't point to a commit.")
+
+            # the first line of a tag object is "object <sha>"
+            sha = contents.split(b"\n", 1)[0].split(b" ")[1].decode()
+
+        raise GitReaderError(f"Too many nested tags for ref '{ref}'.")
+
+    def commit_tree(self, sha: str) -> str:
+        object_type, contents = self.read_object(sha)
+
+        # the first line of a commit object is "tree <sha>"
+        if (object_type != "commit") or not contents.startswith(b"tree "):
+            raise GitReaderError(f"Object {sha} is not a commit.")
+
+        return contents[len(b"tree "):len(b"tree ") + 40].decode()
+
+    def commit_datetime(self, sha: str) -> datetime.datetime:
+        object_type, contents = self.read_object(sha)
+
+        if object_type != "commit":
+            raise GitReaderError(f"Object {sha} is not a commit.")
+
+        for line in contents.split(b"\n"):
+            # the commit headers end with an empty line, before the message
+            if not line:
+                break
+
+            if line.startswith(b"committer "):
+                # "committer Name <email> <unix timestamp> <utc offset>"
+                timestamp = int(line.rsplit(b" ", 2)[1])
+                return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+
+        raise GitReaderError(f"Commit {sha} has no committer.")
@@ -0,0 +1,92 @@
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+
+from .git_reader import GitReader, GitReaderError, _apply_delta
+from .git_test import commit, git
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is not installed")
+class GitReaderTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tempdir.name, "repo")
+        os.makedirs(self.path)
+
+        git(self.path, "init", "-b", "master")
+
+        # similar commits, so they are stored as deltas when the repository is packed
+        self.commits = list()
+        for i in range(20):
+            contents = "\n".join(f"line {j} of version {i // 5}" for j in range(200))
+            self.commits.append(commit(self.path, "README", contents + f"\n{i}\n"))
+
+        git(self.path, "tag", "-a", "-m", "release", "1.0", self.commits[5])
+        git(self.path, "tag", "lightweight", self.commits[6])
+        git(self.path, "branch", "feature", self.commits[7])
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def _expected_datetime(self, sha: str) -> datetime.datetime:
+        timestamp = int(git(self.path, "log", "-1", "--format=%ct", sha))
+        return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+
+    def _check(self, path: str):
+        reader = GitReader(path)
+
+        for ref, sha in [("HEAD", self.commits[-1]), ("master", self.commits[-1]),
+                         ("1.0", self.commits[5]), ("refs/tags/lightweight", self.commits[6]),
+                         ("feature", self.commits[7]), (self.commits[3], self.commits[3])]:
+            self.assertEqual(reader.resolve(ref), sha)
+
+        for sha in self.commits:
+            self.assertEqual(reader.commit_datetime(sha), self._expected_datetime(sha))
+            self.assertEqual(reader.commit_tree(sha), git(self.path, "rev-parse", sha + "^{tree}"))
+
+        self.assertIsNone(reader.resolve("missing"))
+        self.assertIsNone(reader.resolve("master~1"))
+        self.assertRaises(GitReaderError, reader.read_object, "0" * 40)
+
+        return reader
+
+    def test_loose(self):
+        reader = self._check(self.path)
+        self.assertEqual(reader.head(), "refs/heads/master:" + self.commits[-1])
+
+    def test_packed(self):
+        git(self.path, "repack", "-a", "-d", "-f", "--depth=50", "--window=50")
+        git(self.path, "pack-refs", "--all")
+
+        self.assertFalse(os.path.exists(os.path.join(self.path, ".git", "refs", "tags", "1.0")))
+
+        # make sure some commits are actually stored as deltas
+        pack_dir = os.path.join(self.path, ".git", "objects", "pack")
+        idx = [name for name in os.listdir(pack_dir) if name.endswith(".idx")][0]
+        objects = git(self.path, "verify-pack", "-v", os.path.join(pack_dir, idx))
+
+        self.assertTrue(any(len(line.split()) == 7 for line in objects.splitlines()))
+
+        self._check(self.path)
+
+    def test_alternates(self):
+        clone = os.path.join(self.tempdir.name, "clone")
+        git(self.tempdir.name, "clone", "--shared", self.path, clone)
+
+        reader = GitReader(clone)
+
+        self.assertEqual(len(reader.object_dirs), 2)
+        self.assertEqual(reader.resolve("origin/feature"), self.commits[7])
+        self.assertEqual(reader.commit_datetime(self.commits[0]),
+                         self._expected_datetime(self.commits[0]))
+
+    def test_apply_delta(self):
+        base = b"0123456789"
+
+        # sizes (10, 7), copy 4 bytes at offset 2, insert "abc"
+        delta = bytes([10, 7, 0x80 | 0x01 | 0x10, 2, 4, 3]) + b"abc"
+        self.assertEqual(_apply_delta(base, delta), b"2345abc")
+
+        self.assertRaises(GitReaderError, _apply_delta, base, bytes([9, 0]))
@@ -0,0 +1,331 @@
+import os
+import shutil
+import subprocess
+import tarfile
+import tempfile
+import unittest
+import unittest.mock
+
+from kentauros.shell_env import execute_all
+from .compression import COMPRESSION_EXTENSIONS
+from .git import CLONE_MODES, GitMirror, GitRepo, prune_exports
+
+LS_REMOTE = """
+1111111111111111111111111111111111111111\tHEAD
+1111111111111111111111111111111111111111\trefs/heads/master
+2222222222222222222222222222222222222222\trefs/heads/feature/master
+3333333333333333333333333333333333333333\trefs/tags/1.0
+4444444444444444444444444444444444444444\trefs/tags/1.0^{}
+"""
+
+
+def git(path: str, *args) -> str:
+    cmd = ["git", "-c", "user.name=ktr", "-c", "user.email=ktr@example.org", *args]
+    return subprocess.run(cmd, cwd=path, check=True, stdout=subprocess.PIPE,
+                          stderr=subprocess.DEVNULL, universal_newlines=True).stdout.strip()
+
+
+def commit(path: str, file_name: str, contents: str) -> str:
+    with open(os.path.join(path, file_name), "w") as file:
+        file.write(contents)
+
+    git(path, "add", file_name)
+    git(path, "commit", "-m", "update " + file_name)
+    return git(path, "rev-parse", "HEAD")
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is not installed")
+class GitTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+
+        # local "upstream" repository
+        self.upstream = os.path.join(self.tempdir.name, "upstream")
+        os.makedirs(self.upstream)
+
+        git(self.upstream, "init", "-b", "master")
+        self.first = commit(self.upstream, "README", "first")
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+
+class GitMirrorTest(GitTestCase):
+    def test_mirror(self):
+        cachedir = os.path.join(self.tempdir.name, "cache")
+
+        mirror = GitMirror(cachedir, self.upstream)
+        self.assertEqual(mirror.path, GitMirror(cachedir, self.upstream).path)
+
+        self.assertTrue(mirror.update().success)
+        self.assertEqual(git(mirror.path, "rev-parse", "master"), self.first)
+
+        # clones borrow the objects of the mirror
+        dest = os.path.join(self.tempdir.name, "clone")
+        res = GitRepo.clone(dest, self.upstream, "master", reference=mirror.path)
+
+        self.assertTrue(res.success)
+        self.assertEqual(res.value.get_commit().value, self.first)
+
+        with open(os.path.join(dest, ".git", "objects", "info", "alternates")) as file:
+            self.assertEqual(file.read().strip(), os.path.join(mirror.path, "objects"))
+
+        # mirrors are updated incrementally
+        second = commit(self.upstream, "README", "second")
+
+        self.assertTrue(mirror.update().success)
+        self.assertEqual(git(mirror.path, "rev-parse", "master"), second)
+
+
+class GitRemoteTest(GitTestCase):
+    def test_resolve_remote(self):
+        self.assertEqual(GitRepo.resolve_remote(LS_REMOTE, "master"), "1" * 40)
+        self.assertEqual(GitRepo.resolve_remote(LS_REMOTE, "HEAD"), "1" * 40)
+        self.assertEqual(GitRepo.resolve_remote(LS_REMOTE, "1.0"), "4" * 40)
+        self.assertEqual(GitRepo.resolve_remote(LS_REMOTE, "refs/heads/feature/master"), "2" * 40)
+        self.assertIsNone(GitRepo.resolve_remote(LS_REMOTE, "feature"))
+
+    def test_ls_remote(self):
+        git(self.upstream, "tag", "-a", "-m", "release", "1.0")
+        second = commit(self.upstream, "README", "second")
+
+        results = execute_all(GitRepo.ls_remote_async(self.upstream, "master"),
+                              GitRepo.ls_remote_async(self.upstream, "1.0"),
+                              GitRepo.ls_remote_async(self.upstream, "missing"),
+                              GitRepo.ls_remote_async(self.upstream, self.first))
+
+        self.assertEqual([res.success for res in results], [True, True, False, True])
+        self.assertEqual([results[0].value, results[1].value, results[3].value],
+                         [second, self.first, self.first])
+
+
+class GitCloneTest(GitTestCase):
+    def setUp(self):
+        super().setUp()
+
+        git(self.upstream, "tag", "-a", "-m", "release", "1.0")
+        self.second = commit(self.upstream, "README", "second")
+        git(self.upstream, "checkout", "-b", "feature")
+        self.third = commit(self.upstream, "README", "third")
+        git(self.upstream, "checkout", "master")
+
+        # shallow fetches are only supported by the "real" git transports
+        self.orig = "file://" + self.upstream
+
+    def _clone(self, ref: str, mode: str) -> GitRepo:
+        dest = os.path.join(self.tempdir.name, "clone-" + mode + "-" + ref)
+        res = GitRepo.clone(dest, self.orig, ref, mode)
+
+        self.assertTrue(res.success)
+        return res.value
+
+    def _commits(self, repo: GitRepo) -> int:
+        return int(git(repo.path, "rev-list", "--count", "HEAD"))
+
+    def test_clone_full(self):
+        repo = self._clone("feature", "full")
+
+        self.assertEqual(repo.get_commit("feature").value, self.third)
+        self.assertEqual(self._commits(repo), 3)
+
+    def test_clone_shallow(self):
+        for ref, expected in [("master", self.second), ("feature", self.third),
+                              ("1.0", self.first), (self.second, self.second)]:
+            repo = self._clone(ref, "shallow")
+
+            self.assertEqual(repo.get_commit(ref).value, expected)
+            self.assertEqual(git(repo.path, "rev-parse", "HEAD"), expected)
+            self.assertEqual(self._commits(repo), 1)
+
+        # updates only fetch the new commit of the ref
+        repo = GitRepo(os.path.join(self.tempdir.name, "clone-shallow-master"), "master")
+        fourth = commit(self.upstream, "README", "fourth")
+
+        self.assertTrue(repo.fetch("master", shallow=True).success)
+        self.assertEqual(repo.get_commit("master").value, fourth)
+
+    def test_update(self):
+        repo = self._clone("master", "full")
+
+        res = repo.update("master")
+        self.assertTrue(res.success)
+        self.assertEqual(res.value, (self.second, self.second))
+
+        # the local branch is moved to the fetched commit, even if the history was rewritten
+        git(self.upstream, "reset", "--hard", self.first)
+        fourth = commit(self.upstream, "NEWS", "fourth")
+
+        res = repo.update("master")
+        self.assertTrue(res.success)
+        self.assertEqual(res.value, (self.second, fourth))
+        self.assertEqual(repo.get_commit("master").value, fourth)
+
+        # errors are not mistaken for "no updates"
+        self.assertFalse(repo.update("missing").success)
+
+    def test_update_tag(self):
+        for mode in ["full", "shallow"]:
+            repo = self._clone("1.0", mode)
+            self.assertEqual(repo.get_commit("1.0").value, self.first)
+
+            # the local tag is replaced if the tag was moved upstream
+            git(self.upstream, "tag", "-f", "-a", "-m", "moved", "1.0", self.second)
+
+            res = repo.update("1.0")
+            self.assertTrue(res.success)
+            self.assertEqual(res.value, (self.first, self.second))
+            self.assertEqual(repo.get_commit("1.0").value, self.second)
+            self.assertEqual(repo.get_tree("1.0").value, git(self.upstream, "rev-parse",
+                                                               self.second + "^{tree}"))
+
+            # no branch with the name of the tag is created
+            self.assertEqual(git(repo.path, "branch", "--list", "1.0"), "")
+
+            git(self.upstream, "tag", "-f", "-a", "-m", "release", "1.0", self.first)
+
+    def test_metadata_cache(self):
+        repo = self._clone("master", "full")
+
+        commit_hash, commit_date = repo.get_metadata().value
+        self.assertEqual(commit_hash, self.second)
+
+        # metadata is read without GitPython
+        self.assertIsNone(repo._repo)
+
+        # cached metadata is used without opening the repository again
+        other = GitRepo(repo.path, "master")
+        self.assertEqual(other.get_metadata().value, (commit_hash, commit_date))
+        self.assertIsNone(other._repo)
+
+        # annotated tags are resolved to commits
+        self.assertEqual(other.get_commit("1.0").value, self.first)
+
+        # the cache is invalidated when the checkout changes
+        fourth = commit(self.upstream, "README", "fourth")
+        self.assertTrue(repo.update("master").success)
+        self.assertEqual(other.get_commit().value, fourth)
+
+    def test_clone_blobless(self):
+        repo = self._clone("master", "blobless")
+
+        self.assertEqual(repo.get_commit().value, self.second)
+        self.assertEqual(git(repo.path, "config", "remote.origin.partialclonefilter"), "blob:none")
+
+
+class GitExportTest(GitTestCase):
+    def test_export(self):
+        repo = GitRepo(self.upstream, "master")
+
+        for compression, extension in COMPRESSION_EXTENSIONS.items():
+            path = os.path.join(self.tempdir.name, "upstream-1.0" + extension)
+
+            res = repo.export("upstream-1.0/", path, compression=compression)
+            self.assertTrue(res.success)
+            self.assertFalse([name for name in os.listdir(self.tempdir.name)
+                              if name.startswith(".ktr-export-")])
+
+            if compression == "zstd":
+                # zstd is not supported by the tarfile module
+                subprocess.run(["zstd", "-t", "-q", path], check=True)
+                continue
+
+            with tarfile.open(path) as tar:
+                self.assertIn("upstream-1.0/README", tar.getnames())
+
+    def test_get_tree(self):
+        repo = GitRepo(self.upstream, "master")
+        tree = git(self.upstream, "rev-parse", "master^{tree}")
+
+        self.assertEqual(repo.get_tree().value, tree)
+
+        # commits with identical contents have the same tree
+        git(self.upstream, "commit", "--allow-empty", "-m", "empty")
+        self.assertEqual(GitRepo(self.upstream, "master").get_tree().value, tree)
+
+    def test_export_failure(self):
+        path = os.path.join(self.tempdir.name, "missing.tar.xz")
+
+        self.assertFalse(GitRepo(self.upstream).export("missing/", path, "missing", "xz").success)
+        self.assertEqual(os.listdir(self.tempdir.name), ["upstream"])
+
+    def test_prune_exports(self):
+        cachedir = os.path.join(self.tempdir.name, "exports", "ab")
+        os.makedirs(cachedir)
+
+        for name in ["old", "linked", "new"]:
+            with open(os.path.join(cachedir, name), "w") as file:
+                file.write(name)
+
+        os.link(os.path.join(cachedir, "linked"), os.path.join(self.tempdir.name, "linked"))
+
+        for name in ["old", "linked"]:
+            os.utime(os.path.join(cachedir, name), (0, 0))
+
+        # only old tarballs which are not exported to any sources directory are removed
+        self.assertEqual(prune_exports(os.path.dirname(cachedir)), 1)
+        self.assertEqual(sorted(os.listdir(cachedir)), ["linked", "new"])
+
+
+class GitSubmoduleTest(GitTestCase):
+    def setUp(self):
+        super().setUp()
+
+        # submodules with local paths are only allowed with this setting since git 2.38.1
+        environ = {"GIT_CONFIG_COUNT": "1", "GIT_CONFIG_KEY_0": "protocol.file.allow",
+                   "GIT_CONFIG_VALUE_0": "always"}
+
+        patcher = unittest.mock.patch.dict(os.environ, environ)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.nested = os.path.join(self.tempdir.name, "nested")
+        self.library = os.path.join(self.tempdir.name, "library")
+
+        for path in [self.nested, self.library]:
+            os.makedirs(path)
+            git(path, "init", "-b", "master")
+            commit(path, "README", os.path.basename(path))
+
+        git(self.library, "submodule", "add", "file://" + self.nested, "nested")
+        git(self.library, "commit", "-m", "add nested")
+
+        git(self.upstream, "submodule", "add", "file://" + self.library, "lib")
+        git(self.upstream, "commit", "-m", "add library")
+
+    def _clone(self, mode: str) -> GitRepo:
+        dest = os.path.join(self.tempdir.name, "clone-" + mode)
+
+        res = GitRepo.clone(dest, "file://" + self.upstream, "master", mode)
+        self.assertTrue(res.success)
+
+        repo = res.value
+        self.assertTrue(repo.update_submodules(mode, jobs=2).success)
+
+        return repo
+
+    def test_export(self):
+        for mode in CLONE_MODES:
+            repo = self._clone(mode)
+            path = os.path.join(self.tempdir.name, mode + ".tar.gz")
+
+            res = repo.export("upstream-1.0/", path, compression="gzip", submodules=True)
+            self.assertTrue(res.success)
+
+            with tarfile.open(path) as tar:
+                names = tar.getnames()
+                readme = tar.extractfile("upstream-1.0/lib/nested/README").read()
+                commit_id = tar.pax_headers["comment"]
+
+            self.assertIn("upstream-1.0/README", names)
+            self.assertIn("upstream-1.0/lib/README", names)
+            self.assertEqual(readme, b"nested")
+            self.assertEqual(len(names), len(set(names)))
+            self.assertEqual(commit_id, repo.get_commit().value)
+
+    def test_missing_checkout(self):
+        res = GitRepo.clone(os.path.join(self.tempdir.name, "clone"), self.upstream, "master")
+        path = os.path.join(self.tempdir.name, "upstream.tar")
+
+        self.assertFalse(res.value.export("upstream/", path, compression="none",
+                                          submodules=True).success)
+        self.assertFalse(os.path.exists(path))
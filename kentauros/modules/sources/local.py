@@ -43,6 +43,9 @@ class LocalSource(Source):
     def get_orig(self) -> str:
         return self.package.replace_vars(self.package.conf.get("local", "orig"))
 
+    def fingerprint(self) -> str:
+        return self._fingerprint_files(self.get_orig(), self.dest)
+
     def status(self) -> KtrResult:
         return KtrResult(True)
 
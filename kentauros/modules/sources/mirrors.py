@@ -0,0 +1,206 @@
+import contextlib
+import fcntl
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import urllib.parse
+
+from kentauros.result import KtrResult
+from .downloader import download
+
+# bump this when the format of the ranking changes, older rankings are discarded
+RANKING_VERSION = 1
+
+# measurements lose half of their weight after this many seconds, so the ranking follows hosts
+# which become faster or slower over time, and failures are forgiven eventually
+HALF_LIFE = 7 * 86400
+
+# weight of a new measurement compared to the (decayed) previous ones
+ALPHA = 0.3
+
+# hosts are compared by the estimated time it takes to download a file of this size
+REFERENCE_SIZE = 16 * 2 ** 20
+
+# throughput can't be measured reliably with small files, because latency dominates
+MIN_THROUGHPUT_SIZE = 256 * 2 ** 10
+
+# every (decayed) failure makes a host look this much slower
+FAILURE_PENALTY = 4.0
+
+
+def get_host(url: str) -> str:
+    parts = urllib.parse.urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _average(old: float, new: float, weight: float) -> float:
+    if old is None:
+        return new
+    else:
+        return old + weight * (new - old)
+
+
+# Ranking of download hosts by their measured latency and throughput, and by recent failures.
+# Measurements are averaged with an exponential decay, and stored in a JSON file, which is shared
+# by all packages (and kentauros processes): entries of the file are merged with new measurements
+# when it is saved, with a lock on the file, so concurrent updates are not lost.
+class MirrorRanking:
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+
+        self.logger = logging.getLogger("ktr/mirrors")
+
+        self.hosts = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path) as file:
+                ranking = json.load(file)
+        except (OSError, ValueError):
+            return dict()
+
+        if not isinstance(ranking, dict) or ranking.get("version") != RANKING_VERSION:
+            return dict()
+
+        return ranking.get("hosts", dict())
+
+    @contextlib.contextmanager
+    def _locked(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        with open(self.path + ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    def _save(self, host: str):
+        # only the entry of the host is written, on top of the current contents of the file
+        directory = os.path.dirname(os.path.abspath(self.path))
+
+        try:
+            with self._locked():
+                hosts = self._load()
+                hosts[host] = self.hosts[host]
+
+                contents = json.dumps(dict(version=RANKING_VERSION, hosts=hosts),
+                                      indent=4, sort_keys=True)
+
+                fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".ktr-mirrors-")
+
+                try:
+                    with os.fdopen(fd, "w") as file:
+                        file.write(contents + "\n")
+                    os.replace(temp_path, self.path)
+                except OSError:
+                    os.remove(temp_path)
+                    raise
+
+                self.hosts = hosts
+
+        except OSError as error:
+            self.logger.debug(f"Mirror ranking could not be saved: {error}")
+
+    def _update(self, url: str, latency: float = None, throughput: float = None,
+                failed: bool = False):
+        host = get_host(url)
+        now = time.time()
+
+        with self.lock:
+            entry = dict(self.hosts.get(host, dict()))
+
+            # the weight of older measurements decays with their age
+            decay = 0.5 ** ((now - entry.get("updated", now)) / HALF_LIFE)
+            weight = max(ALPHA, 1 - decay)
+
+            if latency is not None:
+                entry["latency"] = _average(entry.get("latency"), latency, weight)
+
+            if throughput is not None:
+                entry["throughput"] = _average(entry.get("throughput"), throughput, weight)
+
+            entry["failures"] = entry.get("failures", 0.0) * decay + (1.0 if failed else 0.0)
+            entry["updated"] = now
+
+            self.hosts[host] = entry
+            self._save(host)
+
+    def record(self, url: str, latency: float, size: int = 0, duration: float = 0.0):
+        if (size >= MIN_THROUGHPUT_SIZE) and (duration > 0):
+            throughput = size / duration
+        else:
+            throughput = None
+
+        self._update(url, latency, throughput)
+
+    def record_failure(self, url: str):
+        self._update(url, failed=True)
+
+    def _estimate(self, url: str) -> tuple:
+        # estimated time for downloading a file from the host (0 if it has never been measured),
+        # and the number of its recent failures; None for hosts which have never been used
+        with self.lock:
+            entry = self.hosts.get(get_host(url))
+
+        if entry is None:
+            return None
+
+        seconds = entry.get("latency") or 0.0
+
+        if entry.get("throughput"):
+            seconds += REFERENCE_SIZE / entry["throughput"]
+
+        decay = 0.5 ** ((time.time() - entry.get("updated", 0)) / HALF_LIFE)
+        failures = entry.get("failures", 0.0) * decay
+
+        return seconds, failures
+
+    def score(self, url: str, slowest: float = 1.0) -> float:
+        # estimated time for downloading a file from the host; hosts which have never been used
+        # have a score of 0, so they are measured the first time they are available
+        estimate = self._estimate(url)
+
+        if estimate is None:
+            return 0.0
+
+        seconds, failures = estimate
+
+        # hosts which have only ever failed are assumed to be as slow as the slowest working one,
+        # so their failures weigh as much as the failures of that host
+        if not seconds and failures:
+            seconds = slowest
+
+        return seconds * (1 + FAILURE_PENALTY * failures) + failures
+
+    def order(self, urls: list) -> list:
+        estimates = [self._estimate(url) for url in urls]
+        slowest = max([estimate[0] for estimate in estimates if estimate is not None] + [1.0])
+
+        # the sort is stable, so hosts with the same score are tried in the configured order
+        return sorted(urls, key=lambda url: self.score(url, slowest))
+
+
+# Downloads the file from the fastest URL of the ranking first, and fails over to the next one if
+# the download fails, resuming the partial download from where the previous host stopped (all URLs
+# have to point to the same file). The result value is the one of downloader.download, and the URL
+# the file was downloaded from.
+def download_mirrored(urls: list, path: str, ranking: MirrorRanking, sha256: str = None,
+                      if_range: str = None) -> KtrResult:
+    logger = logging.getLogger("ktr/mirrors")
+
+    for url in ranking.order(urls):
+        res = download(url, path, sha256, if_range)
+
+        if res.success:
+            ranking.record(url, res.value["latency"], res.value["transferred"],
+                           res.value["duration"])
+            res.value["url"] = url
+            return res
+
+        ranking.record_failure(url)
+        logger.warning(f"Download from {get_host(url)} failed, trying the next mirror.")
+
+    logger.error("The file could not be downloaded from any mirror.")
+    return KtrResult(False)
@@ -0,0 +1,109 @@
+import hashlib
+import os
+import tempfile
+import unittest
+
+from .downloader_test import CONTENTS, serve
+from .mirrors import HALF_LIFE, MirrorRanking, download_mirrored
+
+
+class MirrorRankingTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tempdir.name, "cache", "mirrors.json")
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_order(self):
+        slow = "https://slow.example.org/file.tar.gz"
+        fast = "https://fast.example.org/pub/file.tar.gz"
+        new = "https://new.example.org/file.tar.gz"
+
+        ranking = MirrorRanking(self.path)
+        ranking.record(slow, 0.5, 2 ** 20, 2.0)
+        ranking.record(fast, 0.1, 2 ** 20, 1.0)
+
+        # hosts without measurements are tried first, so they get measured
+        self.assertEqual(ranking.order([slow, fast, new]), [new, fast, slow])
+
+        # the ranking is shared with other instances
+        self.assertEqual(MirrorRanking(self.path).order([slow, fast]), [fast, slow])
+
+        # failures push hosts down in the ranking
+        ranking.record_failure(fast)
+        self.assertEqual(ranking.order([slow, fast]), [slow, fast])
+
+        # ... until they have decayed
+        ranking.hosts["https://fast.example.org"]["updated"] -= 10 * HALF_LIFE
+        self.assertEqual(ranking.order([slow, fast]), [fast, slow])
+
+    def test_dead_host(self):
+        slow = "https://slow.example.org/file.tar.gz"
+        dead = "https://dead.example.org/file.tar.gz"
+
+        ranking = MirrorRanking(self.path)
+        ranking.record(slow, 0.1, 2 ** 20, 1.0)
+
+        # hosts which have never worked are tried after slow hosts which do, even if the slow
+        # host failed once too
+        for _ in range(4):
+            ranking.record_failure(dead)
+            self.assertEqual(ranking.order([dead, slow]), [slow, dead])
+
+        ranking.record_failure(slow)
+        self.assertEqual(ranking.order([dead, slow]), [slow, dead])
+
+    def test_merge(self):
+        first = MirrorRanking(self.path)
+        second = MirrorRanking(self.path)
+
+        first.record("https://a.example.org/file", 0.1)
+        second.record("https://b.example.org/file", 0.2)
+
+        self.assertEqual(sorted(MirrorRanking(self.path).hosts.keys()),
+                         ["https://a.example.org", "https://b.example.org"])
+
+
+class MirrorDownloadTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+
+        self.ranking = MirrorRanking(os.path.join(self.tempdir.name, "mirrors.json"))
+        self.path = os.path.join(self.tempdir.name, "file.tar.gz")
+
+        self.broken = serve(self)
+        self.broken.limit = 100000
+
+        self.working = serve(self)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_failover(self):
+        broken = self.broken.url + "/file.tar.gz"
+        working = self.working.url + "/file.tar.gz"
+
+        self.ranking.record(broken, 0.001)
+        self.ranking.record(working, 1.0)
+
+        res = download_mirrored([working, broken], self.path, self.ranking,
+                                hashlib.sha256(CONTENTS).hexdigest())
+
+        self.assertTrue(res.success)
+        self.assertEqual(res.value["url"], working)
+
+        # the download is resumed where the broken host stopped
+        self.assertEqual(self.working.requests, [("/file.tar.gz", "bytes=100000-")])
+        self.assertEqual(res.value["transferred"], len(CONTENTS) - 100000)
+
+        with open(self.path, "rb") as file:
+            self.assertEqual(file.read(), CONTENTS)
+
+        self.assertEqual(self.ranking.order([broken, working]), [working, broken])
+
+    def test_all_failed(self):
+        urls = [self.broken.url + "/missing.tar.gz", self.working.url + "/missing.tar.gz"]
+
+        self.assertFalse(download_mirrored(urls, self.path, self.ranking).success)
+        self.assertFalse(os.path.exists(self.path))
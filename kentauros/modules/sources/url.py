@@ -1,13 +1,23 @@
+import configparser as cp
 import logging
 import os
+import re
 
-from kentauros.conntest import is_connected
 from kentauros.context import KtrContext
 from kentauros.package import KtrPackage
 from kentauros.result import KtrResult
-from kentauros.shell_env import ShellEnv
 from kentauros.validator import KtrValidator
 from .abstract import Source
+from .downloader import check, download
+from .mirrors import MirrorRanking, download_mirrored, get_host
+
+# response headers of the last download, which are used to check for changes with a conditional
+# request, and the state keys they are stored as
+URL_HEADERS = {
+    "etag": "url_etag",
+    "last-modified": "url_last_modified",
+    "content-length": "url_content_length",
+}
 
 URL_STATUS_TEMPLATE = """
 URL source module:
@@ -27,11 +37,14 @@ class UrlSource(Source):
         state = self.context.state.read(self.package.conf_name)
 
         if state is None:
-            self.last_version = None
-        elif "url_last_version" in state:
-            self.last_version = state["url_last_version"]
-        else:
-            self.last_version = None
+            state = dict()
+
+        self.last_version = state.get("url_last_version")
+        self.headers = {header: state[key] for header, key in URL_HEADERS.items() if key in state}
+
+        # the URL the file was last downloaded from (if there are mirrors)
+        self.mirror = state.get("url_mirror")
+        self._ranking = None
 
         self._logger = logging.getLogger("ktr/sources/url")
 
@@ -47,7 +60,7 @@ class UrlSource(Source):
 
     def verify(self) -> KtrResult:
         expected_keys = ["keep", "orig"]
-        expected_binaries = ["wget"]
+        expected_binaries = []
 
         validator = KtrValidator(self.package.conf.conf, "url", expected_keys, expected_binaries)
 
@@ -59,12 +72,46 @@ class UrlSource(Source):
     def get_orig(self) -> str:
         return self.package.replace_vars(self.package.conf.get("url", "orig"))
 
-    def status(self) -> KtrResult:
-        if self.last_version is None:
-            return KtrResult(True)
+    def get_sha256(self) -> str:
+        try:
+            sha256 = self.package.conf.get("url", "sha256")
+        except (cp.NoSectionError, cp.NoOptionError, KeyError):
+            sha256 = ""
+
+        if not sha256:
+            return None
         else:
-            state = dict(url_last_version=self.last_version)
-            return KtrResult(True, state=state)
+            return sha256
+
+    def get_mirrors(self) -> list:
+        try:
+            mirrors = self.package.conf.get("url", "mirrors")
+        except (cp.NoSectionError, cp.NoOptionError, KeyError):
+            mirrors = ""
+
+        return [self.package.replace_vars(mirror)
+                for mirror in re.split(r"[,\s]+", mirrors) if mirror]
+
+    def _get_ranking(self) -> MirrorRanking:
+        # the ranking of hosts is shared by all packages
+        if self._ranking is None:
+            self._ranking = MirrorRanking(os.path.join(self.context.get_cachedir(),
+                                                       "mirrors.json"))
+
+        return self._ranking
+
+    def fingerprint(self) -> str:
+        # the local file doesn't tell whether the upstream file changed, so url sources are always
+        # checked again (like git sources), which is cheap with the conditional request in update
+        return ""
+
+    def status(self) -> KtrResult:
+        state = {URL_HEADERS[header]: value for header, value in self.headers.items()}
+
+        if self.last_version is not None:
+            state["url_last_version"] = self.last_version
+
+        return KtrResult(True, state=state)
 
     def status_string(self) -> KtrResult:
         ret = KtrResult()
@@ -98,32 +145,136 @@ class UrlSource(Source):
             self.logger.info("Sources already downloaded.")
             return ret.submit(True)
 
-        # check for connectivity to server
-        if not is_connected(self.get_orig()):
-            self.logger.error("No connection to remote host detected. Cancelling source download.")
-            return ret.submit(False)
+        res = self._download()
+        ret.collect(res)
 
-        # construct wget commands
-        cmd = ["wget", self.get_orig(), "-O", self.dest]
+        return ret.submit(res.success)
 
-        with ShellEnv() as env:
-            res = env.execute(*cmd)
+    def _download(self, if_range: str = None) -> KtrResult:
+        ret = KtrResult()
+
+        mirrors = self.get_mirrors()
+
+        # download the file (or resume an interrupted download), from the fastest mirror first
+        if mirrors:
+            res = download_mirrored([self.get_orig()] + mirrors, self.dest, self._get_ranking(),
+                                    self.get_sha256(), if_range)
+        else:
+            res = download(self.get_orig(), self.dest, self.get_sha256(), if_range)
         ret.collect(res)
 
         if not res.success:
-            self.logger.error("Sources could not be downloaded successfully:")
-            self.logger.error(res.value)
+            self.logger.error("Sources could not be downloaded successfully.")
             return ret.submit(False)
 
+        self.context.metrics.inc("ktr_downloaded_bytes_total", res.value["transferred"],
+                                 source="url")
+
+        # the headers of partial responses only describe the last part of the file
+        headers = res.value["headers"]
+        headers["content-length"] = str(res.value["size"])
+
+        self.headers = {header: headers[header] for header in URL_HEADERS if header in headers}
         self.last_version = self.package.get_version()
+
+        ret.collect(self.status())
         ret.state["source_files"] = [os.path.basename(self.get_orig())]
 
+        # the mirror is not part of the status, switching mirrors doesn't change the sources
+        if mirrors:
+            self.mirror = res.value["url"]
+            ret.state["url_mirror"] = self.mirror
+
         return ret.submit(True)
 
+    def _check(self) -> KtrResult:
+        if "content-length" in self.headers:
+            content_length = int(self.headers["content-length"])
+        else:
+            content_length = None
+
+        etag = self.headers.get("etag")
+        last_modified = self.headers.get("last-modified")
+
+        mirrors = self.get_mirrors()
+
+        if not mirrors:
+            return check(self.get_orig(), etag, last_modified, content_length)
+
+        urls = [self.get_orig()] + mirrors
+        ranking = self._get_ranking()
+
+        # files which were downloaded before mirrors were configured came from the original URL
+        if self.mirror is not None:
+            source = self.mirror
+        else:
+            source = self.get_orig()
+
+        # the host the file was downloaded from is asked first, because ETags and modification
+        # times are only valid for one host; other mirrors can only be compared by size
+        if source in urls:
+            urls.remove(source)
+            urls = [source] + ranking.order(urls)
+        else:
+            urls = ranking.order(urls)
+
+        for url in urls:
+            if url == source:
+                res = check(url, etag, last_modified, content_length)
+            else:
+                res = check(url)
+
+            if not res.success:
+                ranking.record_failure(url)
+                continue
+
+            ranking.record(url, res.value["latency"])
+
+            if url != source:
+                res.value["changed"] = self._is_resized(url, res.value["headers"], content_length)
+
+            return res
+
+        return KtrResult(False)
+
+    def _is_resized(self, url: str, headers: dict, content_length: int) -> bool:
+        if (content_length is not None) and ("content-length" in headers):
+            return int(headers["content-length"]) != content_length
+
+        # without a size to compare, downloading the file again every time would be wasteful
+        self.logger.warning("Changes could not be detected with {}, ".format(get_host(url)) +
+                            "assuming that the sources did not change.")
+        return False
+
     def update(self) -> KtrResult:
         ret = KtrResult()
-        self.logger.info("URL sources don't need to be updated.")
-        return ret.submit(True)
+
+        if not os.path.exists(self.dest):
+            self.logger.info("Sources have not been downloaded yet.")
+            return self.get()
+
+        # ask the server whether the file changed, without downloading it
+        res = self._check()
+        ret.collect(res)
+
+        if not res.success:
+            self.logger.error("Sources could not be checked for changes.")
+            return ret.submit(False)
+
+        # return True if update found, False if not
+        if not res.value["changed"]:
+            self.logger.info("Sources have not changed since the last download.")
+            ret.collect(self.status())
+            return ret.submit(False)
+
+        self.logger.info("Sources have changed, downloading them again.")
+
+        # a partial download is only resumed if it belongs to the changed file
+        headers = res.value["headers"]
+        res = self._download(headers.get("etag", headers.get("last-modified")))
+        ret.collect(res)
+
+        return ret.submit(res.success)
 
     def export(self) -> KtrResult:
         ret = KtrResult()
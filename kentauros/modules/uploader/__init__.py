@@ -1,15 +1,20 @@
+import importlib
+
 from kentauros.context import KtrContext
 from kentauros.package import KtrPackage
 from .abstract import Uploader
-from .copr import CoprUploader
 
 
 def get_uploader(utype: str, package: KtrPackage, context: KtrContext) -> Uploader:
     uploader_dict = dict()
 
-    uploader_dict["copr"] = CoprUploader
+    uploader_dict["copr"] = (".copr", "CoprUploader")
+
+    # implementations (and their dependencies) are only imported when a package uses them
+    module_name, class_name = uploader_dict[utype]
+    module = importlib.import_module(module_name, __name__)
 
-    return uploader_dict[utype](package, context)
+    return getattr(module, class_name)(package, context)
 
 
 __all__ = ["get_uploader"]
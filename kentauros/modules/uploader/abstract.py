@@ -1,16 +1,34 @@
 import abc
 
 from kentauros.context import KtrContext
+from kentauros.fingerprint import KtrFingerprint
 from kentauros.modules.module import KtrModule
 from kentauros.package import KtrPackage
 from kentauros.result import KtrResult
 
 
 class Uploader(KtrModule, metaclass=abc.ABCMeta):
+    MODULE_TYPE = "uploader"
+
     def __init__(self, package: KtrPackage, context: KtrContext):
         super().__init__(package, context)
         self.actions["upload"] = self.execute
 
+    def fingerprint(self) -> str:
+        state = self.context.state.read(self.package.conf_name)
+
+        # uploaders can only be skipped if the source package is known not to have changed
+        if not state.get("constructor_fingerprint"):
+            return ""
+
+        section = self.package.conf.get("modules", "uploader")
+
+        fingerprint = KtrFingerprint()
+        fingerprint.add_value("constructor_fingerprint", state.get("constructor_fingerprint"))
+        fingerprint.add_section(self.package.conf.conf, section)
+
+        return fingerprint.hexdigest()
+
     @abc.abstractmethod
     def status(self) -> KtrResult:
         pass
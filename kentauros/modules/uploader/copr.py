@@ -1,6 +1,7 @@
 import glob
 import logging
 import os
+import time
 
 from kentauros.conntest import is_connected
 from kentauros.context import KtrContext
@@ -125,10 +126,17 @@ class CoprUploader(Uploader):
 
         self.logger.debug(" ".join(cmd))
 
+        start = time.perf_counter()
+
         with ShellEnv() as env:
-            res = env.execute(*cmd)
+            res = env.execute(*cmd, stream=True, logfile=self.get_command_log("copr"))
         ret.collect(res)
 
+        self.context.metrics.observe("ktr_upload_duration_seconds", time.perf_counter() - start,
+                                     uploader="copr")
+        self.context.metrics.inc("ktr_uploads_total", uploader="copr",
+                                 result=("success" if res.success else "failure"))
+
         if not res.success:
             self.logger.error("copr-cli command did not complete successfully.")
             return ret.submit(False)
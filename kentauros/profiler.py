@@ -0,0 +1,96 @@
+import cProfile
+import logging
+import os
+import threading
+import time
+
+from .shell_env import get_child_time
+
+PROFILE_TABLE_HEADER = "{:<32} {:<12} {:<10} {:>6} {:>10} {:>10} {:>10}".format(
+    "package", "module", "action", "calls", "wall [s]", "python [s]", "child [s]")
+
+PROFILE_TABLE_ROW = "{:<32} {:<12} {:<10} {:>6} {:>10.3f} {:>10.3f} {:>10.3f}"
+
+
+# The profiler measures the wall-clock time of every stage (one module action of one package), and
+# how much of it was spent waiting for child processes (git, rpmbuild, mock, ...) instead of running
+# python code. If a directory is given, a cProfile .pstats file is saved for every stage, too.
+class KtrProfiler:
+    def __init__(self, directory: str = None):
+        self.directory = directory
+
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+
+        # (package, module, action) -> [calls, wall time, child process time]
+        self.entries = dict()
+        self.lock = threading.Lock()
+
+        self.logger = logging.getLogger("ktr/profiler")
+
+    def _run_profiled(self, name: str, function):
+        profile = cProfile.Profile()
+
+        try:
+            profile.enable()
+        except ValueError:
+            # another profiler is already active (this can happen for concurrent stages)
+            return function()
+
+        try:
+            return function()
+        finally:
+            profile.disable()
+            profile.dump_stats(os.path.join(self.directory, name + ".pstats"))
+
+    def run(self, package: str, module: str, action: str, function):
+        key = (package, module, action)
+        name = "-".join(key)
+
+        child_start = get_child_time()
+        start = time.perf_counter()
+
+        try:
+            if self.directory is None:
+                return function()
+            else:
+                return self._run_profiled(name, function)
+        finally:
+            wall = time.perf_counter() - start
+            child = get_child_time() - child_start
+
+            with self.lock:
+                entry = self.entries.setdefault(key, [0, 0.0, 0.0])
+                entry[0] += 1
+                entry[1] += wall
+                entry[2] += child
+
+    def table(self) -> str:
+        lines = [PROFILE_TABLE_HEADER]
+        totals = [0, 0.0, 0.0]
+
+        with self.lock:
+            entries = list(self.entries.items())
+
+        for (package, module, action), (calls, wall, child) in entries:
+            lines.append(PROFILE_TABLE_ROW.format(package, module, action, calls,
+                                                  wall, wall - child, child))
+
+            totals[0] += calls
+            totals[1] += wall
+            totals[2] += child
+
+        calls, wall, child = totals
+        lines.append(PROFILE_TABLE_ROW.format("total", "", "", calls, wall, wall - child, child))
+
+        return "\n".join(lines)
+
+    def report(self):
+        table = self.table()
+
+        for line in table.split("\n"):
+            self.logger.info(line)
+
+        if self.directory is not None:
+            with open(os.path.join(self.directory, "profile.txt"), "w") as file:
+                file.write(table + "\n")
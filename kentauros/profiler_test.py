@@ -0,0 +1,61 @@
+import os
+import pstats
+import tempfile
+import time
+import unittest
+
+from .profiler import KtrProfiler
+from .shell_env import ShellEnv
+
+
+def _sleep_python() -> str:
+    time.sleep(0.1)
+    return "python"
+
+
+def _sleep_child() -> str:
+    with ShellEnv() as env:
+        env.execute("sleep", "0.1")
+    return "child"
+
+
+class KtrProfilerTest(unittest.TestCase):
+    def test_run(self):
+        profiler = KtrProfiler()
+
+        self.assertEqual(profiler.run("package", "source", "get", _sleep_python), "python")
+        self.assertEqual(profiler.run("package", "source", "get", _sleep_child), "child")
+
+        calls, wall, child = profiler.entries[("package", "source", "get")]
+
+        self.assertEqual(calls, 2)
+        self.assertGreaterEqual(wall, 0.2)
+        self.assertGreaterEqual(child, 0.1)
+        self.assertLess(child, wall - 0.1)
+
+    def test_exception(self):
+        def fail():
+            raise RuntimeError()
+
+        profiler = KtrProfiler()
+
+        self.assertRaises(RuntimeError, profiler.run, "package", "builder", "build", fail)
+        self.assertEqual(profiler.entries[("package", "builder", "build")][0], 1)
+
+    def test_directory(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            directory = os.path.join(tempdir, "profile")
+            profiler = KtrProfiler(directory)
+
+            profiler.run("package", "constructor", "chain", _sleep_python)
+            profiler.report()
+
+            stats = pstats.Stats(os.path.join(directory, "package-constructor-chain.pstats"))
+            self.assertGreater(stats.total_calls, 0)
+
+            with open(os.path.join(directory, "profile.txt")) as file:
+                lines = file.read().splitlines()
+
+            self.assertEqual(len(lines), 3)
+            self.assertTrue(lines[1].startswith("package"))
+            self.assertTrue(lines[2].startswith("total"))
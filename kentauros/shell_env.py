@@ -1,9 +1,38 @@
+import collections
+import contextlib
 import logging
 import os
 import subprocess as sp
+import tempfile
+import threading
+import time
 
 from .result import KtrResult
 
+# number of output lines which are kept in memory for streamed commands (for error reporting)
+TAIL_LINES = 100
+
+# maximum length of output lines for streamed commands run with execute_async
+LINE_LIMIT = 2 ** 20
+
+
+# time spent waiting for child processes, per thread (used by the profiler)
+_child_time = threading.local()
+
+
+def get_child_time() -> float:
+    return getattr(_child_time, "seconds", 0.0)
+
+
+@contextlib.contextmanager
+def _track_child_time():
+    start = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        _child_time.seconds = get_child_time() + (time.perf_counter() - start)
+
 
 class ShellCmdException(Exception):
     pass
@@ -22,37 +51,253 @@ class ShellEnv:
     def wd(self):
         return self._wd
 
+    # the working directory is handed to every subprocess instead of changing the (process-wide)
+    # current directory, so commands can safely be run from multiple threads at the same time
     def __enter__(self):
-        if self.wd:
-            os.chdir(self.wd)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.wd:
-            os.chdir(self.cwd)
+        pass
 
-    def execute(self, *command, ignore_retcode: bool = False) -> KtrResult:
-        if os.getcwd() != self.wd:
-            raise ShellCmdException("Fatal error: Current directory is not the working directory.")
+    def _get_wd(self, wd: str = None) -> str:
+        if wd is None:
+            wd = self.wd
+        else:
+            wd = os.path.abspath(wd)
 
+        if not os.path.isdir(wd):
+            raise ShellCmdException(f"Fatal error: Working directory '{wd}' does not exist.")
+
+        return wd
+
+    @staticmethod
+    def _get_result(args: list, output: bytes, returncode: int, ignore_retcode: bool) -> KtrResult:
+        ret = KtrResult()
+        ret.value = output.decode().rstrip("\n")
+
+        if (returncode == 0) or ignore_retcode:
+            return ret.submit(True)
+        else:
+            logger = logging.getLogger(f"ktr/{args[0]} command")
+            logger.error(f"This subprocess didn't return 0 ({returncode}):")
+            logger.error(" ".join(args))
+            return ret.submit(False)
+
+    @staticmethod
+    def _get_stream_result(args: list, tail: collections.deque, returncode: int,
+                           ignore_retcode: bool) -> KtrResult:
         ret = KtrResult()
+        ret.value = "\n".join(tail)
+
+        if (returncode == 0) or ignore_retcode:
+            return ret.submit(True)
+        else:
+            logger = logging.getLogger(f"ktr/{args[0]} command")
+            logger.error(f"This subprocess didn't return 0 ({returncode}):")
+            logger.error(" ".join(args))
+
+            if tail:
+                logger.error(f"Last {len(tail)} lines of output:")
+                for line in tail:
+                    logger.error(line)
+
+            return ret.submit(False)
+
+    @staticmethod
+    def _open_logfile(logfile: str = None):
+        if logfile is None:
+            return contextlib.nullcontext()
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(logfile)), exist_ok=True)
+            return open(logfile, "wb")
+
+    @staticmethod
+    def _forward(line: bytes, logger: logging.Logger, log, tail: collections.deque):
+        if log is not None:
+            log.write(line)
+
+        line = line.decode(errors="replace").rstrip("\n")
+
+        logger.info(line)
+        tail.append(line)
+
+    def _execute_stream(self, args: list, wd: str, ignore_retcode: bool,
+                        logfile: str = None) -> KtrResult:
+        logger = logging.getLogger(f"ktr/{args[0]} command")
+        tail = collections.deque(maxlen=TAIL_LINES)
+
+        with self._open_logfile(logfile) as log:
+            try:
+                process = sp.Popen(args, cwd=wd, stdout=sp.PIPE, stderr=sp.STDOUT)
+            except FileNotFoundError as error:
+                return KtrResult(False, value=f"Fatal: {error.filename} command not found.")
+
+            with process:
+                for line in process.stdout:
+                    self._forward(line, logger, log, tail)
+
+        return self._get_stream_result(args, tail, process.returncode, ignore_retcode)
+
+    @staticmethod
+    async def _readline(stream) -> bytes:
+        import asyncio
+
+        try:
+            return await stream.readuntil(b"\n")
+        except asyncio.IncompleteReadError as error:
+            # the last line of output doesn't end with a newline
+            return error.partial
+        except asyncio.LimitOverrunError:
+            # lines which are longer than the limit are forwarded in chunks
+            return await stream.read(LINE_LIMIT)
+
+    async def _execute_stream_async(self, args: list, wd: str, ignore_retcode: bool,
+                                    logfile: str = None) -> KtrResult:
+        import asyncio
+
+        logger = logging.getLogger(f"ktr/{args[0]} command")
+        tail = collections.deque(maxlen=TAIL_LINES)
+
+        with self._open_logfile(logfile) as log:
+            try:
+                process = await asyncio.create_subprocess_exec(*args, cwd=wd, stdout=sp.PIPE,
+                                                               stderr=sp.STDOUT, limit=LINE_LIMIT)
+            except FileNotFoundError as error:
+                return KtrResult(False, value=f"Fatal: {error.filename} command not found.")
+
+            try:
+                while True:
+                    line = await self._readline(process.stdout)
+
+                    if not line:
+                        break
+
+                    self._forward(line, logger, log, tail)
+
+                await process.wait()
+            finally:
+                # the process is not left running if reading its output failed
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
 
+        return self._get_stream_result(args, tail, process.returncode, ignore_retcode)
+
+    # If stream is True, the output of the command is not collected in memory, but forwarded line
+    # by line to the logger (and the log file, if one is specified) while the command is running.
+    # Only the last lines of output are kept, and they are returned as the result value.
+    def execute(self, *command, ignore_retcode: bool = False, wd: str = None,
+                stream: bool = False, logfile: str = None) -> KtrResult:
+        wd = self._get_wd(wd)
         args = list(command)
 
         logger = logging.getLogger(f"ktr/{args[0]} command")
+        logger.debug(" ".join(args))
+
+        if stream:
+            with _track_child_time():
+                return self._execute_stream(args, wd, ignore_retcode, logfile)
+
+        try:
+            with _track_child_time():
+                res: sp.CompletedProcess = sp.run(args, cwd=wd, stdout=sp.PIPE, stderr=sp.STDOUT)
+        except FileNotFoundError as error:
+            return KtrResult(False, value=f"Fatal: {error.filename} command not found.")
+
+        return self._get_result(args, res.stdout, res.returncode, ignore_retcode)
+
+    # Runs the commands as a pipeline (like "first | second | ..."), and writes the output of the
+    # last command to a file. Data is passed between the processes directly, without temporary
+    # files, and the pipeline only succeeds if all commands succeed.
+    def execute_pipeline(self, *commands, output: str, wd: str = None) -> KtrResult:
+        wd = self._get_wd(wd)
+        commands = [list(args) for args in commands]
+
+        logger = logging.getLogger(f"ktr/{commands[0][0]} command")
+        logger.debug(" | ".join(" ".join(args) for args in commands))
+
+        processes = list()
+        errors = list()
+
+        with contextlib.ExitStack() as stack, _track_child_time():
+            file = stack.enter_context(open(output, "wb"))
+            stdin = None
+
+            for index, args in enumerate(commands):
+                if index == len(commands) - 1:
+                    stdout = file
+                else:
+                    stdout = sp.PIPE
+
+                # error output is collected in files, so full pipes can't block the processes
+                stderr = stack.enter_context(tempfile.TemporaryFile())
+                errors.append(stderr)
+
+                try:
+                    process = sp.Popen(args, cwd=wd, stdin=stdin, stdout=stdout, stderr=stderr)
+                except FileNotFoundError as error:
+                    for process in processes:
+                        process.kill()
+                        process.wait()
 
+                    return KtrResult(False, value=f"Fatal: {error.filename} command not found.")
+
+                # only the next process reads from the pipe, so earlier processes are stopped
+                # if a later one fails
+                if stdin is not None:
+                    stdin.close()
+
+                stdin = process.stdout
+                processes.append(process)
+
+            for process in processes:
+                process.wait()
+
+            ret = KtrResult(True)
+
+            for args, process, stderr in zip(commands, processes, errors):
+                stderr.seek(0)
+                res = self._get_result(args, stderr.read(), process.returncode, False)
+                ret.collect(res)
+
+                if not res.success and res.value:
+                    logging.getLogger(f"ktr/{args[0]} command").error(res.value)
+
+        return ret
+
+    # coroutine variant of execute(): many commands can be awaited at the same time, for example
+    # with asyncio.gather(), without needing a thread for every running subprocess
+    async def execute_async(self, *command, ignore_retcode: bool = False, wd: str = None,
+                            stream: bool = False, logfile: str = None) -> KtrResult:
+        wd = self._get_wd(wd)
+        args = list(command)
+
+        logger = logging.getLogger(f"ktr/{args[0]} command")
         logger.debug(" ".join(args))
 
+        if stream:
+            return await self._execute_stream_async(args, wd, ignore_retcode, logfile)
+
+        import asyncio
+
         try:
-            res: sp.CompletedProcess = sp.run(args, stdout=sp.PIPE, stderr=sp.STDOUT)
+            process = await asyncio.create_subprocess_exec(*args, cwd=wd, stdout=sp.PIPE,
+                                                           stderr=sp.STDOUT)
         except FileNotFoundError as error:
             return KtrResult(False, value=f"Fatal: {error.filename} command not found.")
 
-        ret.value = res.stdout.decode().rstrip("\n")
+        output, _ = await process.communicate()
 
-        if (res.returncode == 0) or ignore_retcode:
-            return ret.submit(True)
-        else:
-            logger.error(f"This subprocess didn't return 0 ({res.returncode}):")
-            logger.error(" ".join(args))
-            return ret.submit(False)
+        return self._get_result(args, output, process.returncode, ignore_retcode)
+
+
+def execute_all(*coroutines) -> list:
+    # runs the given coroutines (for example, from ShellEnv.execute_async) concurrently and returns
+    # their results in the same order; every calling thread gets its own event loop
+    import asyncio
+
+    async def gather():
+        return await asyncio.gather(*coroutines)
+
+    with _track_child_time():
+        return asyncio.run(gather())
@@ -0,0 +1,118 @@
+import os
+import tempfile
+import time
+import unittest
+import unittest.mock
+
+from .shell_env import TAIL_LINES, ShellCmdException, ShellEnv, execute_all
+
+
+class ShellEnvTest(unittest.TestCase):
+    def test_execute_wd(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            cwd = os.getcwd()
+
+            with ShellEnv(tempdir) as env:
+                res = env.execute("pwd")
+
+            self.assertTrue(res.success)
+            self.assertEqual(os.path.realpath(res.value), os.path.realpath(tempdir))
+            self.assertEqual(os.getcwd(), cwd)
+
+    def test_execute_wd_missing(self):
+        with ShellEnv("/nonexistent/directory") as env:
+            self.assertRaises(ShellCmdException, env.execute, "true")
+
+    def test_execute_retcode(self):
+        with ShellEnv() as env:
+            self.assertFalse(env.execute("false").success)
+            self.assertTrue(env.execute("false", ignore_retcode=True).success)
+
+    def test_execute_not_found(self):
+        with ShellEnv() as env:
+            res = env.execute("ktr-nonexistent-command")
+
+        self.assertFalse(res.success)
+
+    def test_execute_async(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            with ShellEnv() as env:
+                results = execute_all(env.execute_async("echo", "test"),
+                                      env.execute_async("pwd", wd=tempdir),
+                                      env.execute_async("false"),
+                                      env.execute_async("ktr-nonexistent-command"))
+
+        self.assertEqual([res.success for res in results], [True, True, False, False])
+        self.assertEqual(results[0].value, "test")
+        self.assertEqual(os.path.realpath(results[1].value), os.path.realpath(tempdir))
+
+    def test_execute_async_concurrent(self):
+        with ShellEnv() as env:
+            start = time.monotonic()
+            results = execute_all(*(env.execute_async("sleep", "0.3") for _ in range(4)))
+            duration = time.monotonic() - start
+
+        self.assertTrue(all(res.success for res in results))
+        self.assertLess(duration, 1.0)
+
+    def test_execute_stream(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            logfile = os.path.join(tempdir, "logs", "seq.log")
+
+            with ShellEnv() as env:
+                res = env.execute("seq", "1", str(TAIL_LINES + 50), stream=True, logfile=logfile)
+
+            self.assertTrue(res.success)
+
+            # only the last lines are kept in memory, but all of them are written to the log file
+            lines = res.value.split("\n")
+            self.assertEqual(len(lines), TAIL_LINES)
+            self.assertEqual(lines[-1], str(TAIL_LINES + 50))
+
+            with open(logfile) as file:
+                self.assertEqual(len(file.readlines()), TAIL_LINES + 50)
+
+    def test_execute_stream_async(self):
+        with ShellEnv() as env:
+            results = execute_all(env.execute_async("echo", "test", stream=True),
+                                  env.execute_async("false", stream=True),
+                                  env.execute_async("ktr-nonexistent-command", stream=True))
+
+        self.assertEqual([res.success for res in results], [True, False, False])
+        self.assertEqual(results[0].value, "test")
+
+    def test_execute_stream_async_long_lines(self):
+        output = "x" * 100 + "\nend"
+
+        with tempfile.TemporaryDirectory() as tempdir, \
+                unittest.mock.patch("kentauros.shell_env.LINE_LIMIT", 16):
+            logfile = os.path.join(tempdir, "printf.log")
+
+            with ShellEnv() as env:
+                res = execute_all(env.execute_async("printf", output, stream=True,
+                                                    logfile=logfile))[0]
+
+            self.assertTrue(res.success)
+
+            # lines which are longer than the limit are split, but nothing is lost
+            with open(logfile) as file:
+                self.assertEqual(file.read(), output)
+
+    def test_execute_pipeline(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            output = os.path.join(tempdir, "output")
+
+            with ShellEnv() as env:
+                res = env.execute_pipeline(["seq", "1", "10000"], ["grep", "5"], ["wc", "-l"],
+                                           output=output)
+
+            self.assertTrue(res.success)
+
+            with open(output) as file:
+                self.assertEqual(file.read().strip(), "3439")
+
+            # a failing command makes the pipeline fail, even if it's not the last one
+            with ShellEnv() as env:
+                self.assertFalse(env.execute_pipeline(["false"], ["cat"], output=output).success)
+                self.assertFalse(env.execute_pipeline(["ktr-nonexistent-command"], ["cat"],
+                                                      output=output).success)
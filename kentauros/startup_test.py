@@ -0,0 +1,72 @@
+import os
+import subprocess as sp
+import sys
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# dependencies which are too expensive to be imported when starting the ktr command
+HEAVY_MODULES = ["argcomplete", "asyncio", "git"]
+
+URL_PACKAGE_CODE = """
+import sys
+
+from data.test_packages import TEST_PACKAGE_URL_SOURCE as package
+from kentauros.modules import get_module
+from kentauros.tasks import KtrTask
+
+module = get_module("source", "url", package, package.context)
+KtrTask(package, module, "status", package.context)
+
+print("\\n".join(sys.modules.keys()))
+"""
+
+
+# GitPython is only needed as a fallback for refs the built-in reader can't resolve
+GIT_PACKAGE_CODE = URL_PACKAGE_CODE.replace("URL", "GIT").replace('"url"', '"git"')
+
+
+def get_imports(code: str) -> dict:
+    # returns the cumulative import time (in microseconds) of all modules imported by the code
+    res = sp.run([sys.executable, "-X", "importtime", "-c", code], cwd=REPO_DIR,
+                 stdout=sp.PIPE, stderr=sp.PIPE, check=True)
+
+    imports = dict()
+
+    for line in res.stderr.decode().splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line.split("|")
+        imports[name.strip()] = int(cumulative)
+
+    return imports
+
+
+def get_modules(code: str) -> list:
+    # modules imported with importlib.import_module don't show up in the -X importtime output
+    res = sp.run([sys.executable, "-c", code], cwd=REPO_DIR, stdout=sp.PIPE, check=True)
+    return res.stdout.decode().splitlines()
+
+
+class StartupTest(unittest.TestCase):
+    def test_cli_imports(self):
+        imports = get_imports("import kentauros.cli")
+
+        self.assertIn("kentauros.cli.runner", imports)
+
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, imports)
+
+    def test_url_package_imports(self):
+        modules = get_modules(URL_PACKAGE_CODE)
+
+        self.assertIn("kentauros.modules.sources.url", modules)
+        self.assertNotIn("kentauros.modules.sources.git", modules)
+        self.assertNotIn("git", modules)
+
+    def test_git_package_imports(self):
+        modules = get_modules(GIT_PACKAGE_CODE)
+
+        self.assertIn("kentauros.modules.sources.git", modules)
+        self.assertNotIn("git", modules)
@@ -1,5 +1,6 @@
 from .json_state import KtrJSONState
 from .meta_state import KtrState
+from .sqlite_state import KtrSQLiteState
 from .test_state import KtrTestState
 
-__all__ = ["KtrState", "KtrJSONState", "KtrTestState"]
+__all__ = ["KtrState", "KtrJSONState", "KtrSQLiteState", "KtrTestState"]
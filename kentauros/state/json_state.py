@@ -1,4 +1,11 @@
-from tinydb import TinyDB, Query
+import atexit
+import contextlib
+import copy
+import fcntl
+import json
+import os
+import tempfile
+import threading
 
 from .meta_state import KtrState
 
@@ -20,21 +27,71 @@ def _dict_is_subset(sup: dict, sub: dict) -> bool:
     return True
 
 
+# The state file is loaded once, on first access, and kept in memory as a dictionary indexed by
+# package name. Changes are only written back to disk when flush() is called (after every package,
+# and when the process exits), in the same layout as the TinyDB database that was used before.
+# When flushing, the changed packages are merged into the current contents of the file, with a lock
+# on the file, so concurrent kentauros processes don't overwrite each other's packages.
 class KtrJSONState(KtrState):
     def __init__(self, path: str):
         self.path = path
 
+        # the lock is re-entrant because write() calls read()
+        self.lock = threading.RLock()
+
+        self.packages: dict = None
+        self.ids = dict()
+
+        # packages which were changed or removed since the last flush
+        self.changed = set()
+        self.dirty = False
+
+        atexit.register(self.flush)
+
+    def _read_file(self) -> tuple:
+        packages = dict()
+        ids = dict()
+
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return packages, ids
+
+        with open(self.path, "r") as file:
+            data = json.load(file)
+
+        table = data.get("_default", dict())
+
+        for doc_id in sorted(table.keys(), key=int):
+            document = table[doc_id]
+            packages[document["name"]] = document
+            ids[document["name"]] = int(doc_id)
+
+        return packages, ids
+
+    def _load(self):
+        if self.packages is not None:
+            return
+
+        self.packages, self.ids = self._read_file()
+
+    @contextlib.contextmanager
+    def _locked(self):
+        with open(self.path + ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    def read_all(self) -> dict:
+        with self.lock:
+            self._load()
+            return copy.deepcopy(self.packages)
+
     def read(self, conf_name: str) -> dict:
         assert isinstance(conf_name, str)
 
-        with TinyDB(self.path, indent=4, sort_keys=True) as db:
-            package = Query()
-            results = db.search(package.name == conf_name)
+        with self.lock:
+            self._load()
 
-        if len(results) == 0:
-            return dict()
-        else:
-            return results[0]
+            # return a copy, so callers can't modify the state without calling write()
+            return copy.deepcopy(self.packages.get(conf_name, dict()))
 
     def write(self, conf_name: str, entries: dict):
         assert isinstance(conf_name, str)
@@ -43,22 +100,78 @@ class KtrJSONState(KtrState):
         if entries == dict():
             return
 
-        old_state = self.read(conf_name)
-        if _dict_is_subset(old_state, entries):
-            return
-
-        with TinyDB(self.path, indent=4, sort_keys=True) as db:
-            package = Query()
+        with self.lock:
+            old_state = self.read(conf_name)
+            if _dict_is_subset(old_state, entries):
+                return
 
             if old_state == dict():
                 entries["name"] = conf_name
-                db.insert(entries)
-            else:
-                db.update(entries, package.name == conf_name)
+                self.ids[conf_name] = max(self.ids.values(), default=0) + 1
+
+            old_state.update(copy.deepcopy(entries))
+            self.packages[conf_name] = old_state
+
+            self.changed.add(conf_name)
+            self.dirty = True
 
     def remove(self, conf_name):
         assert isinstance(conf_name, str)
 
-        with TinyDB(self.path, indent=4, sort_keys=True) as db:
-            package = Query()
-            db.remove(package.name == conf_name)
+        with self.lock:
+            self._load()
+
+            if conf_name in self.packages:
+                self.packages.pop(conf_name)
+                self.ids.pop(conf_name)
+                self.changed.add(conf_name)
+                self.dirty = True
+
+    def flush(self):
+        with self.lock:
+            if not self.dirty:
+                return
+
+            directory = os.path.dirname(os.path.abspath(self.path))
+
+            with self._locked():
+                # packages which were not changed by this process might have been changed by others
+                packages, ids = self._read_file()
+
+                for name in self.changed:
+                    if name in self.packages:
+                        packages[name] = self.packages[name]
+
+                        # new packages keep their ID, unless another process has taken it
+                        if name not in ids:
+                            if self.ids[name] in ids.values():
+                                ids[name] = max(ids.values()) + 1
+                            else:
+                                ids[name] = self.ids[name]
+                    elif name in packages:
+                        packages.pop(name)
+                        ids.pop(name)
+
+                table = dict((str(ids[name]), document) for name, document in packages.items())
+
+                # write to a temporary file first, so the state file is never left half-written
+                fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".state-")
+
+                if os.path.exists(self.path):
+                    mode = os.stat(self.path).st_mode & 0o777
+                else:
+                    mode = 0o644
+
+                try:
+                    with os.fdopen(fd, "w") as file:
+                        json.dump({"_default": table}, file, indent=4, sort_keys=True)
+                    os.chmod(temp_path, mode)
+                    os.replace(temp_path, self.path)
+                except (OSError, TypeError, ValueError):
+                    os.remove(temp_path)
+                    raise
+
+            self.packages = packages
+            self.ids = ids
+            self.changed = set()
+            self.dirty = False
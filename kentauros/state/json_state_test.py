@@ -0,0 +1,132 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from .json_state import KtrJSONState
+
+TINYDB_STATE = {
+    "_default": {
+        "1": {"name": "first", "version": "1.0"},
+        "3": {"name": "second", "git_last_commit": "5b88c95"}
+    }
+}
+
+
+class KtrJSONStateTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tempdir.name, "state.json")
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def _read_file(self) -> dict:
+        with open(self.path) as file:
+            return json.load(file)
+
+    def test_read_tinydb(self):
+        with open(self.path, "w") as file:
+            json.dump(TINYDB_STATE, file)
+
+        state = KtrJSONState(self.path)
+
+        self.assertEqual(state.read("second"), {"name": "second", "git_last_commit": "5b88c95"})
+        self.assertEqual(state.read("missing"), dict())
+
+        # modifying the returned dictionary doesn't modify the state
+        state.read("first")["version"] = "2.0"
+        self.assertEqual(state.read("first")["version"], "1.0")
+
+    def test_write_behind(self):
+        with open(self.path, "w") as file:
+            json.dump(TINYDB_STATE, file)
+
+        state = KtrJSONState(self.path)
+        state.write("first", {"version": "2.0"})
+        state.write("third", {"version": "3.0"})
+        state.remove("second")
+
+        # nothing is written before the state is flushed
+        self.assertEqual(self._read_file(), TINYDB_STATE)
+
+        state.flush()
+
+        self.assertEqual(self._read_file(), {"_default": {
+            "1": {"name": "first", "version": "2.0"},
+            "4": {"name": "third", "version": "3.0"}}})
+        self.assertEqual(sorted(os.listdir(self.tempdir.name)), ["state.json", "state.json.lock"])
+
+    def test_nested(self):
+        state = KtrJSONState(self.path)
+
+        files = ["a.tar.gz", "b.tar.gz"]
+        state.write("package", {"source_files": files})
+
+        # neither the written nor the returned lists are shared with the state
+        files.remove("a.tar.gz")
+        state.read("package")["source_files"].remove("b.tar.gz")
+        self.assertEqual(state.read("package")["source_files"], ["a.tar.gz", "b.tar.gz"])
+
+        # so writing a modified list is recognized as a change
+        status = state.read("package")
+        status["source_files"].remove("a.tar.gz")
+        state.write("package", status)
+        state.flush()
+
+        self.assertEqual(KtrJSONState(self.path).read("package")["source_files"], ["b.tar.gz"])
+
+    def test_concurrent(self):
+        with open(self.path, "w") as file:
+            json.dump(TINYDB_STATE, file)
+
+        first = KtrJSONState(self.path)
+        second = KtrJSONState(self.path)
+
+        first.write("first", {"version": "2.0"})
+        second.write("third", {"version": "3.0"})
+        second.remove("second")
+
+        first.flush()
+        second.flush()
+
+        # changes of both processes are kept
+        self.assertEqual(self._read_file(), {"_default": {
+            "1": {"name": "first", "version": "2.0"},
+            "4": {"name": "third", "version": "3.0"}}})
+        self.assertEqual(second.read("first")["version"], "2.0")
+
+    def test_new_file(self):
+        state = KtrJSONState(self.path)
+
+        state.write("package", dict())
+        state.flush()
+        self.assertFalse(os.path.exists(self.path))
+
+        state.write("package", {"version": "1.0"})
+        state.flush()
+
+        self.assertEqual(KtrJSONState(self.path).read("package"),
+                         {"name": "package", "version": "1.0"})
+
+    def test_threads(self):
+        state = KtrJSONState(self.path)
+
+        def worker(index: int):
+            for key in range(100):
+                state.write(f"package{index}", {f"key{key}": key})
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(4)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        state.flush()
+
+        reloaded = KtrJSONState(self.path)
+
+        for index in range(4):
+            self.assertEqual(len(reloaded.read(f"package{index}")), 101)
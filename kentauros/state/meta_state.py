@@ -13,3 +13,7 @@ class KtrState(metaclass=abc.ABCMeta):
     @abc.abstractmethod
     def remove(self, conf_name):
         pass
+
+    def flush(self):
+        # states which don't write changes immediately write them back here
+        pass
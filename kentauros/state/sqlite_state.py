@@ -0,0 +1,120 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+from .json_state import KtrJSONState
+from .meta_state import KtrState
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (name, key)
+) WITHOUT ROWID
+"""
+
+
+# Every package state entry is stored as a separate row (with a JSON-encoded value), so updates
+# only touch the changed keys. The database uses write-ahead logging, which allows readers and one
+# writer to access it at the same time, from multiple threads or ktr processes. Each thread uses
+# its own connection, and all entries of one write() call are updated in the same transaction.
+class KtrSQLiteState(KtrState):
+    def __init__(self, path: str, json_path: str = None):
+        self.path = path
+        self.json_path = json_path
+
+        self.local = threading.local()
+        self.logger = logging.getLogger("ktr/state/sqlite")
+
+        self._init()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = getattr(self.local, "connection", None)
+
+        if connection is None:
+            # transactions are started explicitly with "BEGIN IMMEDIATE"
+            connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection = connection
+
+        return connection
+
+    def _transaction(self, function):
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+
+        try:
+            ret = function(connection)
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        connection.execute("COMMIT")
+        return ret
+
+    def _init(self):
+        def init(connection: sqlite3.Connection):
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+
+            if version >= SCHEMA_VERSION:
+                return
+
+            connection.execute(SCHEMA)
+
+            if (self.json_path is not None) and os.path.exists(self.json_path):
+                self._migrate(connection)
+
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        self._transaction(init)
+
+    def _migrate(self, connection: sqlite3.Connection):
+        # the old state file is imported once, when the database is created, and kept as a backup
+        packages = KtrJSONState(self.json_path).read_all()
+
+        rows = list()
+
+        for conf_name, entries in packages.items():
+            entries["name"] = conf_name
+
+            for key, value in entries.items():
+                rows.append((conf_name, key, json.dumps(value)))
+
+        connection.executemany("INSERT OR REPLACE INTO state VALUES (?, ?, ?)", rows)
+
+        self.logger.info("Imported the state of {} packages from '{}'.".format(
+            len(packages), self.json_path))
+
+    def read(self, conf_name: str) -> dict:
+        assert isinstance(conf_name, str)
+
+        rows = self._connect().execute(
+            "SELECT key, value FROM state WHERE name = ?", (conf_name,)).fetchall()
+
+        return dict((key, json.loads(value)) for key, value in rows)
+
+    def write(self, conf_name: str, entries: dict):
+        assert isinstance(conf_name, str)
+        assert isinstance(entries, dict)
+
+        if entries == dict():
+            return
+
+        # like in the JSON state, the package name is stored as an entry, too
+        entries = dict(entries, name=conf_name)
+        rows = list((conf_name, key, json.dumps(value)) for key, value in entries.items())
+
+        self._transaction(lambda connection: connection.executemany(
+            "INSERT OR REPLACE INTO state VALUES (?, ?, ?)", rows))
+
+    def remove(self, conf_name):
+        assert isinstance(conf_name, str)
+
+        self._transaction(lambda connection: connection.execute(
+            "DELETE FROM state WHERE name = ?", (conf_name,)))
@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from .sqlite_state import KtrSQLiteState
+
+TINYDB_STATE = {
+    "_default": {
+        "1": {"name": "first", "version": "1.0"},
+        "3": {"name": "second", "git_last_commit": "5b88c95"}
+    }
+}
+
+
+class KtrSQLiteStateTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tempdir.name, "state.sqlite")
+        self.json_path = os.path.join(self.tempdir.name, "state.json")
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_read_write(self):
+        state = KtrSQLiteState(self.path)
+
+        self.assertEqual(state.read("first"), dict())
+
+        state.write("first", {"version": "1.0", "git_last_date": 1500000000.0})
+        state.write("first", {"version": "2.0"})
+
+        self.assertEqual(state.read("first"),
+                         {"name": "first", "version": "2.0", "git_last_date": 1500000000.0})
+
+        state.remove("first")
+        self.assertEqual(state.read("first"), dict())
+
+    def test_migrate(self):
+        with open(self.json_path, "w") as file:
+            json.dump(TINYDB_STATE, file)
+
+        state = KtrSQLiteState(self.path, self.json_path)
+        self.assertEqual(state.read("second"), {"name": "second", "git_last_commit": "5b88c95"})
+
+        # the JSON state file is only imported when the database is created
+        state.write("second", {"git_last_commit": "0123456"})
+        state = KtrSQLiteState(self.path, self.json_path)
+        self.assertEqual(state.read("second")["git_last_commit"], "0123456")
+
+    def test_concurrent_writers(self):
+        first = KtrSQLiteState(self.path)
+        second = KtrSQLiteState(self.path)
+
+        def write(state: KtrSQLiteState, index: int):
+            for i in range(20):
+                state.write(f"package-{index}", {"counter": i})
+
+        threads = [threading.Thread(target=write, args=(state, index))
+                   for index, state in enumerate([first, second] * 4)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for index in range(8):
+            self.assertEqual(first.read(f"package-{index}")["counter"], 19)
+            self.assertEqual(second.read(f"package-{index}")["counter"], 19)
@@ -1,15 +1,24 @@
+from .check import KtrSourceCheckTask
+from .daemon import KtrDaemonTask
+from .dependencies import KtrDependencyGraph, KtrDependencyTaskList
 from .init import KtrInitTask
 from .meta import KtrMetaTask
 from .no import KtrNoTask
 from .package import KtrPackageTask
 from .packageadd import KtrPackageAddTask
+from .pipeline import KtrPipelineTask
 from .task import KtrTask
 from .tasklist import KtrTaskList
 
-__all__ = ["KtrMetaTask",
+__all__ = ["KtrDaemonTask",
+           "KtrDependencyGraph",
+           "KtrDependencyTaskList",
+           "KtrMetaTask",
            "KtrTask",
            "KtrTaskList",
            "KtrInitTask",
            "KtrNoTask",
            "KtrPackageTask",
-           "KtrPackageAddTask"]
+           "KtrPackageAddTask",
+           "KtrPipelineTask",
+           "KtrSourceCheckTask"]
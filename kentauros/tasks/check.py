@@ -0,0 +1,67 @@
+import configparser as cp
+import logging
+
+from kentauros.context import KtrContext
+from kentauros.modules import get_module
+from kentauros.package import KtrRealPackage
+from kentauros.result import KtrResult
+from kentauros.shell_env import execute_all
+from .meta import KtrMetaTask
+
+
+# Checks which packages have upstream changes, without getting or updating their sources. For git
+# sources, the configured ref is resolved with "git ls-remote" for all packages concurrently (at
+# most "jobs" at the same time), and compared with the last commit that was processed. Other
+# sources can't be checked this way, so their packages are always reported as changed.
+class KtrSourceCheckTask(KtrMetaTask):
+    def __init__(self, context: KtrContext, conf_names: list, jobs: int = 1):
+        self.context = context
+        self.conf_names = list(conf_names)
+        self.jobs = jobs
+
+        self.logger = logging.getLogger("ktr/task/check")
+
+    def execute(self) -> KtrResult:
+        import asyncio
+
+        ret = KtrResult(True)
+
+        changed = list()
+        sources = list()
+
+        for conf_name in self.conf_names:
+            package = KtrRealPackage(self.context, conf_name)
+
+            try:
+                source_impl = package.conf.get("modules", "source")
+            except (cp.NoSectionError, cp.NoOptionError, KeyError):
+                source_impl = None
+
+            if source_impl == "git":
+                sources.append(get_module("source", source_impl, package, self.context))
+            else:
+                self.logger.debug(f"Sources of package '{conf_name}' can't be checked.")
+                changed.append(conf_name)
+
+        async def check(source, semaphore: asyncio.Semaphore) -> KtrResult:
+            async with semaphore:
+                return await source.check_async()
+
+        async def check_all() -> list:
+            semaphore = asyncio.Semaphore(self.jobs)
+            return await asyncio.gather(*(check(source, semaphore) for source in sources))
+
+        if sources:
+            results = execute_all(check_all())[0]
+        else:
+            results = list()
+
+        for source, res in zip(sources, results):
+            # packages which couldn't be checked are not reported, but make the task fail
+            ret.collect(res)
+
+            if res.success and res.value:
+                changed.append(source.package.conf_name)
+
+        ret.value = sorted(changed)
+        return ret
@@ -0,0 +1,76 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from kentauros.context import KtrTestContext
+from .check import KtrSourceCheckTask
+
+GIT_CONF = """
+[package]
+name = {name}
+version = 1.0
+release = post
+modules = source
+
+[modules]
+source = git
+
+[git]
+keep = false
+keep_repo = false
+orig = {orig}
+ref = master
+shallow = false
+"""
+
+LOCAL_CONF = """
+[package]
+name = {name}
+version = 1.0
+release = stable
+modules = source
+
+[modules]
+source = local
+
+[local]
+orig = {orig}
+keep = true
+"""
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is not installed")
+class KtrSourceCheckTaskTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.upstream = self.tempdir.name
+
+        for args in [["init", "-b", "master"], ["commit", "--allow-empty", "-m", "first"]]:
+            subprocess.run(["git", "-c", "user.name=ktr", "-c", "user.email=ktr@example.org",
+                            *args], cwd=self.upstream, check=True, stdout=subprocess.DEVNULL)
+
+        self.commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=self.upstream, check=True,
+                                     stdout=subprocess.PIPE, universal_newlines=True).stdout.strip()
+
+        self.context = KtrTestContext(state={"current": {"git_last_commit": self.commit},
+                                             "outdated": {"git_last_commit": "0" * 40},
+                                             "new": dict(), "local": dict()}, jobs=2)
+
+        os.makedirs(self.context.get_confdir())
+
+        for name, template in [("current", GIT_CONF), ("outdated", GIT_CONF), ("new", GIT_CONF),
+                               ("local", LOCAL_CONF)]:
+            with open(os.path.join(self.context.get_confdir(), name + ".conf"), "w") as file:
+                file.write(template.format(name=name, orig=self.upstream))
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_check(self):
+        task = KtrSourceCheckTask(self.context, ["current", "outdated", "new", "local"], jobs=2)
+        res = task.execute()
+
+        self.assertTrue(res.success)
+        self.assertEqual(res.value, ["local", "new", "outdated"])
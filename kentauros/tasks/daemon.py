@@ -0,0 +1,185 @@
+import configparser as cp
+import heapq
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from kentauros.catalog import KtrCatalog
+from kentauros.context import KtrContext
+from kentauros.package import KtrRealPackage
+from kentauros.result import KtrResult
+from .meta import KtrMetaTask
+from .package import KtrPackageTask
+
+# packages which don't set a check_interval are checked once per hour
+DEFAULT_CHECK_INTERVAL = 3600
+
+
+# The daemon keeps the context, package configurations and state in memory and runs the "chain"
+# action of every package periodically. Packages are checked on their own interval, which can be
+# set with the "check_interval" option (in seconds) in the [package] section of their configuration.
+# Due packages are queued for a pool of worker threads, and every package is rescheduled only after
+# its last check has finished, so the same package is never processed twice at the same time.
+class KtrDaemonTask(KtrMetaTask):
+    def __init__(self, context: KtrContext, conf_names: list, jobs: int = 1,
+                 interval: int = DEFAULT_CHECK_INTERVAL, all_packages: bool = False,
+                 where: list = None):
+        self.context = context
+        self.conf_names = list(conf_names)
+        self.jobs = jobs
+        self.interval = interval
+        self.all_packages = all_packages
+        self.where = where
+
+        self.catalog = KtrCatalog(self.context.get_confdir(),
+                                  os.path.join(self.context.get_cachedir(), "catalog.json"))
+
+        self.logger = logging.getLogger("ktr/task/daemon")
+
+        self.packages = dict()
+        self.mtimes = dict()
+
+        self.schedule = list()
+        self.scheduled = set()
+
+        # set from signal handlers or other threads to stop the daemon
+        self.stopped = threading.Event()
+
+        # set whenever a package check has finished and can be rescheduled
+        self.woken = threading.Event()
+
+        self.lock = threading.Lock()
+        self.finished = list()
+
+    def stop(self):
+        self.stopped.set()
+        self.woken.set()
+
+    def _get_conf_names(self) -> list:
+        if not self.all_packages:
+            return self.conf_names
+
+        # new (or newly matching) packages are picked up when the configurations are rescanned
+        return self.catalog.select(None, self.where)
+
+    def _get_package(self, conf_name: str) -> KtrRealPackage:
+        # configuration files are only parsed again if they were modified
+        conf_path = os.path.join(self.context.get_confdir(), conf_name + ".conf")
+
+        try:
+            mtime = os.stat(conf_path).st_mtime_ns
+        except OSError:
+            self.logger.error(f"The configuration of package '{conf_name}' could not be found.")
+            self.packages.pop(conf_name, None)
+            return None
+
+        if self.mtimes.get(conf_name) != mtime:
+            if conf_name in self.mtimes:
+                self.logger.info(f"Reloading modified configuration of package '{conf_name}'.")
+
+            try:
+                self.packages[conf_name] = KtrRealPackage(self.context, conf_name)
+            except Exception as error:
+                self.logger.error(f"The configuration of package '{conf_name}' is invalid:")
+                self.logger.error(str(error))
+                self.packages.pop(conf_name, None)
+                return None
+            finally:
+                self.mtimes[conf_name] = mtime
+
+        return self.packages.get(conf_name)
+
+    def get_interval(self, conf_name: str) -> float:
+        package = self.packages.get(conf_name)
+
+        if package is None:
+            return self.interval
+
+        try:
+            interval = float(package.conf.get("package", "check_interval"))
+        except (cp.NoSectionError, cp.NoOptionError, KeyError):
+            return self.interval
+        except ValueError:
+            interval = 0
+
+        if interval <= 0:
+            self.logger.error(f"Invalid check_interval for package '{conf_name}'.")
+            return self.interval
+
+        return interval
+
+    def _add(self, conf_name: str, due: float):
+        heapq.heappush(self.schedule, (due, conf_name))
+        self.scheduled.add(conf_name)
+
+    def _update_schedule(self, now: float):
+        # reschedule packages whose last check has finished
+        with self.lock:
+            finished, self.finished = self.finished, list()
+
+        for conf_name in finished:
+            self.scheduled.discard(conf_name)
+
+        conf_names = self._get_conf_names()
+
+        for conf_name in finished:
+            if conf_name in conf_names:
+                self._add(conf_name, now + self.get_interval(conf_name))
+
+        # new packages are checked immediately
+        for conf_name in conf_names:
+            if conf_name not in self.scheduled:
+                self._add(conf_name, now)
+
+    def run_package(self, conf_name: str) -> KtrResult:
+        package = self._get_package(conf_name)
+
+        if package is None:
+            return KtrResult(False)
+
+        self.logger.info(f"Checking package '{conf_name}'.")
+        return KtrPackageTask(package, "chain", self.context).execute()
+
+    def _run(self, conf_name: str) -> KtrResult:
+        try:
+            # checks which were still queued when the daemon was stopped are dropped
+            if self.stopped.is_set():
+                return KtrResult(True)
+
+            return self.run_package(conf_name)
+        except Exception as error:
+            self.logger.error(f"Unexpected error while checking package '{conf_name}':")
+            self.logger.error(repr(error))
+            return KtrResult(False)
+        finally:
+            with self.lock:
+                self.finished.append(conf_name)
+            self.woken.set()
+
+    def execute(self) -> KtrResult:
+        self.logger.info("Starting kentauros daemon.")
+
+        with ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="ktr-worker") as pool:
+            while not self.stopped.is_set():
+                self.woken.clear()
+
+                now = time.monotonic()
+                self._update_schedule(now)
+
+                # the package is "in flight" (and not in the schedule) until its check is done
+                while self.schedule and (self.schedule[0][0] <= now):
+                    _, conf_name = heapq.heappop(self.schedule)
+                    pool.submit(self._run, conf_name)
+
+                if self.schedule:
+                    timeout = self.schedule[0][0] - now
+                else:
+                    timeout = None
+
+                self.woken.wait(timeout)
+
+            self.logger.info("Stopping kentauros daemon, waiting for running checks to finish.")
+
+        return KtrResult(True)
@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+import unittest
+
+from kentauros.context import KtrTestContext
+from kentauros.result import KtrResult
+from .daemon import KtrDaemonTask
+
+TEST_CONF = """
+[package]
+name = {name}
+version = 1.0
+release = stable
+modules =
+check_interval = {interval}
+"""
+
+
+class RecordingDaemonTask(KtrDaemonTask):
+    def __init__(self, context: KtrTestContext, conf_names: list):
+        super().__init__(context, conf_names, jobs=2, interval=10)
+        self.runs = list()
+
+    def run_package(self, conf_name: str) -> KtrResult:
+        package = self._get_package(conf_name)
+        self.runs.append((conf_name, package))
+        return KtrResult(True)
+
+
+class KtrDaemonTaskTest(unittest.TestCase):
+    def setUp(self):
+        self.context = KtrTestContext()
+        os.makedirs(self.context.get_confdir())
+
+    def _write_conf(self, name: str, interval: str):
+        with open(os.path.join(self.context.get_confdir(), name + ".conf"), "w") as file:
+            file.write(TEST_CONF.format(name=name, interval=interval))
+
+    def _run(self, daemon: KtrDaemonTask, seconds: float, between=None):
+        thread = threading.Thread(target=daemon.execute)
+        thread.start()
+
+        time.sleep(seconds)
+
+        if between is not None:
+            between()
+            time.sleep(seconds)
+
+        daemon.stop()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+
+    def test_intervals(self):
+        self._write_conf("often", "0.05")
+        self._write_conf("rarely", "3600")
+        self._write_conf("default", "")
+
+        daemon = RecordingDaemonTask(self.context, ["often", "rarely", "default"])
+        self._run(daemon, 0.5)
+
+        names = [name for name, _ in daemon.runs]
+
+        self.assertGreaterEqual(names.count("often"), 3)
+        self.assertEqual(names.count("rarely"), 1)
+        self.assertEqual(names.count("default"), 1)
+        self.assertEqual(daemon.get_interval("default"), 10)
+
+    def test_reload(self):
+        self._write_conf("package", "0.05")
+
+        def modify():
+            self._write_conf("package", "0.1")
+
+            # make sure the modification time changes, even on file systems with coarse timestamps
+            stat = os.stat(os.path.join(self.context.get_confdir(), "package.conf"))
+            os.utime(os.path.join(self.context.get_confdir(), "package.conf"),
+                     ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        daemon = RecordingDaemonTask(self.context, ["package"])
+        self._run(daemon, 0.3, modify)
+
+        packages = list(package for _, package in daemon.runs)
+
+        # configurations are only parsed again after they were modified
+        self.assertIs(packages[0], packages[1])
+        self.assertIsNot(packages[0], packages[-1])
+        self.assertEqual(daemon.get_interval("package"), 0.1)
+
+    def test_missing(self):
+        daemon = RecordingDaemonTask(self.context, ["missing"])
+        self._run(daemon, 0.1)
+
+        self.assertEqual(daemon.runs, [("missing", None)])
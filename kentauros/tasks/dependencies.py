@@ -0,0 +1,130 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from kentauros.package import KtrPackage
+from kentauros.result import KtrResult
+from .package import KtrPackageTask
+from .tasklist import KtrTaskList, _execute_task
+
+
+class KtrDependencyGraph:
+    def __init__(self, packages: list):
+        self.logger = logging.getLogger("ktr/dependencies")
+
+        self.packages = dict()
+
+        for package in packages:
+            assert isinstance(package, KtrPackage)
+            self.packages[package.conf_name] = package
+
+        self.provides = dict()
+        self.requires = dict()
+
+        for conf_name, package in self.packages.items():
+            self.provides[conf_name], self.requires[conf_name] = self._read_spec(package)
+
+        # map every provided name to the packages that provide it
+        providers = dict()
+
+        for conf_name, provides in self.provides.items():
+            for provide in provides:
+                providers.setdefault(provide, set()).add(conf_name)
+
+        self.depends = dict()
+
+        for conf_name, requires in self.requires.items():
+            self.depends[conf_name] = set()
+
+            for require in requires:
+                self.depends[conf_name].update(providers.get(require, set()))
+
+            self.depends[conf_name].discard(conf_name)
+
+        self.wave_list = self._get_waves()
+
+        self.wave_index = dict()
+        for index, wave in enumerate(self.wave_list):
+            for conf_name in wave:
+                self.wave_index[conf_name] = index
+
+    def _read_spec(self, package: KtrPackage) -> (set, set):
+        from kentauros.modules.constructor.rpm import RPMSpec, RPMSpecError
+
+        spec_path = os.path.join(package.context.get_specdir(), package.conf_name,
+                                 package.name + ".spec")
+
+        if not os.path.exists(spec_path):
+            return {package.name}, set()
+
+        try:
+            spec = RPMSpec(spec_path, package)
+            return spec.get_provides(), spec.get_build_requires()
+        except RPMSpecError:
+            self.logger.warning(f"The .spec file of package '{package.conf_name}' is invalid.")
+            return {package.name}, set()
+
+    def _get_waves(self) -> list:
+        waves = list()
+        remaining = set(self.packages.keys())
+
+        while remaining:
+            wave = sorted(conf_name for conf_name in remaining
+                          if not self.depends[conf_name] & remaining)
+
+            # the remaining packages depend on each other: build them together, in the last wave
+            if not wave:
+                wave = sorted(remaining)
+                self.logger.warning("Circular build dependencies detected between packages: " +
+                                    ", ".join(wave))
+
+            waves.append(wave)
+            remaining.difference_update(wave)
+
+        return waves
+
+    def waves(self) -> list:
+        return self.wave_list
+
+    def providers(self, conf_name: str) -> set:
+        # only dependencies on packages in earlier waves are considered, which breaks cycles
+        return set(provider for provider in self.depends[conf_name]
+                   if self.wave_index[provider] < self.wave_index[conf_name])
+
+
+class KtrDependencyTaskList(KtrTaskList):
+    def __init__(self, graph: KtrDependencyGraph, jobs: int = 1):
+        assert isinstance(graph, KtrDependencyGraph)
+
+        super().__init__(jobs)
+
+        self.graph = graph
+        self.logger = logging.getLogger("ktr/task/dependencies")
+
+    def add(self, task: KtrPackageTask):
+        assert isinstance(task, KtrPackageTask)
+        super().add(task)
+
+    def results(self) -> list:
+        tasks = dict((task.package.conf_name, task) for task in self.tasks)
+        results = dict()
+
+        with ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="ktr-worker") as pool:
+            for wave in self.graph.waves():
+                ready = list()
+
+                for conf_name in wave:
+                    failed = sorted(provider for provider in self.graph.providers(conf_name)
+                                    if not results[provider].success)
+
+                    if failed:
+                        self.logger.error("Skipping package '{}', dependencies failed: {}".format(
+                            conf_name, ", ".join(failed)))
+                        results[conf_name] = KtrResult(False)
+                    else:
+                        ready.append(conf_name)
+
+                wave_results = pool.map(_execute_task, (tasks[conf_name] for conf_name in ready))
+                results.update(zip(ready, wave_results))
+
+        return [results[task.package.conf_name] for task in self.tasks]
@@ -0,0 +1,101 @@
+import os
+import unittest
+
+from kentauros.config import KtrTestConfig
+from kentauros.context import KtrTestContext
+from kentauros.package import KtrTestPackage
+from kentauros.result import KtrResult
+from .dependencies import KtrDependencyGraph, KtrDependencyTaskList
+from .package import KtrPackageTask
+
+TEST_SPEC_TEMPLATE = """Name:           {name}
+Version:        1.0
+Release:        1%{{?dist}}
+{requires}
+
+%description
+
+%package        devel
+Summary:        Development files
+
+%description    devel
+"""
+
+
+def get_package(context: KtrTestContext, name: str, build_requires: list) -> KtrTestPackage:
+    spec_dir = os.path.join(context.get_specdir(), name)
+    os.makedirs(spec_dir)
+
+    requires = "\n".join("BuildRequires:  " + require for require in build_requires)
+
+    with open(os.path.join(spec_dir, name + ".spec"), "w") as file:
+        file.write(TEST_SPEC_TEMPLATE.format(name=name, requires=requires))
+
+    return KtrTestPackage(name, context, KtrTestConfig({"package": {"name": name}}))
+
+
+class ResultPackageTask(KtrPackageTask):
+    # pylint: disable=super-init-not-called
+    def __init__(self, package: KtrTestPackage, success: bool, log: list):
+        self.package = package
+        self.success = success
+        self.log = log
+
+    def execute(self) -> KtrResult:
+        self.log.append(self.package.conf_name)
+        return KtrResult(self.success)
+
+
+class KtrDependencyGraphTest(unittest.TestCase):
+    def setUp(self):
+        self.context = KtrTestContext()
+
+        self.packages = [get_package(self.context, "app", ["gcc", "lib-devel", "tool"]),
+                         get_package(self.context, "lib", ["gcc", "tool"]),
+                         get_package(self.context, "other", ["gcc"]),
+                         get_package(self.context, "tool", [])]
+
+    def test_depends(self):
+        graph = KtrDependencyGraph(self.packages)
+
+        self.assertEqual(graph.providers("app"), {"lib", "tool"})
+        self.assertEqual(graph.providers("lib"), {"tool"})
+        self.assertEqual(graph.providers("other"), set())
+
+    def test_waves(self):
+        graph = KtrDependencyGraph(self.packages)
+
+        self.assertEqual(graph.waves(), [["other", "tool"], ["lib"], ["app"]])
+
+    def test_waves_circular(self):
+        packages = [get_package(self.context, "cycle-a", ["cycle-b"]),
+                    get_package(self.context, "cycle-b", ["cycle-a-devel"])]
+
+        graph = KtrDependencyGraph(self.packages + packages)
+
+        self.assertEqual(graph.waves()[-1], ["cycle-a", "cycle-b"])
+        self.assertEqual(graph.providers("cycle-a"), set())
+
+    def test_task_list_order(self):
+        log = list()
+        tasks = KtrDependencyTaskList(KtrDependencyGraph(self.packages), jobs=2)
+
+        for package in self.packages:
+            tasks.add(ResultPackageTask(package, True, log))
+
+        results = tasks.results()
+
+        self.assertTrue(all(res.success for res in results))
+        self.assertEqual(log[2:], ["lib", "app"])
+
+    def test_task_list_skip_failed(self):
+        log = list()
+        tasks = KtrDependencyTaskList(KtrDependencyGraph(self.packages), jobs=2)
+
+        for package in self.packages:
+            tasks.add(ResultPackageTask(package, package.conf_name != "lib", log))
+
+        results = tasks.results()
+
+        self.assertEqual([res.success for res in results], [False, False, True, True])
+        self.assertNotIn("app", log)
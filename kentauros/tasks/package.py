@@ -64,6 +64,9 @@ class KtrPackageTask(KtrMetaTask):
         res = action()
         ret.collect(res)
 
+        # the package has been processed completely, so its state is written back to disk
+        self.context.state.flush()
+
         self.logger.info("")
 
         return ret
@@ -97,23 +100,28 @@ class KtrPackageTask(KtrMetaTask):
     def _verify(self) -> KtrResult:
         return self._collect_action()
 
-    def _execute(self) -> KtrResult:
+    def stage_tasks(self) -> list:
         tasks = list()
 
         for module in self.modules:
             tasks.append(KtrTask(self.package, module, self.action, self.context))
 
+        return tasks
+
+    def proceed(self, result: KtrResult) -> bool:
+        # the next module is only run if the last one succeeded, or if actions are forced
+        return self.context.get_force() or result.success
+
+    def _execute(self) -> KtrResult:
         ret = KtrResult(True)
 
-        for task in tasks:
+        for task in self.stage_tasks():
             assert isinstance(task, KtrMetaTask)
 
             res = task.execute()
             ret.collect(res)
 
-            if self.context.get_force():
-                continue
-            if not res.success:
+            if not self.proceed(res):
                 break
 
         return ret
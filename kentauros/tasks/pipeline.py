@@ -0,0 +1,114 @@
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from kentauros.result import KtrResult
+from .dependencies import KtrDependencyGraph
+from .package import KtrPackageTask
+from .tasklist import KtrTaskList
+
+
+# The modules of all packages are run as a pipeline: every module type (source, constructor,
+# builder, ...) gets its own pool of worker threads, and the next module of a package is queued as
+# soon as the previous one has finished. This way, the sources of one package can be downloaded
+# while the source package of another one is constructed and a third one is being built.
+#
+# If a dependency graph is given, packages are only started once all the packages they depend on
+# have been processed successfully.
+class KtrPipelineTask(KtrTaskList):
+    def __init__(self, jobs: int = 1, graph: KtrDependencyGraph = None):
+        super().__init__(jobs)
+
+        self.graph = graph
+        self.logger = logging.getLogger("ktr/task/pipeline")
+
+    def add(self, task: KtrPackageTask):
+        assert isinstance(task, KtrPackageTask)
+        super().add(task)
+
+    def _providers(self, task: KtrPackageTask) -> set:
+        if self.graph is None:
+            return set()
+        else:
+            return self.graph.providers(task.package.conf_name)
+
+    def results(self) -> list:
+        stages = [task.stage_tasks() for task in self.tasks]
+        positions = [0] * len(self.tasks)
+        results = [KtrResult(True) for _ in self.tasks]
+
+        finished = dict()
+        waiting = list()
+
+        pools = dict()
+        running = dict()
+
+        def submit(index: int):
+            stage = stages[index][positions[index]]
+            stage_type = stage.module.MODULE_TYPE
+
+            if stage_type not in pools:
+                pools[stage_type] = ThreadPoolExecutor(max_workers=self.jobs,
+                                                       thread_name_prefix=f"ktr-{stage_type}")
+
+            running[pools[stage_type].submit(stage.execute)] = index
+
+        def start(index: int):
+            if stages[index]:
+                submit(index)
+            else:
+                finish(index)
+
+        def finish(index: int):
+            finished[self.tasks[index].package.conf_name] = results[index].success
+            self.tasks[index].context.state.flush()
+
+            # start or skip packages which have been waiting for this one
+            for other in list(waiting):
+                if other not in waiting:
+                    continue
+
+                providers = self._providers(self.tasks[other])
+                failed = sorted(provider for provider in providers
+                                if (provider in finished) and not finished[provider])
+
+                if failed:
+                    waiting.remove(other)
+                    self.logger.error("Skipping package '{}', dependencies failed: {}".format(
+                        self.tasks[other].package.conf_name, ", ".join(failed)))
+                    results[other].submit(False)
+                    finish(other)
+
+                elif providers.issubset(finished.keys()):
+                    waiting.remove(other)
+                    start(other)
+
+        try:
+            for index, task in enumerate(self.tasks):
+                if self._providers(task):
+                    waiting.append(index)
+                else:
+                    start(index)
+
+            while running:
+                done, _ = wait(running.keys(), return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    index = running.pop(future)
+
+                    res = future.result()
+                    results[index].collect(res)
+                    positions[index] += 1
+
+                    if positions[index] == len(stages[index]):
+                        finish(index)
+                    elif self.tasks[index].proceed(res):
+                        submit(index)
+                    else:
+                        self.logger.info("Skipping remaining modules of package: {}".format(
+                            self.tasks[index].package.conf_name))
+                        finish(index)
+        finally:
+            for pool in pools.values():
+                pool.shutdown()
+
+        return results
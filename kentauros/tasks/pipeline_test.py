@@ -0,0 +1,94 @@
+import threading
+import time
+import unittest
+
+from data.test_packages import TEST_PACKAGE_URL_SOURCE
+from kentauros.modules.package import PackageModule
+from kentauros.result import KtrResult
+from .package import KtrPackageTask
+from .pipeline import KtrPipelineTask
+
+
+class StageModule(PackageModule):
+    def __init__(self, module_type: str, success: bool, log: list):
+        super().__init__(TEST_PACKAGE_URL_SOURCE, TEST_PACKAGE_URL_SOURCE.context)
+
+        self.MODULE_TYPE = module_type
+        self.success = success
+        self.log = log
+
+    def execute(self) -> KtrResult:
+        self.log.append(("start", self.MODULE_TYPE, threading.current_thread().name))
+        time.sleep(0.02)
+        self.log.append(("end", self.MODULE_TYPE, threading.current_thread().name))
+        return KtrResult(self.success)
+
+
+class StagePackageTask(KtrPackageTask):
+    # pylint: disable=super-init-not-called
+    def __init__(self, modules: list, force: bool = False):
+        self.package = TEST_PACKAGE_URL_SOURCE
+        self.context = TEST_PACKAGE_URL_SOURCE.context
+        self.action = "chain"
+        self.modules = modules
+        self.force = force
+
+    def proceed(self, result: KtrResult) -> bool:
+        return self.force or result.success
+
+
+class KtrPipelineTaskTest(unittest.TestCase):
+    def test_stages_in_order(self):
+        log = list()
+        task = KtrPipelineTask(jobs=2)
+        task.add(StagePackageTask([StageModule("source", True, log),
+                                   StageModule("constructor", True, log),
+                                   StageModule("builder", True, log)]))
+
+        results = task.results()
+
+        self.assertTrue(results[0].success)
+        self.assertEqual([entry[1] for entry in log if entry[0] == "start"],
+                         ["source", "constructor", "builder"])
+
+    def test_stage_pools(self):
+        log = list()
+        task = KtrPipelineTask(jobs=1)
+        task.add(StagePackageTask([StageModule("source", True, log),
+                                   StageModule("builder", True, log)]))
+        task.add(StagePackageTask([StageModule("source", True, log),
+                                   StageModule("builder", True, log)]))
+
+        task.results()
+
+        for _, module_type, thread in log:
+            self.assertTrue(thread.startswith("ktr-" + module_type))
+
+        # the second source stage has to overlap with the first builder stage
+        events = [entry[:2] for entry in log]
+        second_source_end = len(events) - 1 - events[::-1].index(("end", "source"))
+
+        self.assertLess(events.index(("start", "builder")), second_source_end)
+
+    def test_stop_on_failure(self):
+        log = list()
+        task = KtrPipelineTask(jobs=2)
+        task.add(StagePackageTask([StageModule("source", False, log),
+                                   StageModule("builder", True, log)]))
+
+        results = task.results()
+
+        self.assertFalse(results[0].success)
+        self.assertEqual([entry[1] for entry in log], ["source", "source"])
+
+    def test_force_continues(self):
+        log = list()
+        task = KtrPipelineTask(jobs=2)
+        task.add(StagePackageTask([StageModule("source", False, log),
+                                   StageModule("builder", True, log)], force=True))
+
+        results = task.results()
+
+        self.assertFalse(results[0].success)
+        self.assertEqual([entry[1] for entry in log if entry[0] == "start"],
+                         ["source", "builder"])
@@ -1,4 +1,5 @@
 import logging
+import time
 
 from kentauros.context import KtrContext
 from kentauros.modules.module import KtrModule
@@ -17,14 +18,70 @@ class KtrTask(KtrMetaTask):
 
         self.logger = logging.getLogger("ktr/task/task")
 
+    def _fingerprinted(self) -> bool:
+        # only the main action of a module ("execute") is skipped if its inputs didn't change
+        return self.module.actions.get(self.action) == self.module.execute
+
+    def _fingerprint_key(self) -> str:
+        return self.module.MODULE_TYPE + "_fingerprint"
+
+    def _up_to_date(self) -> bool:
+        if self.context.get_force():
+            return False
+
+        fingerprint = self.module.fingerprint()
+
+        if not fingerprint:
+            return False
+
+        state = self.context.state.read(self.package.conf_name)
+        up_to_date = state.get(self._fingerprint_key()) == fingerprint
+
+        self.context.metrics.inc("ktr_cache_requests_total", cache="fingerprint",
+                                 result=("hit" if up_to_date else "miss"))
+
+        return up_to_date
+
     def execute(self) -> KtrResult:
+        start = time.perf_counter()
+
+        if self.context.profiler is None:
+            ret = self._execute()
+        else:
+            ret = self.context.profiler.run(self.package.conf_name, self.module.MODULE_TYPE,
+                                            self.action, self._execute)
+
+        self.context.metrics.observe("ktr_stage_duration_seconds", time.perf_counter() - start,
+                                     package=self.package.conf_name,
+                                     module=self.module.MODULE_TYPE, action=self.action)
+
+        return ret
+
+    def _execute(self) -> KtrResult:
         ret = KtrResult()
         self.logger.info("Processing package: {}".format(self.package.conf_name))
 
+        fingerprinted = self._fingerprinted()
+
+        if fingerprinted and self._up_to_date():
+            self.logger.info("{} is up to date.".format(self.module))
+            return ret.submit(True)
+
         res = self.module.act(self.action)
         ret.collect(res)
 
         if ret.success:
+            # record the inputs of this run, after they might have been modified by the run itself
+            if fingerprinted:
+                fingerprint = self.module.fingerprint()
+
+                if fingerprint:
+                    ret.state[self._fingerprint_key()] = fingerprint
+
+            # cleaned up modules have to run again
+            if self.action == "clean":
+                ret.state[self._fingerprint_key()] = ""
+
             self.context.state.write(self.package.conf_name, ret.state)
 
         return ret
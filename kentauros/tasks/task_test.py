@@ -0,0 +1,125 @@
+import os
+import unittest
+import unittest.mock
+
+from kentauros.config import KtrTestConfig
+from kentauros.context import KtrTestContext
+from kentauros.modules.package import PackageModule
+from kentauros.modules.sources.url import UrlSource
+from kentauros.package import KtrTestPackage
+from kentauros.result import KtrResult
+from .task import KtrTask
+
+
+def _get_package(force: bool = False) -> KtrTestPackage:
+    return KtrTestPackage(
+        "testpackage",
+        KtrTestContext(force=force, state={"testpackage": {"name": "testpackage"}}),
+        KtrTestConfig({"package": {"name": "testpackage",
+                                   "version": "1.0",
+                                   "release": "stable",
+                                   "modules": ""}}))
+
+
+class FingerprintModule(PackageModule):
+    MODULE_TYPE = "source"
+
+    def __init__(self, package: KtrTestPackage, fingerprint: str, success: bool = True):
+        super().__init__(package, package.context)
+
+        self.value = fingerprint
+        self.success = success
+        self.runs = 0
+
+    def fingerprint(self) -> str:
+        return self.value
+
+    def execute(self) -> KtrResult:
+        self.runs += 1
+        return KtrResult(self.success)
+
+
+class KtrTaskTest(unittest.TestCase):
+    def _run(self, package: KtrTestPackage, module: FingerprintModule, action: str = "chain"):
+        return KtrTask(package, module, action, package.context).execute()
+
+    def test_up_to_date(self):
+        package = _get_package()
+        module = FingerprintModule(package, "abc")
+
+        self.assertTrue(self._run(package, module).success)
+        self.assertTrue(self._run(package, module).success)
+        self.assertEqual(module.runs, 1)
+        self.assertEqual(package.context.state.read("testpackage")["source_fingerprint"], "abc")
+
+        module.value = "def"
+        self.assertTrue(self._run(package, module).success)
+        self.assertEqual(module.runs, 2)
+
+    def test_no_fingerprint(self):
+        package = _get_package()
+        module = FingerprintModule(package, "")
+
+        self._run(package, module)
+        self._run(package, module)
+
+        self.assertEqual(module.runs, 2)
+        self.assertNotIn("source_fingerprint", package.context.state.read("testpackage"))
+
+    def test_failure(self):
+        package = _get_package()
+        module = FingerprintModule(package, "abc", False)
+
+        self.assertFalse(self._run(package, module).success)
+        self.assertFalse(self._run(package, module).success)
+        self.assertEqual(module.runs, 2)
+
+    def test_force(self):
+        package = _get_package(force=True)
+        module = FingerprintModule(package, "abc")
+
+        self._run(package, module)
+        self._run(package, module)
+
+        self.assertEqual(module.runs, 2)
+
+    def test_clean(self):
+        package = _get_package()
+        module = FingerprintModule(package, "abc")
+
+        self._run(package, module)
+        self._run(package, module, "clean")
+        self._run(package, module)
+
+        self.assertEqual(module.runs, 2)
+
+    def test_url_source(self):
+        package = _get_package()
+        package.conf = KtrTestConfig({"package": {"name": "testpackage",
+                                                  "version": "1.0",
+                                                  "release": "stable",
+                                                  "modules": "source"},
+                                      "source": {"type": "url"},
+                                      "url": {"orig": "https://example.org/file.tar.gz",
+                                              "keep": "true"}})
+
+        source = UrlSource(package, package.context)
+
+        os.makedirs(source.sdir)
+        with open(source.dest, "w") as file:
+            file.write("contents")
+
+        # every check finds a new upstream file
+        def changed():
+            source.headers = {"etag": str(update.call_count)}
+            return KtrResult(True)
+
+        update = unittest.mock.Mock(side_effect=changed)
+
+        # the local file doesn't change, but upstream has to be checked for changes every time
+        with unittest.mock.patch.object(source, "update", update), \
+                unittest.mock.patch.object(source, "export", return_value=KtrResult(True)):
+            self.assertTrue(self._run(package, source).success)
+            self.assertTrue(self._run(package, source).success)
+
+        self.assertEqual(update.call_count, 2)
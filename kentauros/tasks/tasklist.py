@@ -1,21 +1,37 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from kentauros.result import KtrResult
 from .meta import KtrMetaTask
 
 
+def _execute_task(task: KtrMetaTask) -> KtrResult:
+    assert isinstance(task, KtrMetaTask)
+    return task.execute()
+
+
 class KtrTaskList(KtrMetaTask):
-    def __init__(self):
+    def __init__(self, jobs: int = 1):
+        assert isinstance(jobs, int)
+
         self.tasks = list()
+        self.jobs = max(jobs, 1)
 
     def add(self, task: KtrMetaTask):
         self.tasks.append(task)
 
+    def results(self) -> list:
+        # tasks are independent of each other, so they can be run in a pool of worker threads;
+        # results are returned in the same order the tasks were added in
+        if (self.jobs == 1) or (len(self.tasks) <= 1):
+            return [_execute_task(task) for task in self.tasks]
+
+        with ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="ktr-worker") as pool:
+            return list(pool.map(_execute_task, self.tasks))
+
     def execute(self) -> KtrResult:
         ret = KtrResult()
 
-        for task in self.tasks:
-            assert isinstance(task, KtrMetaTask)
-
-            res = task.execute()
+        for res in self.results():
             ret.collect(res)
 
         return ret
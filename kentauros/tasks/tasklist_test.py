@@ -0,0 +1,52 @@
+import threading
+import time
+import unittest
+
+from kentauros.result import KtrResult
+from .meta import KtrMetaTask
+from .tasklist import KtrTaskList
+
+
+class SleepTask(KtrMetaTask):
+    def __init__(self, success: bool, seconds: float):
+        self.success = success
+        self.seconds = seconds
+        self.thread = None
+
+    def execute(self) -> KtrResult:
+        time.sleep(self.seconds)
+        self.thread = threading.current_thread().name
+        return KtrResult(self.success, value=self.seconds)
+
+
+class KtrTaskListTest(unittest.TestCase):
+    def test_results_serial(self):
+        tasks = KtrTaskList()
+        tasks.add(SleepTask(True, 0.02))
+        tasks.add(SleepTask(False, 0.01))
+
+        results = tasks.results()
+
+        self.assertEqual([res.success for res in results], [True, False])
+        self.assertEqual(tasks.tasks[0].thread, threading.current_thread().name)
+
+    def test_results_parallel_keep_order(self):
+        tasks = KtrTaskList(jobs=3)
+        tasks.add(SleepTask(True, 0.05))
+        tasks.add(SleepTask(False, 0.01))
+        tasks.add(SleepTask(True, 0.03))
+
+        results = tasks.results()
+
+        self.assertEqual([res.value for res in results], [0.05, 0.01, 0.03])
+        self.assertEqual([res.success for res in results], [True, False, True])
+
+        for task in tasks.tasks:
+            self.assertTrue(task.thread.startswith("ktr-worker"))
+
+    def test_execute_collects_failures(self):
+        tasks = KtrTaskList(jobs=2)
+        tasks.add(SleepTask(True, 0.0))
+        tasks.add(SleepTask(False, 0.0))
+
+        self.assertFalse(tasks.execute().success)
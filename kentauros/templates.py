@@ -32,11 +32,24 @@ modules =
 #orig =
 #ref =
 #shallow = bool()
+# full (default), shallow (only the commit of the ref), or blobless (history without file contents)
+#clone_mode = full
+# tarball compression: gzip (default, uses pigz if installed), xz, zstd, or none
+#compression = gzip
+# share downloaded objects with other packages (bare mirror in basedir/cache/git)
+#mirror = bool()
+# check out submodules (fetched in parallel, with the same clone_mode) and include them in tarballs
+#submodules = bool()
+#submodule_jobs = 8
 
 # only if source = url:
 #[url]
 #keep = bool()
 #orig =
+# expected sha256 hash of the downloaded file (optional)
+#sha256 =
+# other URLs of the same file; the fastest host is used first, and the others if it fails
+#mirrors = URL1,URL2
 
 # only if source = local:
 #[local]
@@ -70,4 +83,7 @@ version_template_git = %{version}%{version_sep}%{date}.%{time}.git%{shortcommit}
 
 version_separator_pre = ~
 version_separator_post = +
+
+# "json" or "sqlite" (safe for multiple ktr processes running at the same time)
+#state_backend = json
 """
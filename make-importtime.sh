@@ -0,0 +1,5 @@
+#!/usr/bin/env bash
+
+# measure the time needed to import the ktr command line interface (in microseconds)
+python3 -X importtime -c "import kentauros.cli" 2> meta/importtime.txt
+tail -n 1 meta/importtime.txt
@@ -30,7 +30,8 @@ setup(
     keywords="development packaging",
 
     packages=find_packages(exclude=['data', 'docs', 'examples', 'meta', 'scripts']),
-    install_requires=["argcomplete", "tinydb", "GitPython"],
+    python_requires=">=3.7",
+    install_requires=["argcomplete", "GitPython"],
 
     test_suite="setup.test_suite",
 
@@ -43,6 +44,7 @@ setup(
         'License :: OSI Approved :: GNU General Public License v2 (GPLv2)',
         'Operating System :: POSIX :: Linux',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.5',
-        'Programming Language :: Python :: 3.6']
+        'Programming Language :: Python :: 3.7',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9']
 )